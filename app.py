@@ -1,25 +1,33 @@
-from flask import Flask, render_template, request, jsonify, send_file
-import numpy as np
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from datetime import datetime, timedelta
 import io
 import base64
 import os
 import matplotlib
 matplotlib.use('Agg')  # Non-GUI backend untuk Flask
-import matplotlib.pyplot as plt
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
 from collision_prediction import (
     predict_satellite_collision,
     propagate_satellite_trajectory,
-    parse_debris_tle,
     calculate_orbital_period,
     categorize_altitude,
-    eci_to_latlon
+    eci_to_latlon,
+    SCREENING_MODES
 )
-from sgp4.api import Satrec, jday
-from skyfield.api import load, EarthSatellite, wgs84
-from skyfield import almanac
+from sgp4.api import jday
+from tle_catalog import load_catalog
+from result_cache import create_cache, prediction_cache_key, quantize_epoch
+from debris_snapshot import DEBRIS_BINARY_MIMETYPE, DebrisSnapshotService
+from debris_map import MAP_PROJECTIONS, clamp_map_width, render_debris_map
+from debris_tiles import DebrisTileService, valid_tile
+from satellite_stream import clamp_interval, position_stream
+from satellite_batch import BatchRequestError, batch_positions, parse_time_list, resolve_satellites
+from prediction_jobs import JOB_CANCELLED, JOB_DONE, JOB_FAILED, JobQueue, JobQueueFull
+from astro_context import get_context, get_earth_satellite, get_satrec, get_timescale
+from pass_prediction import (
+    MAX_NETWORK_SATELLITES, MAX_NETWORK_STATIONS, calculate_network_passes, find_passes
+)
+from coverage_planner import CoveragePlanError, plan_coverage, select_satellites
+from skyfield.api import wgs84
 from config import config
 
 # Configuration for Vercel
@@ -42,6 +50,35 @@ DEBRIS_FILE = os.path.join(BASE_DIR, app.config['DEBRIS_FILE'])
 if not os.path.exists(DEBRIS_FILE):
     print(f"WARNING: Debris file not found at {DEBRIS_FILE}")
     print("Please ensure FENGYUN debris.txt is in the same directory as app.py")
+else:
+    # Kompilasi / memory-map katalog debris sekali saat startup
+    load_catalog(DEBRIS_FILE)
+
+# Timescale skyfield + cache Satrec/EarthSatellite dimuat sekali per worker
+get_context().resize(app.config['ASTRO_SATELLITE_CACHE_SIZE'])
+get_context().warm()
+
+# Antrian job prediksi collision asinkron (thread pool lokal)
+prediction_jobs = JobQueue(app.config['PREDICTION_JOB_WORKERS'], app.config['PREDICTION_JOB_KEEP'],
+                           app.config['PREDICTION_JOB_RESULT_TTL'],
+                           app.config['PREDICTION_JOB_MAX_PENDING'])
+
+# Cache hasil prediksi collision
+prediction_cache = create_cache(app.config)
+
+# Katalog satelit untuk lookup catalog_ids pada /api/satellite-positions
+SATELLITE_CATALOG_FILE = os.path.join(BASE_DIR, app.config['SATELLITE_CATALOG_FILE'])
+
+# Snapshot posisi debris bersama (dipropagasi sekali per bucket waktu)
+debris_snapshots = DebrisSnapshotService(DEBRIS_FILE, app.config['SNAPSHOT_BUCKET_SECONDS'])
+
+# Tile peta debris (cache per tile/bucket/kategori, zoom rendah dirender di background)
+debris_tiles = DebrisTileService(debris_snapshots, app.config['DEBRIS_TILE_CACHE_SIZE'],
+                                 app.config['DEBRIS_TILE_PRECOMPUTE_ZOOM'])
+# Worker pool multiprocessing (forkserver/spawn) mengimpor ulang modul utama
+# sebagai __mp_main__ saat dijalankan dengan python app.py; jangan render di sana
+if __name__ != '__mp_main__':
+    debris_tiles.start_background_precompute()
 
 @app.route('/')
 def landing():
@@ -80,50 +117,216 @@ def passing_time_page():
 
 # ========== API ENDPOINTS ==========
 
+def format_time(value):
+    """Format datetime ke string (biarkan apa adanya jika sudah string)"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+TRUE_STRINGS = ('true', '1', 'yes', 'on')
+FALSE_STRINGS = ('false', '0', 'no', 'off')
+
+
+def parse_flag(data, key, default):
+    """
+    Flag boolean dari body JSON: true/false JSON atau string umum
+    ("true"/"false", "1"/"0", "yes"/"no", "on"/"off")
+
+    Raises ValueError (pesan untuk response 400) untuk nilai lain
+    """
+    value = data.get(key, default)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_STRINGS:
+            return True
+        if text in FALSE_STRINGS:
+            return False
+    raise ValueError(f'{key} must be a boolean')
+
+
+def parse_prediction_request(data):
+    """
+    Validasi body request prediksi collision
+
+    Returns dict parameter; raises ValueError (pesan untuk response 400)
+    """
+    data = data or {}
+    params = {
+        'tle_line1': data.get('tle_line1', '').strip(),
+        'tle_line2': data.get('tle_line2', '').strip(),
+        'num_periods': int(data.get('num_periods', 5)),
+        'time_step': float(data.get('time_step', 1)),
+        'threshold': float(data.get('threshold', 5.0)),
+        'mode': data.get('mode', 'snapshot'),
+        'refine': parse_flag(data, 'refine', True),
+        'sieve': parse_flag(data, 'sieve', True)
+    }
+    
+    if not params['tle_line1'] or not params['tle_line2']:
+        raise ValueError('TLE lines required')
+    
+    if params['mode'] not in SCREENING_MODES:
+        raise ValueError(f'mode must be one of {list(SCREENING_MODES)}')
+    
+    if params['time_step'] <= 0:
+        raise ValueError('time_step must be positive')
+    
+    # Epoch awal dikuantisasi supaya request berulang bisa diambil dari cache
+    params['start_time'] = quantize_epoch(datetime.utcnow(), app.config['CACHE_EPOCH_QUANTUM_SECONDS'])
+    return params
+
+
+def run_prediction(params, progress=None):
+    """Prediksi collision (lewat cache hasil) dan bangun response JSON-nya"""
+    tle_line1 = params['tle_line1']
+    tle_line2 = params['tle_line2']
+    mode = params['mode']
+    start_time = params['start_time']
+    
+    catalog_version = load_catalog(DEBRIS_FILE).version if os.path.exists(DEBRIS_FILE) else None
+    cache_key = prediction_cache_key(
+        tle_line1, tle_line2, catalog_version, start_time,
+        num_periods=params['num_periods'], time_step=params['time_step'],
+        threshold=params['threshold'], mode=mode, refine=params['refine'],
+        sieve=params['sieve']
+    )
+    
+    cached = prediction_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached, cached=True)
+    
+    result = predict_satellite_collision(
+        tle_line1, tle_line2, DEBRIS_FILE,
+        num_periods=params['num_periods'],
+        time_step_minutes=params['time_step'],
+        threshold=params['threshold'],
+        mode=mode,
+        start_time=start_time,
+        refine=params['refine'],
+        sieve=params['sieve'],
+        debris_snapshot=debris_snapshots.get(start_time) if mode == 'snapshot' else None,
+        progress=progress
+    )
+    
+    # Convert datetime objects to strings
+    # (titik yang sama bisa muncul sebagai closest_sat_point dan sat_pos)
+    if result['closest_sat_point']:
+        result['closest_sat_point']['time'] = format_time(result['closest_sat_point']['time'])
+    
+    for cp in result['collision_points']:
+        cp['time'] = format_time(cp['time'])
+        cp['sat_pos']['time'] = format_time(cp['sat_pos']['time'])
+    
+    response = {
+        'success': True,
+        'mode': mode,
+        'start_time': format_time(start_time),
+        'collision': result['collision'],
+        'collision_count': result['collision_count'],
+        'min_distance': result['min_distance'],
+        'closest_point': result['closest_sat_point'],
+        'collision_points': result['collision_points'][:10],  # Limit to 10 points
+        'sieve': result.get('sieve')
+    }
+    prediction_cache.set(cache_key, response)
+    
+    return dict(response, cached=False)
+
+
 @app.route('/api/predict-collision', methods=['POST'])
 def api_predict_collision():
     """API untuk prediksi collision"""
     try:
-        data = request.json
-        tle_line1 = data.get('tle_line1', '').strip()
-        tle_line2 = data.get('tle_line2', '').strip()
-        num_periods = int(data.get('num_periods', 5))
-        time_step = int(data.get('time_step', 1))
-        threshold = float(data.get('threshold', 5.0))
-        
-        if not tle_line1 or not tle_line2:
-            return jsonify({'error': 'TLE lines required'}), 400
-        
-        result = predict_satellite_collision(
-            tle_line1, tle_line2, DEBRIS_FILE,
-            num_periods=num_periods,
-            time_step_minutes=time_step,
-            threshold=threshold
-        )
-        
-        # Convert datetime objects to strings
-        if result['closest_sat_point']:
-            result['closest_sat_point']['time'] = result['closest_sat_point']['time'].strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            params = parse_prediction_request(request.json)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        for cp in result['collision_points']:
-            cp['time'] = cp['time'].strftime('%Y-%m-%d %H:%M:%S')
-            cp['sat_pos']['time'] = cp['sat_pos']['time'].strftime('%Y-%m-%d %H:%M:%S')
+        return jsonify(run_prediction(params))
         
-        return jsonify({
-            'success': True,
-            'collision': result['collision'],
-            'collision_count': result['collision_count'],
-            'min_distance': result['min_distance'],
-            'closest_point': result['closest_sat_point'],
-            'collision_points': result['collision_points'][:10]  # Limit to 10 points
-        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/predict-collision/jobs', methods=['POST'])
+def api_submit_prediction_job():
+    """
+    Submit prediksi collision sebagai job asinkron
+
+    Response 202 berisi job_id; status di /api/predict-collision/jobs/<job_id>,
+    hasil di /api/predict-collision/jobs/<job_id>/result.
+    """
+    try:
+        try:
+            params = parse_prediction_request(request.json)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        try:
+            job = prediction_jobs.submit(run_prediction, params)
+        except JobQueueFull as e:
+            return jsonify({'error': str(e)}), 503
+        response = jsonify(dict(job.to_dict(), success=True))
+        response.status_code = 202
+        response.headers['Location'] = f'/api/predict-collision/jobs/{job.id}'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/predict-collision/jobs/<job_id>', methods=['GET'])
+def api_prediction_job_status(job_id):
+    """Status dan progress job prediksi"""
+    job = prediction_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(dict(job.to_dict(), success=True))
+
+@app.route('/api/predict-collision/jobs/<job_id>/result', methods=['GET'])
+def api_prediction_job_result(job_id):
+    """Hasil job prediksi (format sama dengan /api/predict-collision)"""
+    job = prediction_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status == JOB_DONE:
+        return jsonify(dict(job.result, job_id=job.id))
+    if job.status == JOB_FAILED:
+        return jsonify({'error': job.error, 'job_id': job.id}), 500
+    if job.status == JOB_CANCELLED:
+        return jsonify({'error': 'Job cancelled', 'job_id': job.id}), 409
+    return jsonify(dict(job.to_dict(), success=True)), 202
+
+@app.route('/api/predict-collision/jobs/<job_id>', methods=['DELETE'])
+def api_cancel_prediction_job(job_id):
+    """Batalkan job prediksi"""
+    job = prediction_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(dict(job.to_dict(), success=True))
+
+@app.route('/api/cache-stats', methods=['GET'])
+def api_cache_stats():
+    """API untuk statistik cache hasil prediksi collision"""
+    return jsonify({
+        'success': True,
+        'prediction_cache': prediction_cache.stats(),
+        'debris_snapshot': debris_snapshots.stats(),
+        'debris_tiles': debris_tiles.stats(),
+        'astro_context': get_context().stats(),
+        'prediction_jobs': prediction_jobs.stats()
+    })
+
 @app.route('/api/debris-data', methods=['GET'])
 def api_debris_data():
-    """API untuk mendapatkan data debris"""
+    """
+    API untuk mendapatkan data debris
+
+    Format dipilih dari header Accept: application/json (default, maksimal
+    1000 objek) atau application/octet-stream (seluruh katalog sebagai kolom
+    binary, lihat debris_snapshot.DEBRIS_BINARY_MAGIC).
+    """
     try:
         category = request.args.get('category', None)
         if category is not None and category != '':
@@ -131,7 +334,18 @@ def api_debris_data():
         else:
             category = None
         
-        debris_positions = parse_debris_tle(DEBRIS_FILE, filter_category=category)
+        snapshot = debris_snapshots.get()
+        
+        best = request.accept_mimetypes.best_match(['application/json', DEBRIS_BINARY_MIMETYPE])
+        if best == DEBRIS_BINARY_MIMETYPE:
+            response = send_file(io.BytesIO(snapshot.to_binary(category)),
+                                 mimetype=DEBRIS_BINARY_MIMETYPE)
+            response.headers['X-Debris-Count'] = str(snapshot.count(category))
+            response.headers['X-Snapshot-Time'] = format_time(snapshot.time)
+            response.headers['Vary'] = 'Accept'
+            return response
+        
+        debris_positions = snapshot.debris(category)
         
         # Format data untuk frontend
         debris_list = []
@@ -143,69 +357,87 @@ def api_debris_data():
                 'category': debris['category']
             })
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'count': len(debris_positions),
             'debris': debris_list
         })
+        response.headers['Vary'] = 'Accept'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/debris-map', methods=['GET'])
 def api_debris_map():
-    """API untuk generate debris map sebagai image"""
+    """
+    API untuk generate debris map sebagai image PNG
+
+    Basemap dirender sekali dan di-cache (lihat debris_map); per request hanya
+    scatter debris dan colorbar yang digambar. Default mengembalikan PNG mentah,
+    format=json untuk response lama (base64 di dalam JSON).
+    """
     try:
         category = request.args.get('category', None)
         if category is not None and category != '':
             category = int(category)
         else:
             category = None
+        width = clamp_map_width(request.args.get('width', type=int))
+        projection = request.args.get('projection', 'platecarree')
+        
+        if projection not in MAP_PROJECTIONS:
+            return jsonify({'error': f'projection must be one of {list(MAP_PROJECTIONS)}'}), 400
         
-        debris_positions = parse_debris_tle(DEBRIS_FILE, filter_category=category)
-        
-        # Create map
-        fig = plt.figure(figsize=(14, 8))
-        ax = plt.axes(projection=ccrs.PlateCarree())
-        
-        ax.add_feature(cfeature.LAND, facecolor='lightgray', alpha=0.5)
-        ax.add_feature(cfeature.OCEAN, facecolor='lightblue', alpha=0.3)
-        ax.add_feature(cfeature.COASTLINE, linewidth=0.5)
-        ax.add_feature(cfeature.BORDERS, linewidth=0.3, alpha=0.5)
-        ax.gridlines(draw_labels=True, dms=True, x_inline=False, y_inline=False, 
-                     linewidth=0.5, alpha=0.5)
-        ax.set_extent([-180, 180, -90, 90], crs=ccrs.PlateCarree())
-        
-        if debris_positions:
-            lats = [d['lat'] for d in debris_positions]
-            lons = [d['lon'] for d in debris_positions]
-            alts = [d['alt'] for d in debris_positions]
-            
-            scatter = ax.scatter(lons, lats, c=alts, s=15, alpha=0.6,
-                               cmap='jet', transform=ccrs.PlateCarree())
-            
-            cbar = plt.colorbar(scatter, ax=ax, orientation='horizontal',
-                               pad=0.05, shrink=0.7)
-            cbar.set_label('Debris Altitude (km)', fontsize=10)
+        lats, lons, alts, _ = debris_snapshots.get().columns(category)
         
         category_name = f"Category {category}" if category is not None else "All Categories"
-        plt.title(f'Debris Distribution - {category_name}\nTotal: {len(debris_positions)} debris',
-                 fontsize=14, fontweight='bold')
+        png, timing = render_debris_map(
+            lats, lons, alts,
+            f'Debris Distribution - {category_name}\nTotal: {len(lats)} debris',
+            width=width, projection=projection
+        )
+        
+        if request.args.get('format') == 'json':
+            img_base64 = base64.b64encode(png).decode()
+            return jsonify({
+                'success': True,
+                'image': f'data:image/png;base64,{img_base64}',
+                'count': len(lats),
+                'render_time_ms': round(timing['render_ms'], 1)
+            })
+        
+        response = send_file(io.BytesIO(png), mimetype='image/png')
+        response.headers['X-Debris-Count'] = str(len(lats))
+        response.headers['X-Render-Time-Ms'] = f"{timing['render_ms']:.1f}"
+        response.headers['Server-Timing'] = (f"basemap;dur={timing['basemap_ms']:.1f}, "
+                                             f"render;dur={timing['render_ms']:.1f}")
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/debris-tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def api_debris_tiles(z, x, y):
+    """API tile XYZ (web mercator) posisi debris dari snapshot saat ini"""
+    try:
+        category = request.args.get('category', None)
+        if category is not None and category != '':
+            category = int(category)
+        else:
+            category = None
         
-        # Save to bytes
-        img_bytes = io.BytesIO()
-        plt.savefig(img_bytes, format='png', dpi=100, bbox_inches='tight')
-        img_bytes.seek(0)
-        plt.close()
+        if not valid_tile(z, x, y):
+            return jsonify({'error': 'Tile out of range'}), 404
         
-        # Convert to base64
-        img_base64 = base64.b64encode(img_bytes.read()).decode()
+        png, snapshot = debris_tiles.get_tile(z, x, y, category)
         
-        return jsonify({
-            'success': True,
-            'image': f'data:image/png;base64,{img_base64}',
-            'count': len(debris_positions)
-        })
+        response = send_file(io.BytesIO(png), mimetype='image/png')
+        # Tile berlaku sampai bucket snapshot berikutnya
+        response.headers['Cache-Control'] = f'public, max-age={debris_tiles.seconds_until_next_bucket()}'
+        response.headers['X-Snapshot-Time'] = format_time(snapshot.time)
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -221,8 +453,8 @@ def api_satellite_position():
         if not tle_line1 or not tle_line2:
             return jsonify({'error': 'TLE lines required'}), 400
         
-        # Parse TLE
-        satellite = Satrec.twoline2rv(tle_line1, tle_line2)
+        # Parse TLE (dari cache astro_context)
+        satellite = get_satrec(tle_line1, tle_line2)
         
         # Current time
         current_time = datetime.utcnow()
@@ -258,6 +490,68 @@ def api_satellite_position():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/satellite-positions', methods=['POST'])
+def api_satellite_positions():
+    """
+    API posisi banyak satelit pada banyak waktu dalam satu request
+
+    Semua satelit dipropagasi untuk semua waktu dengan satu panggilan
+    SatrecArray; hasil dikembalikan per kolom (satelit x waktu).
+    """
+    try:
+        data = request.json or {}
+        times = parse_time_list(data.get('times'))
+
+        catalog = None
+        if data.get('catalog_ids') and os.path.exists(SATELLITE_CATALOG_FILE):
+            catalog = load_catalog(SATELLITE_CATALOG_FILE)
+        satrecs, satellites = resolve_satellites(data.get('satellites'),
+                                                 data.get('catalog_ids'), catalog)
+
+        positions = batch_positions(satrecs, times)
+
+        return jsonify(dict({
+            'success': True,
+            'count': len(satellites),
+            'times': [t.strftime('%Y-%m-%dT%H:%M:%SZ') for t in times],
+            'satellites': satellites
+        }, **positions))
+
+    except BatchRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/satellite-position/stream', methods=['GET'])
+def api_satellite_position_stream():
+    """
+    Stream posisi satelit (Server-Sent Events)
+
+    TLE diparse sekali per koneksi; posisi dikirim setiap `interval` detik
+    dari ephemeris yang dipropagasi per chunk (lihat satellite_stream).
+    """
+    try:
+        tle_line1 = request.args.get('tle_line1', '').strip()
+        tle_line2 = request.args.get('tle_line2', '').strip()
+        interval = clamp_interval(request.args.get('interval', type=int))
+        
+        if not tle_line1 or not tle_line2:
+            return jsonify({'error': 'TLE lines required'}), 400
+        
+        try:
+            events = position_stream(tle_line1, tle_line2, interval,
+                                     max_seconds=app.config['SATELLITE_STREAM_MAX_SECONDS'])
+        except ValueError as e:
+            return jsonify({'error': f'Invalid TLE: {e}'}), 400
+        
+        return Response(stream_with_context(events), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Jangan buffer di reverse proxy (nginx)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/calculate-passes', methods=['POST'])
 def api_calculate_passes():
     """API untuk menghitung passing time satelit"""
@@ -275,13 +569,17 @@ def api_calculate_passes():
         start_date = data.get('start_date', '')
         start_time = data.get('start_time', '')
         search_duration = float(data.get('search_duration', 24))  # hours
+        try:
+            prefilter = parse_flag(data, 'prefilter', True)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if not tle_line1 or not tle_line2:
             return jsonify({'error': 'TLE lines required'}), 400
         
-        # Setup Skyfield
-        ts = load.timescale()
-        satellite = EarthSatellite(tle_line1, tle_line2, tle_name, ts)
+        # Setup Skyfield (timescale dan satelit dari astro_context)
+        ts = get_timescale()
+        satellite = get_earth_satellite(tle_line1, tle_line2, tle_name)
         observer_topos = wgs84.latlon(
             latitude_degrees=latitude,
             longitude_degrees=longitude,
@@ -302,61 +600,9 @@ def api_calculate_passes():
         end_time = ts.utc(end_dt.year, end_dt.month, end_dt.day,
                          end_dt.hour, end_dt.minute, end_dt.second)
         
-        # Calculate orbital period for step size
-        mean_motion_rad_per_min = satellite.model.nm
-        orbital_period_minutes = (2 * np.pi) / mean_motion_rad_per_min
-        orbital_period_days = orbital_period_minutes / (24 * 60)
-        step_days = orbital_period_days / 20.0
-        
-        def is_satellite_above_horizon(t):
-            difference = satellite - observer_topos
-            alt, _, _ = difference.at(t).altaz()
-            return (alt.degrees >= min_elevation).astype(int)
-        
-        is_satellite_above_horizon.step_days = step_days
-        
         # Find passes
-        times, events = almanac.find_discrete(start_time, end_time, is_satellite_above_horizon)
-        
-        # Process results
-        passes = []
-        i = 0
-        
-        if len(events) > 0 and events[0] == 0:
-            i = 1
-        
-        while i < len(events) - 1:
-            if events[i] == 1:
-                aos_time = times[i]
-                
-                if i + 1 < len(events) and events[i + 1] == 0:
-                    los_time = times[i + 1]
-                    
-                    # Find max altitude
-                    t_sample = ts.linspace(aos_time, los_time, 20)
-                    alt, az, _ = (satellite - observer_topos).at(t_sample).altaz()
-                    
-                    max_alt_index = np.argmax(alt.degrees)
-                    max_alt_time = t_sample[max_alt_index]
-                    max_alt_deg = alt.degrees[max_alt_index]
-                    max_az_deg = az.degrees[max_alt_index]
-                    
-                    # Calculate duration
-                    pass_duration = (los_time.tt - aos_time.tt) * 24 * 60
-                    
-                    passes.append({
-                        'aos_time': aos_time.utc_strftime('%Y-%m-%d %H:%M:%S UTC'),
-                        'los_time': los_time.utc_strftime('%Y-%m-%d %H:%M:%S UTC'),
-                        'max_alt_time': max_alt_time.utc_strftime('%H:%M:%S UTC'),
-                        'max_alt_degrees': f'{max_alt_deg:.2f}',
-                        'max_azimuth_degrees': f'{max_az_deg:.2f}',
-                        'duration_minutes': f'{pass_duration:.2f}'
-                    })
-                    i += 2
-                else:
-                    i += 1
-            else:
-                i += 1
+        passes = find_passes(satellite, observer_topos, ts, start_time, end_time, min_elevation,
+                             prefilter)
         
         return jsonify({
             'success': True,
@@ -367,5 +613,143 @@ def api_calculate_passes():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/calculate-passes/batch', methods=['POST'])
+def api_calculate_passes_batch():
+    """
+    API passing time untuk banyak satelit di atas jaringan ground station
+
+    Setiap pasangan (satelit, station) dihitung di process pool
+    (lihat pass_prediction); hasilnya satu tabel kontak terurut AOS.
+    """
+    try:
+        data = request.json or {}
+        satellites = data.get('satellites') or []
+        stations = data.get('stations') or []
+        min_elevation = float(data.get('min_elevation', 10))
+        start_date = data.get('start_date', '')
+        start_time = data.get('start_time', '')
+        search_duration = float(data.get('search_duration', 24))  # hours
+        try:
+            prefilter = parse_flag(data, 'prefilter', True)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not satellites or not stations:
+            return jsonify({'error': 'satellites and stations required'}), 400
+        if len(satellites) > MAX_NETWORK_SATELLITES or len(stations) > MAX_NETWORK_STATIONS:
+            return jsonify({'error': f'At most {MAX_NETWORK_SATELLITES} satellites and '
+                                     f'{MAX_NETWORK_STATIONS} stations per request'}), 400
+        
+        sats = []
+        for k, sat in enumerate(satellites):
+            if not isinstance(sat, dict):
+                return jsonify({'error': f'satellites[{k}] must be an object'}), 400
+            tle_line1 = (sat.get('tle_line1') or '').strip()
+            tle_line2 = (sat.get('tle_line2') or '').strip()
+            if not tle_line1 or not tle_line2:
+                return jsonify({'error': f'TLE lines required for satellites[{k}]'}), 400
+            sats.append({
+                'name': sat.get('name') or f'SATELLITE {k + 1}',
+                'tle_line1': tle_line1,
+                'tle_line2': tle_line2
+            })
+        
+        sites = []
+        for k, station in enumerate(stations):
+            if not isinstance(station, dict):
+                return jsonify({'error': f'stations[{k}] must be an object'}), 400
+            site = {
+                'name': station.get('name') or f'STATION {k + 1}',
+                'latitude': float(station.get('latitude', 0)),
+                'longitude': float(station.get('longitude', 0)),
+                'elevation': float(station.get('elevation', 0))
+            }
+            if station.get('min_elevation') is not None:
+                site['min_elevation'] = float(station['min_elevation'])
+            sites.append(site)
+        
+        if start_date and start_time:
+            start_dt = datetime.strptime(f"{start_date} {start_time}", "%Y-%m-%d %H:%M")
+        else:
+            start_dt = datetime.utcnow().replace(microsecond=0)
+        
+        contacts, stats = calculate_network_passes(
+            sats, sites, start_dt, search_duration, min_elevation,
+            workers=app.config['PASS_PREDICTION_WORKERS'], prefilter=prefilter
+        )
+        
+        return jsonify({
+            'success': True,
+            'contacts': contacts,
+            'count': len(contacts),
+            'start_time': start_dt.strftime('%Y-%m-%d %H:%M:%S'),
+            'stats': stats
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/coverage-plan', methods=['POST'])
+def api_coverage_plan():
+    """
+    API statistik cakupan wilayah (default Indonesia) untuk konstelasi satelit
+
+    Satelit dari TLE dan/atau dari katalog (nama / nomor NORAD); propagasi
+    dibagi ke process pool (lihat coverage_planner).
+    """
+    try:
+        data = request.json or {}
+        satellites = data.get('satellites') or []
+        catalog_ids = data.get('catalog_ids') or []
+        names = data.get('names') or []
+        start_date = data.get('start_date', '')
+        start_time = data.get('start_time', '')
+        
+        sats = []
+        for k, sat in enumerate(satellites):
+            if not isinstance(sat, dict):
+                return jsonify({'error': f'satellites[{k}] must be an object'}), 400
+            tle_line1 = (sat.get('tle_line1') or '').strip()
+            tle_line2 = (sat.get('tle_line2') or '').strip()
+            if not (tle_line1.startswith('1 ') and tle_line2.startswith('2 ')
+                    and len(tle_line1) >= 69 and len(tle_line2) >= 69):
+                return jsonify({'error': f'Invalid TLE at satellites[{k}]'}), 400
+            sats.append({
+                'name': sat.get('name') or f'SATELLITE {k + 1}',
+                'tle_line1': tle_line1,
+                'tle_line2': tle_line2
+            })
+        
+        if catalog_ids or names:
+            if not os.path.exists(SATELLITE_CATALOG_FILE):
+                return jsonify({'error': 'Satellite catalog not available'}), 400
+            sats += select_satellites(SATELLITE_CATALOG_FILE, names, catalog_ids)
+        
+        if start_date and start_time:
+            start_dt = datetime.strptime(f"{start_date} {start_time}", "%Y-%m-%d %H:%M")
+        else:
+            start_dt = datetime.utcnow().replace(microsecond=0)
+        
+        result = plan_coverage(
+            sats, start_dt,
+            duration_hours=float(data.get('duration_hours', 24)),
+            region=data.get('region'),
+            spotbeam_width_km=float(data.get('spotbeam_width_km', 2000)),
+            cell_km=float(data.get('cell_km', 25)),
+            window_seconds=float(data.get('window_seconds', 60)),
+            tle_file=SATELLITE_CATALOG_FILE,
+            workers=app.config['COVERAGE_PLAN_WORKERS']
+        )
+        
+        return jsonify(dict({
+            'success': True,
+            'start_time': start_dt.strftime('%Y-%m-%d %H:%M:%S')
+        }, **result))
+        
+    except (CoveragePlanError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 if __name__ == '__main__':
     app.run(debug=False)  # Set to False for production
@@ -0,0 +1,164 @@
+"""
+Konteks astrodinamika per proses
+================================
+Timescale skyfield dimuat sekali per proses (warm() dipanggil saat app /
+worker start) dan objek satelit hasil parse TLE (Satrec dan EarthSatellite)
+disimpan di LRU yang di-key dengan hash TLE yang dinormalisasi. Request
+berikutnya dengan TLE yang sama memakai objek yang sudah ada, tanpa
+mengulang load.timescale(), Satrec.twoline2rv atau konstruksi EarthSatellite.
+
+Objek yang dikembalikan dipakai bersama antar thread tanpa lock. Yang aman
+hanyalah nilai kembalian sgp4()/sgp4_array() dan elemen epoch (no_kozai, ecco,
+inclo, ... yang hanya ditulis sgp4init). sgp4() menimpa atribut elemen
+rata-rata (am, em, im, Om, om, mm, nm, t, error) sebagai efek samping, sehingga
+atribut tersebut bisa berasal dari propagasi thread lain: jangan membacanya
+dari objek bersama. Pemanggil yang butuh elemen rata-rata harus memakai salinan
+privat (lihat orbit_sieve.private_satrecs). Pemanggil tidak boleh mengubah objek.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from sgp4.api import Satrec
+from skyfield.api import EarthSatellite, load
+
+from result_cache import normalize_tle_line
+
+DEFAULT_SATELLITE_CACHE_SIZE = 256
+
+
+def tle_hash(tle_line1, tle_line2):
+    """Key cache (sha1 hex) untuk pasangan baris TLE"""
+    payload = normalize_tle_line(tle_line1) + '\n' + normalize_tle_line(tle_line2)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class SatelliteCache:
+    """
+    LRU objek satelit dengan batas jumlah entri dan counter hit/miss.
+
+    Lock hanya melindungi struktur cache, bukan objek yang disimpan.
+    """
+
+    def __init__(self, maxsize=DEFAULT_SATELLITE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Parse di luar lock; jika dua thread membuat objek yang sama, yang pertama disimpan
+        value = factory()
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+class AstroContext:
+    """Timescale skyfield + cache Satrec/EarthSatellite untuk satu proses"""
+
+    def __init__(self, cache_size=DEFAULT_SATELLITE_CACHE_SIZE):
+        self._ts = None
+        self._ts_lock = threading.Lock()
+        self.satrecs = SatelliteCache(cache_size)
+        self.earth_satellites = SatelliteCache(cache_size)
+
+    @property
+    def timescale(self):
+        """Timescale skyfield (dimuat sekali)"""
+        if self._ts is None:
+            with self._ts_lock:
+                if self._ts is None:
+                    self._ts = load.timescale()
+        return self._ts
+
+    def warm(self):
+        self.timescale
+        return self
+
+    def resize(self, cache_size):
+        self.satrecs.maxsize = cache_size
+        self.earth_satellites.maxsize = cache_size
+
+    def satrec(self, tle_line1, tle_line2):
+        """
+        Satrec bersama untuk TLE (twoline2rv hanya saat cache miss); hanya
+        untuk nilai kembalian sgp4() dan elemen epoch, lihat docstring modul
+        """
+        tle_line1 = normalize_tle_line(tle_line1)
+        tle_line2 = normalize_tle_line(tle_line2)
+        return self.satrecs.get_or_create(
+            tle_hash(tle_line1, tle_line2),
+            lambda: Satrec.twoline2rv(tle_line1, tle_line2))
+
+    def earth_satellite(self, tle_line1, tle_line2, name=None):
+        """EarthSatellite untuk TLE dan nama, memakai timescale bersama"""
+        tle_line1 = normalize_tle_line(tle_line1)
+        tle_line2 = normalize_tle_line(tle_line2)
+        key = (tle_hash(tle_line1, tle_line2), name)
+        return self.earth_satellites.get_or_create(
+            key, lambda: EarthSatellite(tle_line1, tle_line2, name, self.timescale))
+
+    def stats(self):
+        return {
+            'timescale_loaded': self._ts is not None,
+            'satrec': self.satrecs.stats(),
+            'earth_satellite': self.earth_satellites.stats()
+        }
+
+
+# Konteks default per proses
+_context = AstroContext()
+
+
+def get_context():
+    return _context
+
+
+def get_timescale():
+    return _context.timescale
+
+
+def get_satrec(tle_line1, tle_line2):
+    return _context.satrec(tle_line1, tle_line2)
+
+
+def get_earth_satellite(tle_line1, tle_line2, name=None):
+    return _context.earth_satellite(tle_line1, tle_line2, name)
@@ -0,0 +1,490 @@
+"""
+Benchmark hot path dengan katalog sintetis dan file TLE asli
+============================================================
+Mengukur waktu load_catalog (kompilasi katalog dingin), parse_debris_tle,
+propagate_satellite_trajectory, check_collision, predict_satellite_collision
+(per mode/engine), calculate_network_passes dan render peta
+(render_debris_map, render_tile) terhadap:
+
+- katalog sintetis 1k-100k objek LEO (orbit acak dengan seed tetap, epoch =
+  waktu awal benchmark), dibuat sekali di --data-dir lalu dipakai ulang;
+- file asli FENGYUN debris.txt dan TLE.txt, disalin ke --data-dir agar
+  katalog binary di samping file asli tidak ikut dihapus/dikompilasi ulang.
+
+Setiap kombinasi (case, engine, dataset) dijalankan --repeat kali; hasilnya
+ditulis sebagai JSON (waktu per ulangan, min, median, objek/detik) beserta
+metadata mesin dan commit git. --compare membandingkan median dengan file
+hasil sebelumnya dan keluar dengan status 1 jika ada regresi di atas
+--tolerance.
+
+Contoh:
+    python benchmark.py -o benchmark_results.json
+    python benchmark.py --sizes 1000 10000 --cases check_collision render_debris_map
+    python benchmark.py --compare benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import sgp4
+
+import tle_catalog
+from collision_prediction import (EARTH_RADIUS, MU, check_collision, parse_debris_tle,
+                                  predict_satellite_collision, propagate_satellite_trajectory)
+from debris_map import DEFAULT_MAP_WIDTH, get_basemap, render_debris_map
+from debris_tiles import render_tile
+from pass_prediction import calculate_network_passes
+from tle_catalog import catalog_path_for, load_catalog
+
+BENCHMARK_FORMAT_VERSION = 1
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 42
+DEFAULT_REGRESSION_TOLERANCE = 0.25
+DEFAULT_OUTPUT = 'benchmark_results.json'
+
+# Waktu awal tetap agar hasil antar run bisa dibandingkan (dekat epoch file TLE asli)
+DEFAULT_START = datetime(2025, 10, 5)
+
+REAL_DATASETS = {
+    'fengyun': 'FENGYUN debris.txt',
+    'tle': 'TLE.txt'
+}
+
+# Satelit uji untuk lintasan, collision dan pass (ISS)
+BENCH_SATELLITE = ('ISS (ZARYA)',
+                   '1 25544U 98067A   25277.01482352  .00012477  00000-0  22893-3 0  9996',
+                   '2 25544  51.6322 127.6882 0000966 195.4447 164.6512 15.49660865532049')
+
+# Ground station untuk benchmark pass
+BENCH_STATIONS = [
+    {'name': 'Jakarta', 'latitude': -6.2088, 'longitude': 106.8456, 'elevation': 8},
+    {'name': 'Biak', 'latitude': -1.1753, 'longitude': 136.0810, 'elevation': 10},
+    {'name': 'Svalbard', 'latitude': 78.2232, 'longitude': 15.6267, 'elevation': 450}
+]
+PASS_SEARCH_HOURS = 24
+
+# Jumlah satelit maksimum per dataset untuk benchmark pass (pass 24 jam untuk
+# 3 station ~0.1 detik per satelit di satu core); None = seluruh katalog
+DEFAULT_PASS_LIMIT = 100
+
+# Rentang orbit katalog sintetis
+SYNTHETIC_MIN_ALT_KM = 300.0
+SYNTHETIC_MAX_ALT_KM = 2000.0
+SYNTHETIC_MAX_ECC = 0.02
+
+# Huruf Alpha-5 untuk nomor katalog >= 100000 (tanpa I dan O)
+ALPHA5_LETTERS = 'ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+CASES = ('load_catalog', 'parse_debris_tle', 'propagate_satellite_trajectory',
+         'check_collision', 'predict_satellite_collision', 'calculate_network_passes',
+         'render_debris_map', 'render_tile')
+
+
+def _tle_checksum(line):
+    return sum(int(c) if c.isdigit() else (1 if c == '-' else 0) for c in line) % 10
+
+
+def _tle_satnum(satnum):
+    if satnum < 100000:
+        return f'{satnum:05d}'
+    return ALPHA5_LETTERS[satnum // 10000 - 10] + f'{satnum % 10000:04d}'
+
+
+def format_tle(satnum, epoch, inclination, raan, eccentricity, arg_perigee, mean_anomaly,
+               mean_motion):
+    """
+    Dua baris TLE (dengan checksum) dari elemen orbit
+
+    Sudut dalam derajat, mean_motion dalam revolusi/hari, epoch datetime UTC.
+    """
+    day_of_year = (epoch - datetime(epoch.year, 1, 1)).total_seconds() / 86400.0 + 1.0
+    sat = _tle_satnum(satnum)
+    line1 = (f'1 {sat}U 25001A   {epoch.year % 100:02d}{day_of_year:012.8f} '
+             f' .00000000  00000-0  10000-4 0  999')
+    line2 = (f'2 {sat} {inclination:8.4f} {raan:8.4f} {int(round(eccentricity * 1e7)):07d} '
+             f'{arg_perigee:8.4f} {mean_anomaly:8.4f} {mean_motion:11.8f}    1')
+    return line1 + str(_tle_checksum(line1)), line2 + str(_tle_checksum(line2))
+
+
+def synthetic_catalog(path, count, start_time, seed=DEFAULT_SEED):
+    """
+    Tulis katalog TLE 3 baris berisi count objek LEO acak (reproducible)
+
+    Altitude perigee uniform SYNTHETIC_MIN_ALT_KM..SYNTHETIC_MAX_ALT_KM,
+    inklinasi terdistribusi uniform di bola, sudut lain uniform.
+    """
+    rng = np.random.default_rng(seed)
+    perigee = EARTH_RADIUS + rng.uniform(SYNTHETIC_MIN_ALT_KM, SYNTHETIC_MAX_ALT_KM, count)
+    ecc = rng.uniform(0.0, SYNTHETIC_MAX_ECC, count)
+    semi_major = perigee / (1.0 - ecc)
+    mean_motion = np.sqrt(MU / semi_major**3) * 86400.0 / (2 * np.pi)
+    inclination = np.degrees(np.arccos(rng.uniform(-1.0, 1.0, count)))
+    raan, arg_perigee, mean_anomaly = rng.uniform(0.0, 360.0, (3, count))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for k in range(count):
+                line1, line2 = format_tle(k + 1, start_time, inclination[k], raan[k], ecc[k],
+                                          arg_perigee[k], mean_anomaly[k], mean_motion[k])
+                f.write(f'SYNTH {k + 1:06d}\n{line1}\n{line2}\n')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def prepare_datasets(sizes, data_dir, start_time, seed=DEFAULT_SEED, real=True, log=print):
+    """
+    Dict nama dataset -> path file TLE di data_dir (katalog sintetis dibuat
+    jika belum ada, file asli disalin jika belum ada atau berubah)
+    """
+    datasets = {}
+    if sizes or real:
+        os.makedirs(data_dir, exist_ok=True)
+    for count in sizes:
+        path = os.path.join(data_dir, f'synthetic_{count}_s{seed}_{start_time:%Y%m%d%H%M}.txt')
+        if not os.path.exists(path):
+            log(f"[INFO] Membuat katalog sintetis {count} objek -> {path}")
+            synthetic_catalog(path, count, start_time, seed)
+        datasets[f'synthetic_{count}'] = path
+    if real:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        for name, filename in REAL_DATASETS.items():
+            source = os.path.join(base_dir, filename)
+            if not os.path.exists(source):
+                log(f"[INFO] {filename} tidak ditemukan, dataset {name} dilewati")
+                continue
+            path = os.path.join(data_dir, filename)
+            source_stat = os.stat(source)
+            if (not os.path.exists(path) or os.stat(path).st_size != source_stat.st_size or
+                    os.stat(path).st_mtime_ns != source_stat.st_mtime_ns):
+                log(f"[INFO] Menyalin {filename} -> {path}")
+                shutil.copy2(source, path)
+            datasets[name] = path
+    return datasets
+
+
+def read_tle_satellites(path, limit=None):
+    """Satelit (name, tle_line1, tle_line2) dari file TLE 3 baris"""
+    satellites = []
+    with open(path) as f:
+        lines = [line.strip() for line in f if line.strip()]
+    for i in range(0, len(lines) - 2, 3):
+        if limit is not None and len(satellites) >= limit:
+            break
+        satellites.append({'name': lines[i], 'tle_line1': lines[i + 1], 'tle_line2': lines[i + 2]})
+    return satellites
+
+
+def _cold_catalog(path):
+    """
+    Buang katalog binary dan cache proses agar load_catalog berikutnya
+    mengompilasi ulang; hanya untuk file di --data-dir
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(catalog_path_for(path))
+    tle_catalog._catalogs.pop(os.path.abspath(path), None)
+
+
+def time_call(func, repeat, setup=None):
+    """
+    Waktu (detik) func() sebanyak repeat kali; stdout func dibuang
+
+    Returns:
+    --------
+    times : list float
+    result : hasil panggilan terakhir
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - started)
+    return times, result
+
+
+class BenchmarkSuite:
+    """
+    Kumpulan hasil benchmark untuk satu run
+
+    Parameters:
+    -----------
+    start_time : datetime (UTC)
+        Waktu propagasi semua case
+    repeat : int
+    pass_limit : int or None
+        Lihat DEFAULT_PASS_LIMIT
+    """
+
+    def __init__(self, start_time=DEFAULT_START, repeat=DEFAULT_REPEAT,
+                 pass_limit=DEFAULT_PASS_LIMIT, log=print):
+        self.start_time = start_time
+        self.repeat = max(1, int(repeat))
+        self.pass_limit = pass_limit
+        self.log = log
+        self.results = []
+        self.errors = []
+        self._trajectory = None
+
+    def record(self, case, engine, dataset, objects, times, **extra):
+        median = statistics.median(times)
+        entry = {
+            'case': case,
+            'engine': engine,
+            'dataset': dataset,
+            'objects': objects,
+            'repeat': len(times),
+            'times_seconds': times,
+            'min_seconds': min(times),
+            'median_seconds': median,
+            'objects_per_second': objects / median if objects and median > 0 else None
+        }
+        entry.update(extra)
+        self.results.append(entry)
+        if self.log:
+            self.log(f"[OK] {case:<30} {engine:<22} {dataset:<18} n={objects:<7} "
+                     f"median {median * 1000:10.1f} ms")
+        return entry
+
+    @property
+    def trajectory(self):
+        if self._trajectory is None:
+            self._trajectory = propagate_satellite_trajectory(
+                BENCH_SATELLITE[1], BENCH_SATELLITE[2], start_time=self.start_time)
+        return self._trajectory
+
+    def measure(self, case, engine, dataset, func, objects, setup=None, details=None):
+        """
+        Jalankan time_call dan catat hasilnya; exception dicatat di self.errors
+        (case lain tetap dijalankan)
+
+        objects dan details boleh berupa fungsi dari hasil panggilan terakhir.
+        """
+        try:
+            times, result = time_call(func, self.repeat, setup)
+        except Exception as e:
+            error = {'case': case, 'engine': engine, 'dataset': dataset,
+                     'error': f'{type(e).__name__}: {e}'}
+            self.errors.append(error)
+            if self.log:
+                self.log(f"[ERROR] {case} {engine} {dataset}: {error['error']}")
+            return None
+        if callable(objects):
+            objects = objects(result)
+        self.record(case, engine, dataset, objects, times, **(details(result) if details else {}))
+        return result
+
+    def bench_propagation(self):
+        for engine, step_minutes in (('step_60s', 1.0), ('step_10s', 10.0 / 60.0)):
+            self.measure('propagate_satellite_trajectory', engine, 'iss',
+                         lambda: propagate_satellite_trajectory(BENCH_SATELLITE[1], BENCH_SATELLITE[2],
+                                                                time_step_minutes=step_minutes,
+                                                                start_time=self.start_time),
+                         len)
+
+    def bench_dataset(self, name, path, cases):
+        if 'load_catalog' in cases:
+            self.measure('load_catalog', 'cold_compile', name, lambda: load_catalog(path),
+                         len, setup=lambda: _cold_catalog(path))
+
+        load_catalog(path)
+        debris = self.measure('parse_debris_tle', 'cached_catalog', name,
+                              lambda: parse_debris_tle(path, current_time=self.start_time), len)
+        if 'parse_debris_tle' not in cases and debris is not None:
+            # Posisi debris hanya dipakai sebagai input case lain
+            self.results.pop()
+
+        if 'check_collision' in cases and debris is not None:
+            trajectory = self.trajectory
+            self.measure('check_collision', 'kdtree', name,
+                         lambda: check_collision(trajectory, debris), len(debris),
+                         details=lambda result: {'trajectory_points': len(trajectory),
+                                                 'collisions': result['collision_count']})
+
+        if 'predict_satellite_collision' in cases:
+            for engine, kwargs in (('snapshot', {'mode': 'snapshot'}),
+                                   ('time_resolved', {'mode': 'time_resolved'}),
+                                   ('time_resolved_no_sieve', {'mode': 'time_resolved', 'sieve': False})):
+                self.measure('predict_satellite_collision', engine, name,
+                             lambda: predict_satellite_collision(BENCH_SATELLITE[1], BENCH_SATELLITE[2],
+                                                                 path, start_time=self.start_time,
+                                                                 **kwargs),
+                             len(load_catalog(path)),
+                             details=lambda result: {'collisions': result['collision_count']})
+
+        if 'calculate_network_passes' in cases:
+            satellites = read_tle_satellites(path, self.pass_limit)
+            for engine, prefilter in (('prefilter', True), ('no_prefilter', False)):
+                self.measure('calculate_network_passes', engine, name,
+                             lambda: calculate_network_passes(satellites, BENCH_STATIONS, self.start_time,
+                                                              PASS_SEARCH_HOURS, workers=1,
+                                                              prefilter=prefilter),
+                             len(satellites),
+                             details=lambda result: {'stations': len(BENCH_STATIONS),
+                                                     'search_hours': PASS_SEARCH_HOURS,
+                                                     'passes': len(result[0])})
+
+        if debris is None:
+            return
+        lats = np.array([d['lat'] for d in debris])
+        lons = np.array([d['lon'] for d in debris])
+        alts = np.array([d['alt'] for d in debris])
+        if 'render_debris_map' in cases:
+            # Basemap dirender sekali di luar pengukuran (seperti server yang sudah berjalan)
+            self.measure('render_debris_map', 'cached_basemap', name,
+                         lambda: render_debris_map(lats, lons, alts, name), len(debris),
+                         setup=lambda: get_basemap(DEFAULT_MAP_WIDTH))
+
+        if 'render_tile' in cases:
+            cat_idx = np.array([d['cat_idx'] for d in debris])
+            for zoom in (0, 3):
+                # Tile di atas Indonesia pada zoom tersebut
+                x = int((106.8 + 180.0) / 360.0 * 2**zoom)
+                y = 2**zoom // 2
+                self.measure('render_tile', f'z{zoom}', name,
+                             lambda: render_tile(lats, lons, cat_idx, zoom, x, y), len(debris))
+
+    def run(self, datasets, cases=CASES):
+        if 'propagate_satellite_trajectory' in cases:
+            self.bench_propagation()
+        for name, path in datasets.items():
+            self.bench_dataset(name, path, cases)
+        return self.results
+
+
+def _git_commit():
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                timeout=10, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run_metadata(args_dict):
+    return {
+        'format_version': BENCHMARK_FORMAT_VERSION,
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'sgp4': getattr(sgp4, '__version__', None),
+        'args': args_dict
+    }
+
+
+def compare_results(current, baseline, tolerance=DEFAULT_REGRESSION_TOLERANCE):
+    """
+    Bandingkan median per (case, engine, dataset, objects)
+
+    Returns:
+    --------
+    list dict dengan 'ratio' (median sekarang / baseline) dan 'regression'
+    """
+    def key(entry):
+        return (entry['case'], entry['engine'], entry['dataset'], entry['objects'])
+
+    previous = {key(entry): entry for entry in baseline['results']}
+    comparison = []
+    for entry in current['results']:
+        base = previous.get(key(entry))
+        if base is None or base['median_seconds'] <= 0:
+            continue
+        ratio = entry['median_seconds'] / base['median_seconds']
+        comparison.append({
+            'case': entry['case'],
+            'engine': entry['engine'],
+            'dataset': entry['dataset'],
+            'objects': entry['objects'],
+            'baseline_median_seconds': base['median_seconds'],
+            'median_seconds': entry['median_seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1.0 + tolerance
+        })
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hot path collision, pass dan peta')
+    parser.add_argument('--sizes', nargs='*', type=int, default=list(DEFAULT_SIZES),
+                        help='Jumlah objek katalog sintetis')
+    parser.add_argument('--no-real', action='store_true', help='Lewati FENGYUN debris.txt dan TLE.txt')
+    parser.add_argument('--cases', nargs='*', choices=CASES, default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--pass-limit', type=int, default=DEFAULT_PASS_LIMIT,
+                        help='Satelit maksimum per dataset untuk pass (0 = semua)')
+    parser.add_argument('--start', help='Waktu propagasi UTC (YYYY-MM-DDTHH:MM:SS)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'leo_benchmark'),
+                        help='Direktori katalog sintetis dan salinan file TLE asli')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help="File hasil JSON ('-' = stdout)")
+    parser.add_argument('--compare', help='File hasil sebelumnya untuk deteksi regresi')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_REGRESSION_TOLERANCE,
+                        help='Batas kenaikan median relatif sebelum dianggap regresi')
+    args = parser.parse_args()
+
+    start_time = datetime.fromisoformat(args.start) if args.start else DEFAULT_START
+    log = print if args.output != '-' else (lambda message: print(message, file=sys.stderr))
+
+    datasets = prepare_datasets(args.sizes, args.data_dir, start_time, args.seed, not args.no_real, log)
+    suite = BenchmarkSuite(start_time, args.repeat, args.pass_limit or None, log)
+    started = time.perf_counter()
+    suite.run(datasets, args.cases)
+
+    report = {
+        'meta': run_metadata(dict(vars(args), start=start_time.isoformat())),
+        'datasets': {name: {'path': path, 'objects': len(load_catalog(path))}
+                     for name, path in datasets.items()},
+        'results': suite.results,
+        'errors': suite.errors
+    }
+    report['meta']['elapsed_seconds'] = time.perf_counter() - started
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report['comparison'] = compare_results(report, baseline, args.tolerance)
+        regressions = [c for c in report['comparison'] if c['regression']]
+        for c in regressions:
+            log(f"[REGRESI] {c['case']} {c['engine']} {c['dataset']} n={c['objects']}: "
+                f"{c['ratio']:.2f}x ({c['baseline_median_seconds'] * 1000:.1f} -> "
+                f"{c['median_seconds'] * 1000:.1f} ms)")
+        log(f"[INFO] {len(report['comparison'])} hasil dibandingkan, {len(regressions)} regresi")
+        exit_code = 1 if regressions else 0
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        log(f"[OK] Hasil benchmark -> {args.output} ({report['meta']['elapsed_seconds']:.1f} detik)")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
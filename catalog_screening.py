@@ -0,0 +1,364 @@
+"""
+Screening konjungsi seluruh katalog (all-vs-all) untuk job batch/nightly
+========================================================================
+Setiap objek di file TLE discreening terhadap semua objek lain selama satu
+jendela waktu:
+
+1. Jendela dibagi menjadi blok step waktu yang dikerjakan paralel oleh
+   process pool. Setiap worker memakai katalog binary yang sama
+   (memory-mapped, lihat tle_catalog) dan mempropagasi seluruh katalog
+   dengan SatrecArray.
+2. Per step, cKDTree.query_pairs mencari pasangan dalam radius
+   threshold + v_max * dt, sehingga tidak ada pengecekan N^2 pasangan.
+3. Pasangan tersebut disaring dengan model gerak relatif linear dalam
+   +/- dt/2 di sekitar step (TCA linear).
+4. Pasangan yang lolos dikelompokkan per encounter dan TCA-nya diperhalus
+   dengan refine_tca (root-finding range-rate); jika propagasi gagal,
+   estimasi linear dari langkah 3 tetap dipakai.
+
+Hasilnya adalah tabel konjungsi ringkas (CONJUNCTION_DTYPE) yang bisa
+disimpan sebagai .npy atau .csv.
+
+Contoh:
+    python catalog_screening.py TLE.txt --hours 24 --step 10 --threshold 5 -o conjunctions.npy
+"""
+
+import argparse
+import csv
+import os
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sgp4.api import jday
+
+from collision_prediction import COLLISION_THRESHOLD
+from conjunction_screening import refine_tca
+from tle_catalog import load_catalog
+
+# Default step screening (detik); radius query KD-tree = threshold + v_max * step
+CATALOG_STEP_SECONDS = 10.0
+
+# Pad (km) untuk kesalahan model gerak linear dalam setengah step
+LINEAR_MARGIN_KM = 1.0
+
+# State dengan kecepatan di atas ini dianggap hasil propagasi yang divergen
+# (TLE yang sudah sangat tua) dan tidak ikut discreening
+MAX_ORBITAL_SPEED_KM_S = 12.0
+
+# Jumlah step waktu per task worker
+STEPS_PER_TASK = 30
+
+CONJUNCTION_DTYPE = np.dtype([
+    ('primary_index', '<i4'),
+    ('secondary_index', '<i4'),
+    ('primary_satnum', '<i4'),
+    ('secondary_satnum', '<i4'),
+    ('tca_jd', '<f8'),
+    ('tca_offset_seconds', '<f8'),
+    ('miss_distance_km', '<f8'),
+    ('relative_speed_km_s', '<f8'),
+])
+
+_CANDIDATE_DTYPE = np.dtype([
+    ('step', '<i4'),
+    ('i', '<i4'),
+    ('j', '<i4'),
+    ('distance', '<f8'),
+    ('t', '<f8'),
+    ('speed', '<f8'),
+])
+
+# State per proses worker (diisi oleh _init_worker)
+_worker_catalog = None
+
+
+def _init_worker(tle_file_path):
+    global _worker_catalog
+    _worker_catalog = load_catalog(tle_file_path)
+
+
+def _screen_steps(task):
+    """
+    Screening satu blok step waktu
+
+    Returns array _CANDIDATE_DTYPE: pasangan (i < j) yang jarak TCA linearnya
+    dalam +/- dt/2 di sekitar step < threshold + LINEAR_MARGIN_KM
+    """
+    jd0, fr0, first_step, num_steps, step_minutes, duration_minutes, threshold = task
+    satrec_array = _worker_catalog.satrec_array()
+
+    steps = np.arange(first_step, first_step + num_steps)
+    offsets = steps * step_minutes
+    jd = np.full(num_steps, jd0)
+    fr = fr0 + offsets / 1440.0
+
+    errors, positions, velocities = satrec_array.sgp4(jd, fr)
+    step_seconds = step_minutes * 60.0
+    half_step = step_seconds / 2.0
+    speed2 = np.sum(velocities**2, axis=2)
+
+    found = []
+    for k in range(num_steps):
+        valid = np.flatnonzero((errors[:, k] == 0) & (speed2[:, k] < MAX_ORBITAL_SPEED_KM_S**2))
+        if len(valid) < 2:
+            continue
+        r = positions[valid, k]
+        v = velocities[valid, k]
+
+        # Kecepatan relatif maksimum <= 2 * v_max, jadi dalam dt/2 jarak bisa turun v_max * dt
+        v_max = float(np.sqrt(np.max(speed2[valid, k])))
+        radius = threshold + LINEAR_MARGIN_KM + v_max * step_seconds
+        pairs = cKDTree(r).query_pairs(radius, output_type='ndarray')
+        if len(pairs) == 0:
+            continue
+
+        dr = r[pairs[:, 1]] - r[pairs[:, 0]]
+        dv = v[pairs[:, 1]] - v[pairs[:, 0]]
+        dv2 = np.sum(dv**2, axis=1)
+        tau = -np.sum(dr * dv, axis=1) / np.where(dv2 > 0, dv2, 1.0)
+        # Jangan keluar dari jendela [0, duration]
+        tau = np.clip(tau, max(-half_step, -offsets[k] * 60.0),
+                      min(half_step, (duration_minutes - offsets[k]) * 60.0))
+        distance = np.sqrt(np.sum((dr + dv * tau[:, None])**2, axis=1))
+
+        close = distance < threshold + LINEAR_MARGIN_KM
+        if not np.any(close):
+            continue
+
+        chunk = np.empty(int(np.sum(close)), dtype=_CANDIDATE_DTYPE)
+        chunk['step'] = steps[k]
+        chunk['i'] = valid[pairs[close, 0]]
+        chunk['j'] = valid[pairs[close, 1]]
+        chunk['distance'] = distance[close]
+        chunk['t'] = offsets[k] + tau[close] / 60.0
+        chunk['speed'] = np.sqrt(dv2[close])
+        found.append(chunk)
+
+    if not found:
+        return np.empty(0, dtype=_CANDIDATE_DTYPE)
+    return np.concatenate(found)
+
+
+def group_encounters(candidates):
+    """
+    Kelompokkan kandidat per pasangan menjadi encounter (step berurutan)
+
+    Returns array _CANDIDATE_DTYPE berisi kandidat dengan jarak linear
+    terkecil per encounter
+    """
+    if len(candidates) == 0:
+        return candidates
+
+    candidates = candidates[np.lexsort((candidates['step'], candidates['j'], candidates['i']))]
+    new_encounter = np.ones(len(candidates), dtype=bool)
+    new_encounter[1:] = ((candidates['i'][1:] != candidates['i'][:-1]) |
+                         (candidates['j'][1:] != candidates['j'][:-1]) |
+                         (candidates['step'][1:] - candidates['step'][:-1] > 1))
+    encounter_id = np.cumsum(new_encounter) - 1
+
+    # Kandidat terbaik per encounter: urutkan jarak, ambil yang pertama per id
+    order = np.lexsort((candidates['distance'], encounter_id))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = encounter_id[order][1:] != encounter_id[order][:-1]
+
+    return candidates[order[first]]
+
+
+def _refine_encounters(task):
+    """Perhalus TCA satu blok encounter. Returns list (index encounter, hasil refine_tca)"""
+    jd0, fr0, encounters, step_minutes, duration_minutes = task
+    satrecs = _worker_catalog.satrecs()
+
+    results = []
+    for n, enc in enumerate(encounters):
+        center = enc['step'] * step_minutes
+        t_lo = max(0.0, center - step_minutes)
+        t_hi = min(duration_minutes, center + step_minutes)
+        tca = refine_tca(satrecs[enc['i']], satrecs[enc['j']], jd0, fr0,
+                         t_lo, t_hi, t_guess=float(np.clip(enc['t'], t_lo, t_hi)))
+        results.append((n, tca))
+    return results
+
+
+def _split(array, parts):
+    parts = max(1, min(parts, len(array)))
+    return np.array_split(array, parts)
+
+
+def screen_catalog(tle_file_path, start_time=None, duration_minutes=1440.0,
+                   step_seconds=CATALOG_STEP_SECONDS, threshold=COLLISION_THRESHOLD,
+                   workers=None, refine=True):
+    """
+    Screening konjungsi all-vs-all untuk satu file TLE
+
+    Parameters:
+    -----------
+    tle_file_path : str
+    start_time : datetime, optional
+        Awal jendela (UTC, default: sekarang)
+    duration_minutes : float
+        Panjang jendela screening
+    step_seconds : float
+        Step grid screening; radius query = threshold + v_max * step
+    threshold : float
+        Jarak (km) untuk konjungsi
+    workers : int, optional
+        Jumlah proses (default: os.cpu_count()); 1 = tanpa process pool
+    refine : bool
+        True = TCA dan miss distance dari refine_tca, False = estimasi linear
+
+    Returns:
+    --------
+    table : array CONJUNCTION_DTYPE, terurut per TCA
+    stats : dict
+    """
+    if start_time is None:
+        start_time = datetime.utcnow()
+    start_time = start_time.replace(microsecond=0)
+    workers = workers or os.cpu_count() or 1
+
+    catalog = load_catalog(tle_file_path)
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute, start_time.second)
+
+    step_minutes = step_seconds / 60.0
+    num_steps = int(duration_minutes // step_minutes) + 1
+    tasks = [(jd0, fr0, first, min(STEPS_PER_TASK, num_steps - first), step_minutes,
+              duration_minutes, threshold)
+             for first in range(0, num_steps, STEPS_PER_TASK)]
+
+    started = time.perf_counter()
+    pool = None
+    if workers > 1 and len(catalog) > 0:
+        pool = Pool(workers, initializer=_init_worker, initargs=(catalog.source_path,))
+        map_function = pool.imap_unordered
+    else:
+        _init_worker(catalog.source_path)
+        map_function = map
+
+    try:
+        if len(catalog) > 1:
+            candidates = np.concatenate(
+                [np.empty(0, dtype=_CANDIDATE_DTYPE)] + list(map_function(_screen_steps, tasks)))
+        else:
+            candidates = np.empty(0, dtype=_CANDIDATE_DTYPE)
+        screening_seconds = time.perf_counter() - started
+
+        encounters = group_encounters(candidates)
+
+        table = np.empty(len(encounters), dtype=CONJUNCTION_DTYPE)
+        table['primary_index'] = encounters['i']
+        table['secondary_index'] = encounters['j']
+        table['tca_offset_seconds'] = encounters['t'] * 60.0
+        table['miss_distance_km'] = encounters['distance']
+        table['relative_speed_km_s'] = encounters['speed']
+
+        if refine and len(encounters) > 0:
+            refine_tasks = [(jd0, fr0, block, step_minutes, duration_minutes)
+                            for block in _split(encounters, workers * 4)]
+            offset = 0
+            # map berurutan (bukan unordered) supaya index blok tetap sesuai
+            refine_map = pool.imap if pool is not None else map
+            for block, results in zip(refine_tasks, refine_map(_refine_encounters, refine_tasks)):
+                for n, tca in results:
+                    # Refine gagal (sgp4 error): estimasi linear di table tetap dipakai
+                    if tca is None:
+                        continue
+                    row = offset + n
+                    table['tca_offset_seconds'][row] = tca['t'] * 60.0
+                    table['miss_distance_km'][row] = tca['distance']
+                    table['relative_speed_km_s'][row] = tca['relative_speed']
+                offset += len(block[2])
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    table = table[table['miss_distance_km'] < threshold]
+    table = table[np.argsort(table['tca_offset_seconds'], kind='stable')]
+
+    satnums = catalog.satnums
+    table['primary_satnum'] = satnums[table['primary_index']]
+    table['secondary_satnum'] = satnums[table['secondary_index']]
+    table['tca_jd'] = jd0 + fr0 + table['tca_offset_seconds'] / 86400.0
+
+    stats = {
+        'objects': len(catalog),
+        'steps': num_steps,
+        'workers': workers,
+        'candidates': int(len(candidates)),
+        'encounters': int(len(encounters)),
+        'conjunctions': int(len(table)),
+        'screening_seconds': screening_seconds,
+        'total_seconds': time.perf_counter() - started,
+        'start_time': start_time.isoformat(),
+        'catalog_version': catalog.version
+    }
+
+    return table, stats
+
+
+def write_conjunction_table(table, output_path, start_time=None, names=None):
+    """
+    Simpan tabel konjungsi: .npy (binary ringkas) atau .csv
+    (CSV ditambah kolom nama objek dan waktu TCA UTC jika tersedia)
+    """
+    if output_path.endswith('.npy'):
+        np.save(output_path, table)
+        return output_path
+
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        header = list(CONJUNCTION_DTYPE.names)
+        if names is not None:
+            header += ['primary_name', 'secondary_name']
+        if start_time is not None:
+            header.append('tca_utc')
+        writer.writerow(header)
+
+        for row in table:
+            values = [row[field].item() for field in CONJUNCTION_DTYPE.names]
+            if names is not None:
+                values += [names[row['primary_index']], names[row['secondary_index']]]
+            if start_time is not None:
+                tca = start_time + timedelta(seconds=float(row['tca_offset_seconds']))
+                values.append(tca.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])
+            writer.writerow(values)
+
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Screening konjungsi all-vs-all untuk katalog TLE')
+    parser.add_argument('tle_file', nargs='?', default='TLE.txt')
+    parser.add_argument('--start', help='Awal jendela UTC (YYYY-MM-DDTHH:MM:SS), default sekarang')
+    parser.add_argument('--hours', type=float, default=24.0, help='Panjang jendela (jam)')
+    parser.add_argument('--step', type=float, default=CATALOG_STEP_SECONDS, help='Step screening (detik)')
+    parser.add_argument('--threshold', type=float, default=COLLISION_THRESHOLD, help='Threshold (km)')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah proses (default: semua core)')
+    parser.add_argument('--no-refine', action='store_true', help='Tanpa refinement TCA')
+    parser.add_argument('-o', '--output', default='conjunctions.npy', help='File output (.npy atau .csv)')
+    args = parser.parse_args()
+
+    start_time = datetime.fromisoformat(args.start) if args.start else datetime.utcnow()
+    start_time = start_time.replace(microsecond=0)
+
+    print(f"[INFO] Screening {args.tle_file}: {args.hours} jam, step {args.step} detik, "
+          f"threshold {args.threshold} km")
+    table, stats = screen_catalog(args.tle_file, start_time, args.hours * 60.0, args.step,
+                                  args.threshold, args.workers, not args.no_refine)
+
+    names = load_catalog(args.tle_file).names
+    write_conjunction_table(table, args.output, start_time, names)
+
+    print(f"[OK] {stats['objects']} objek, {stats['steps']} step, {stats['workers']} worker")
+    print(f"[OK] {stats['encounters']} encounter kandidat -> {stats['conjunctions']} konjungsi "
+          f"< {args.threshold} km")
+    print(f"[OK] Selesai dalam {stats['total_seconds']:.1f} detik -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
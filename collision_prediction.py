@@ -1,13 +1,27 @@
 import numpy as np
-from sgp4.api import Satrec, jday
+from sgp4.api import Satrec, SatrecArray, jday
 from datetime import datetime, timedelta
 import math
+from tle_catalog import load_catalog
+from spatial_index import DebrisIndex
+from astro_context import get_satrec
 
 # Konstanta
 EARTH_RADIUS = 6371.0  # km
 COLLISION_THRESHOLD = 5.0  # km - jarak minimum aman
 MU = 398600.4418  # km^3/s^2 - Earth gravitational parameter
 
+# Kategori altitude LEO (index = cat_idx)
+ALTITUDE_CATEGORIES = ['160-528 km', '528-896 km', '896-1264 km',
+                       '1264-1632 km', '1632-2000 km']
+ALTITUDE_BIN_EDGES = np.array([160.0, 528.0, 896.0, 1264.0, 1632.0, 2000.0])
+
+# Mode screening untuk predict_satellite_collision
+SCREENING_MODES = ('snapshot', 'time_resolved')
+
+# Jumlah titik lintasan per chunk check_collision jika progress diberikan
+PROGRESS_CHUNK_POINTS = 32
+
 
 def calculate_orbital_period(tle_line1, tle_line2):
     
@@ -18,9 +32,88 @@ def calculate_orbital_period(tle_line1, tle_line2):
     return period
 
 
-def propagate_satellite_trajectory(tle_line1, tle_line2, num_periods=5, time_step_minutes=1):
-    # Parse TLE
-    satellite = Satrec.twoline2rv(tle_line1, tle_line2)
+class Trajectory:
+    """
+    Lintasan satelit dalam bentuk kolom (struct-of-arrays)
+
+    Atribut x, y, z, lat, lon, alt dan offsets_minutes adalah array NumPy (N,)
+    berisi titik yang berhasil dipropagasi. Untuk pemanggil lama, Trajectory
+    juga berperilaku seperti list dict: len(), iterasi, trajectory[i] (dict
+    dengan key 'time', 'x', 'y', 'z', 'lat', 'lon', 'alt') dan slicing
+    (menghasilkan Trajectory). Dict dibuat baru setiap kali diakses.
+    """
+
+    _FIELDS = ('offsets_minutes', 'x', 'y', 'z', 'lat', 'lon', 'alt')
+
+    def __init__(self, start_time, offsets_minutes, x, y, z, lat, lon, alt):
+        self.start_time = start_time
+        self.offsets_minutes = offsets_minutes
+        self.x = x
+        self.y = y
+        self.z = z
+        self.lat = lat
+        self.lon = lon
+        self.alt = alt
+
+    def __len__(self):
+        return len(self.offsets_minutes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice) or isinstance(key, np.ndarray):
+            return Trajectory(self.start_time,
+                              *(getattr(self, name)[key] for name in self._FIELDS))
+        return self.point(key)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.point(i)
+
+    @property
+    def positions(self):
+        """Array posisi (N, 3) dalam km (TEME)"""
+        return np.column_stack((self.x, self.y, self.z))
+
+    @property
+    def times(self):
+        return [self.time_at(i) for i in range(len(self))]
+
+    def time_at(self, i):
+        return self.start_time + timedelta(minutes=float(self.offsets_minutes[i]))
+
+    def point(self, i):
+        """Titik ke-i sebagai dict (format lama propagate_satellite_trajectory)"""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('trajectory index out of range')
+        return {
+            'time': self.time_at(i),
+            'x': float(self.x[i]),
+            'y': float(self.y[i]),
+            'z': float(self.z[i]),
+            'lat': float(self.lat[i]),
+            'lon': float(self.lon[i]),
+            'alt': float(self.alt[i])
+        }
+
+    def to_dicts(self):
+        return list(self)
+
+
+def propagate_satellite_trajectory(tle_line1, tle_line2, num_periods=5, time_step_minutes=1,
+                                   start_time=None):
+    """
+    Propagasi lintasan satelit dengan satu panggilan sgp4_array
+
+    time_step_minutes boleh pecahan (mis. 10/60 untuk 10 detik). Titik yang
+    gagal dipropagasi SGP4 dilewati seperti sebelumnya.
+
+    Returns:
+    --------
+    Trajectory
+    """
+    # Parse TLE (dari cache astro_context)
+    satellite = get_satrec(tle_line1, tle_line2)
     
     # Hitung periode orbit
     period_minutes = calculate_orbital_period(tle_line1, tle_line2)
@@ -31,37 +124,28 @@ def propagate_satellite_trajectory(tle_line1, tle_line2, num_periods=5, time_ste
     # Jumlah step
     num_steps = int(total_time / time_step_minutes)
     
-    # Waktu mulai (sekarang)
-    start_time = datetime.utcnow()
+    # Waktu mulai (default: sekarang)
+    if start_time is None:
+        start_time = datetime.utcnow()
     
-    trajectory = []
+    # Grid waktu: jd tetap, fr bertambah per step (sgp4 menjumlahkan jd + fr)
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute,
+                    start_time.second + start_time.microsecond / 1e6)
+    offsets_minutes = np.arange(num_steps) * float(time_step_minutes)
     
-    for i in range(num_steps):
-        # Hitung waktu untuk step ini
-        current_time = start_time + timedelta(minutes=i * time_step_minutes)
-        jd, fr = jday(current_time.year, current_time.month, current_time.day,
-                      current_time.hour, current_time.minute, current_time.second)
-        
-        # Propagasi posisi satelit
-        error, position, velocity = satellite.sgp4(jd, fr)
-        
-        if error == 0:  # Tidak ada error
-            x, y, z = position
-            
-            # Konversi ECI ke Lat/Lon
-            lat, lon, alt = eci_to_latlon(x, y, z)
-            
-            trajectory.append({
-                'time': current_time,
-                'x': x,
-                'y': y,
-                'z': z,
-                'lat': lat,
-                'lon': lon,
-                'alt': alt
-            })
+    error, position, velocity = satellite.sgp4_array(np.full(num_steps, jd0),
+                                                     fr0 + offsets_minutes / 1440.0)
+    
+    # Buang titik yang gagal dipropagasi
+    ok = error == 0
+    position = position[ok].reshape(-1, 3)
+    x, y, z = position[:, 0], position[:, 1], position[:, 2]
     
-    return trajectory
+    # Konversi ECI ke Lat/Lon
+    lat, lon, alt = eci_to_latlon_array(x, y, z)
+    
+    return Trajectory(start_time, offsets_minutes[ok], x, y, z, lat, lon, alt)
 
 
 def eci_to_latlon(x, y, z):
@@ -99,7 +183,134 @@ def categorize_altitude(altitude):
         return 'Out of range', -1
 
 
-def parse_debris_tle(tle_file_path, filter_category=None):
+def eci_to_latlon_array(x, y, z):
+    """
+    Versi vektor dari eci_to_latlon untuk array NumPy (bentuk bebas)
+    """
+    r = np.sqrt(x**2 + y**2 + z**2)
+    
+    altitude = r - EARTH_RADIUS
+    latitude = np.degrees(np.arcsin(z / r))
+    longitude = np.degrees(np.arctan2(y, x))
+    
+    return latitude, longitude, altitude
+
+
+def categorize_altitude_array(altitude):
+    """
+    Versi vektor dari categorize_altitude, hanya mengembalikan cat_idx
+    (-1 untuk di luar range). Nama kategori ada di ALTITUDE_CATEGORIES.
+    """
+    altitude = np.asarray(altitude, dtype=float)
+    
+    cat_idx = np.searchsorted(ALTITUDE_BIN_EDGES, altitude, side='right') - 1
+    # Batas atas 2000 km masih termasuk kategori terakhir
+    cat_idx = np.where(altitude == ALTITUDE_BIN_EDGES[-1], len(ALTITUDE_CATEGORIES) - 1, cat_idx)
+    cat_idx = np.where((cat_idx < 0) | (cat_idx >= len(ALTITUDE_CATEGORIES)), -1, cat_idx)
+    
+    return cat_idx
+
+
+def category_name(cat_idx):
+    if 0 <= cat_idx < len(ALTITUDE_CATEGORIES):
+        return ALTITUDE_CATEGORIES[cat_idx]
+    return 'Out of range'
+
+
+def load_tle_satrecs(tle_file_path):
+    """
+    Baca file TLE 3 baris (nama, line1, line2) menjadi list Satrec
+    
+    Returns:
+    --------
+    names : list of str
+    satrecs : list of Satrec
+    """
+    with open(tle_file_path, 'r') as file:
+        lines = file.readlines()
+    
+    names = []
+    satrecs = []
+    
+    for i in range(0, len(lines), 3):
+        if i + 2 < len(lines):
+            line1 = lines[i + 1].strip()
+            line2 = lines[i + 2].strip()
+            
+            try:
+                satrecs.append(Satrec.twoline2rv(line1, line2))
+                names.append(lines[i].strip())
+            except Exception:
+                continue
+    
+    return names, satrecs
+
+
+def propagate_catalog(satrecs, jd, fr):
+    """
+    Propagasi batch seluruh katalog dalam satu panggilan SatrecArray
+    
+    Parameters:
+    -----------
+    satrecs : list of Satrec atau SatrecArray
+    jd, fr : float atau array
+        Julian date (bagian bulat dan pecahan). Jika scalar, dimensi waktu
+        dihilangkan dari hasil.
+    
+    Returns:
+    --------
+    dict berisi array NumPy:
+        'position', 'velocity' : (N, 3) atau (N, T, 3) dalam km dan km/s (TEME)
+        'lat', 'lon', 'alt'    : (N,) atau (N, T)
+        'cat_idx'              : index kategori altitude (-1 = di luar range)
+        'valid'                : True jika propagasi SGP4 berhasil
+    """
+    scalar_time = np.ndim(jd) == 0
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    fr = np.atleast_1d(np.asarray(fr, dtype=float))
+    
+    if not isinstance(satrecs, SatrecArray):
+        if len(satrecs) == 0:
+            shape = (0,) if scalar_time else (0, len(jd))
+            return {
+                'position': np.empty(shape + (3,)),
+                'velocity': np.empty(shape + (3,)),
+                'lat': np.empty(shape),
+                'lon': np.empty(shape),
+                'alt': np.empty(shape),
+                'cat_idx': np.empty(shape, dtype=int),
+                'valid': np.empty(shape, dtype=bool)
+            }
+        satrecs = SatrecArray(satrecs)
+    
+    error, position, velocity = satrecs.sgp4(jd, fr)
+    
+    if scalar_time:
+        error = error[:, 0]
+        position = position[:, 0, :]
+        velocity = velocity[:, 0, :]
+    
+    valid = (error == 0) & np.isfinite(position).all(axis=-1)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        lat, lon, alt = eci_to_latlon_array(position[..., 0], position[..., 1],
+                                            position[..., 2])
+    
+    cat_idx = categorize_altitude_array(alt)
+    cat_idx[~valid] = -1
+    
+    return {
+        'position': position,
+        'velocity': velocity,
+        'lat': lat,
+        'lon': lon,
+        'alt': alt,
+        'cat_idx': cat_idx,
+        'valid': valid
+    }
+
+
+def parse_debris_tle(tle_file_path, filter_category=None, current_time=None):
     """
     Parse debris TLE dengan optional filtering berdasarkan kategori altitude
     
@@ -114,56 +325,57 @@ def parse_debris_tle(tle_file_path, filter_category=None):
         2: 896-1264 km
         3: 1264-1632 km
         4: 1632-2000 km
+    current_time : datetime, optional
+        Waktu snapshot posisi debris (UTC), None = sekarang
     """
-    debris_positions = []
-    
     try:
-        with open(tle_file_path, 'r') as file:
-            lines = file.readlines()
-        
-        current_time = datetime.utcnow()
-        jd, fr = jday(current_time.year, current_time.month, current_time.day,
-                      current_time.hour, current_time.minute, current_time.second)
-        
-        # Proses setiap TLE (3 baris: nama, line1, line2)
-        for i in range(0, len(lines), 3):
-            if i + 2 < len(lines):
-                line1 = lines[i + 1].strip()
-                line2 = lines[i + 2].strip()
-                
-                try:
-                    # Parse TLE
-                    debris = Satrec.twoline2rv(line1, line2)
-                    
-                    # Propagasi ke waktu sekarang
-                    error, position, velocity = debris.sgp4(jd, fr)
-                    
-                    if error == 0:
-                        x, y, z = position
-                        lat, lon, alt = eci_to_latlon(x, y, z)
-                        
-                        # Kategorisasi altitude
-                        category, cat_idx = categorize_altitude(alt)
-                        
-                        # Filter berdasarkan kategori jika diminta
-                        if filter_category is None or cat_idx == filter_category:
-                            debris_positions.append({
-                                'x': x,
-                                'y': y,
-                                'z': z,
-                                'lat': lat,
-                                'lon': lon,
-                                'alt': alt,
-                                'category': category,
-                                'cat_idx': cat_idx
-                            })
-                except Exception as e:
-                    continue
-    
+        # Elemen orbit diambil dari katalog binary (tanpa parsing teks per request)
+        catalog = load_catalog(tle_file_path)
     except FileNotFoundError:
         print(f"Error: File {tle_file_path} tidak ditemukan")
         return []
     
+    if current_time is None:
+        current_time = datetime.utcnow()
+    jd, fr = jday(current_time.year, current_time.month, current_time.day,
+                  current_time.hour, current_time.minute, current_time.second)
+    
+    # Propagasi seluruh katalog sekaligus
+    satrecs = catalog.satrec_array() if len(catalog) > 0 else []
+    state = propagate_catalog(satrecs, jd, fr)
+    
+    mask = state['valid']
+    if filter_category is not None:
+        mask = mask & (state['cat_idx'] == filter_category)
+    index = np.flatnonzero(mask)
+    
+    return debris_state_to_dicts(state, index)
+
+
+def debris_state_to_dicts(state, index):
+    """
+    Ubah hasil propagate_catalog (waktu tunggal) menjadi list dict debris
+    (format parse_debris_tle) untuk index yang dipilih
+    """
+    position = state['position'][index]
+    columns = zip(position[:, 0].tolist(), position[:, 1].tolist(),
+                  position[:, 2].tolist(), state['lat'][index].tolist(),
+                  state['lon'][index].tolist(), state['alt'][index].tolist(),
+                  state['cat_idx'][index].tolist())
+    
+    debris_positions = []
+    for x, y, z, lat, lon, alt, cat_idx in columns:
+        debris_positions.append({
+            'x': x,
+            'y': y,
+            'z': z,
+            'lat': lat,
+            'lon': lon,
+            'alt': alt,
+            'category': category_name(cat_idx),
+            'cat_idx': cat_idx
+        })
+    
     return debris_positions
 
 
@@ -175,34 +387,67 @@ def calculate_distance(pos1, pos2):
     return math.sqrt(dx**2 + dy**2 + dz**2)
 
 
-def check_collision(satellite_trajectory, debris_positions, threshold=COLLISION_THRESHOLD):
+def check_collision(satellite_trajectory, debris_positions, threshold=COLLISION_THRESHOLD,
+                    debris_index=None, progress=None):
+    """
+    Cek jarak setiap titik lintasan satelit terhadap semua debris.
+    
+    Menggunakan KD-tree (spatial_index.DebrisIndex) untuk query "debris dalam
+    threshold" dan "debris terdekat" per titik lintasan; hasilnya identik
+    dengan pengecekan brute-force per pasangan memakai calculate_distance.
+    debris_index boleh diberikan jika indeks untuk debris_positions sudah ada.
+    progress (opsional) dipanggil dengan fraksi titik lintasan yang sudah dicek,
+    per PROGRESS_CHUNK_POINTS titik; exception dari callback menghentikan pengecekan.
+    """
     min_distance = float('inf')
     closest_sat_point = None
     closest_debris = None
-    collision_count = 0
     collision_points = []
     
-    # Cek setiap titik di jalur satelit
-    for sat_pos in satellite_trajectory:
-        # Cek terhadap semua debris
-        for debris in debris_positions:
-            distance = calculate_distance(sat_pos, debris)
+    if len(satellite_trajectory) > 0 and len(debris_positions) > 0:
+        if debris_index is None:
+            debris_index = DebrisIndex.from_debris(debris_positions)
+        
+        if isinstance(satellite_trajectory, Trajectory):
+            sat_xyz = satellite_trajectory.positions
+        else:
+            sat_xyz = np.array([[p['x'], p['y'], p['z']] for p in satellite_trajectory],
+                               dtype=float)
+        
+        num_points = len(sat_xyz)
+        chunk = PROGRESS_CHUNK_POINTS if progress is not None else num_points
+        if progress is not None:
+            progress(0.0)
+        
+        for start in range(0, num_points, chunk):
+            stop = min(start + chunk, num_points)
             
-            # Update jarak minimum
-            if distance < min_distance:
-                min_distance = distance
-                closest_sat_point = sat_pos
-                closest_debris = debris
+            # Debris terdekat per titik lintasan, lalu titik pertama dengan jarak minimum
+            nearest_dist, nearest_idx = debris_index.query_nearest(sat_xyz[start:stop])
+            best = int(np.argmin(nearest_dist))
+            if nearest_dist[best] < min_distance:
+                min_distance = float(nearest_dist[best])
+                closest_sat_point = satellite_trajectory[start + best]
+                closest_debris = debris_positions[nearest_idx[best]]
             
-            # Cek apakah collision (jarak < threshold)
-            if distance < threshold:
-                collision_count += 1
-                collision_points.append({
-                    'time': sat_pos['time'],
-                    'distance': distance,
-                    'sat_pos': sat_pos,
-                    'debris_pos': debris
-                })
+            # Semua debris dalam threshold, urut per titik lintasan lalu per debris
+            hits = debris_index.query_within(sat_xyz[start:stop], threshold)
+            for i, (indices, distances) in enumerate(hits, start):
+                if len(indices) == 0:
+                    continue
+                sat_pos = satellite_trajectory[i]
+                for j, distance in zip(indices.tolist(), distances.tolist()):
+                    collision_points.append({
+                        'time': sat_pos['time'],
+                        'distance': distance,
+                        'sat_pos': sat_pos,
+                        'debris_pos': debris_positions[j]
+                    })
+            
+            if progress is not None:
+                progress(stop / num_points)
+    
+    collision_count = len(collision_points)
     
     result = {
         'collision': collision_count > 0,
@@ -218,7 +463,35 @@ def check_collision(satellite_trajectory, debris_positions, threshold=COLLISION_
 
 def predict_satellite_collision(tle_line1, tle_line2, debris_file_path, 
                                   num_periods=5, time_step_minutes=1, 
-                                  threshold=COLLISION_THRESHOLD):
+                                  threshold=COLLISION_THRESHOLD,
+                                  mode='snapshot', start_time=None, refine=True,
+                                  sieve=True, debris_snapshot=None, progress=None):
+    """
+    Prediksi collision satelit dengan debris
+    
+    mode:
+        'snapshot'      : posisi debris dibekukan pada start_time (perilaku lama)
+        'time_resolved' : debris dipropagasi pada grid waktu yang sama dengan
+                          satelit (lihat conjunction_screening)
+    refine:
+        Hanya untuk 'time_resolved'; True = setiap kandidat konjungsi diperhalus
+        menjadi TCA sub-detik (time_step_minutes hanya untuk screening kasar)
+    start_time:
+        Awal jendela prediksi (UTC), None = sekarang
+    sieve:
+        Hanya untuk 'time_resolved'; True = debris yang orbitnya tidak mungkin
+        mendekati satelit (apogee/perigee + orbit path, lihat orbit_sieve)
+        dibuang sebelum propagasi. min_distance dihitung dari kandidat yang lolos.
+    debris_snapshot:
+        Hanya untuk 'snapshot'; DebrisSnapshot (lihat debris_snapshot) yang
+        sudah dipropagasi, dipakai sebagai pengganti parse_debris_tle
+    progress:
+        Callable opsional, dipanggil dengan fraksi grid waktu (0-1) yang sudah
+        discreening. Exception dari callback (mis. job dibatalkan) menghentikan prediksi.
+    """
+    if mode not in SCREENING_MODES:
+        raise ValueError(f"mode harus salah satu dari {SCREENING_MODES}")
+    
     print("=" * 70)
     print("SISTEM PREDIKSI COLLISION SATELIT DENGAN DEBRIS")
     print("=" * 70)
@@ -230,23 +503,67 @@ def predict_satellite_collision(tle_line1, tle_line2, debris_file_path,
     print(f"[OK] Durasi prediksi: {num_periods} periode = {period*num_periods:.2f} menit ({period*num_periods/60:.2f} jam)")
     print()
     
-    # 2. Propagasi jalur satelit
-    print("[INFO] Memprediksi jalur satelit...")
-    trajectory = propagate_satellite_trajectory(tle_line1, tle_line2, 
-                                                num_periods, time_step_minutes)
-    print(f"[OK] Total {len(trajectory)} titik posisi diprediksi")
-    print()
-    
-    # 3. Parse posisi debris
-    print("[INFO] Memuat data debris...")
-    debris_positions = parse_debris_tle(debris_file_path)
-    print(f"[OK] Total {len(debris_positions)} debris terdeteksi")
-    print()
+    if start_time is None:
+        start_time = datetime.utcnow()
     
-    # 4. Cek collision
-    print(f"[INFO] Mengecek collision (threshold: {threshold} km)...")
-    result = check_collision(trajectory, debris_positions, threshold)
-    print()
+    if mode == 'time_resolved':
+        from conjunction_screening import time_resolved_collision
+        
+        # 2-4. Propagasi satelit dan seluruh debris pada grid waktu yang sama
+        print("[INFO] Memuat katalog debris...")
+        catalog = load_catalog(debris_file_path)
+        print(f"[OK] Total {len(catalog)} debris dalam katalog")
+        print()
+        
+        candidates = None
+        sieve_stats = None
+        if sieve:
+            from orbit_sieve import sieve_candidates
+            
+            print("[INFO] Menjalankan sieve apogee/perigee + orbit path...")
+            candidates, sieve_stats = sieve_candidates(
+                get_satrec(tle_line1, tle_line2), catalog.satrecs(), start_time,
+                period * num_periods, threshold)
+            print(f"[OK] Apogee/perigee membuang {sieve_stats['apogee_perigee_removed']}, "
+                  f"orbit path membuang {sieve_stats['orbit_path_removed']}, "
+                  f"{sieve_stats['candidates']} kandidat tersisa")
+            print()
+        
+        print(f"[INFO] Screening time-resolved (threshold: {threshold} km)...")
+        debris_array = catalog.satrec_array() if len(catalog) > 0 else None
+        result = time_resolved_collision(tle_line1, tle_line2, catalog.satrecs(),
+                                         num_periods, time_step_minutes, threshold,
+                                         start_time=start_time, refine=refine,
+                                         debris_array=debris_array,
+                                         candidates=candidates, progress=progress)
+        result['sieve'] = sieve_stats
+        print(f"[OK] Total {result['num_steps']} titik waktu diperiksa")
+        print()
+    else:
+        # 2. Propagasi jalur satelit
+        print("[INFO] Memprediksi jalur satelit...")
+        trajectory = propagate_satellite_trajectory(tle_line1, tle_line2, 
+                                                    num_periods, time_step_minutes,
+                                                    start_time=start_time)
+        print(f"[OK] Total {len(trajectory)} titik posisi diprediksi")
+        print()
+        
+        # 3. Parse posisi debris
+        print("[INFO] Memuat data debris...")
+        if debris_snapshot is not None:
+            debris_positions = debris_snapshot.debris()
+            debris_index = debris_snapshot.debris_index()
+        else:
+            debris_positions = parse_debris_tle(debris_file_path, current_time=start_time)
+            debris_index = None
+        print(f"[OK] Total {len(debris_positions)} debris terdeteksi")
+        print()
+        
+        # 4. Cek collision
+        print(f"[INFO] Mengecek collision (threshold: {threshold} km)...")
+        result = check_collision(trajectory, debris_positions, threshold,
+                                 debris_index=debris_index, progress=progress)
+        print()
     
     # 5. Tampilkan hasil
     print("=" * 70)
@@ -300,6 +617,7 @@ def predict_satellite_collision(tle_line1, tle_line2, debris_file_path,
     result['num_periods'] = num_periods
     result['time_step_minutes'] = time_step_minutes
     result['threshold'] = threshold
+    result['mode'] = mode
     
     return result
 
@@ -3,6 +3,7 @@ Configuration file for Flask application
 """
 
 import os
+import tempfile
 
 class Config:
     """Base configuration"""
@@ -19,9 +20,46 @@ class Config:
     # Matplotlib settings
     MATPLOTLIB_BACKEND = 'Agg'  # Non-interactive backend
     
-    # Cache settings (for future use)
-    CACHE_TYPE = 'simple'
-    CACHE_DEFAULT_TIMEOUT = 300
+    # Cache settings (result cache for /api/predict-collision)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'simple')  # 'simple', 'filesystem' or 'null'
+    CACHE_DEFAULT_TIMEOUT = 300  # seconds
+    CACHE_THRESHOLD = 500  # max cached results
+    CACHE_DIR = os.environ.get('CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'leo-planner-cache')
+    CACHE_EPOCH_QUANTUM_SECONDS = 60  # prediction start time is rounded down to this
+    
+    # Asynchronous prediction jobs (/api/predict-collision/jobs): concurrent jobs,
+    # max jobs kept in memory, how long finished results are kept (seconds) and
+    # max unfinished (queued + running) jobs before submit returns 503
+    PREDICTION_JOB_WORKERS = 2
+    PREDICTION_JOB_KEEP = 200
+    PREDICTION_JOB_RESULT_TTL = 3600
+    PREDICTION_JOB_MAX_PENDING = 20
+    
+    # Debris snapshot: the catalog is propagated once per bucket and shared by all debris endpoints
+    # (keep CACHE_EPOCH_QUANTUM_SECONDS a multiple of this so predictions line up with a snapshot)
+    SNAPSHOT_BUCKET_SECONDS = 10
+    
+    # Debris map tiles (/api/debris-tiles): LRU size and zoom levels rendered in the background
+    DEBRIS_TILE_CACHE_SIZE = 2048
+    DEBRIS_TILE_PRECOMPUTE_ZOOM = 2
+    
+    # Satellite position stream (/api/satellite-position/stream): connection lifetime in seconds,
+    # kept short so a long-lived dashboard does not pin a worker thread;
+    # EventSource reconnects automatically afterwards
+    SATELLITE_STREAM_MAX_SECONDS = 120
+    
+    # Satellite catalog used to resolve catalog_ids in /api/satellite-positions
+    SATELLITE_CATALOG_FILE = 'TLE.txt'
+    
+    # Parsed Satrec/EarthSatellite objects kept per worker, keyed by TLE hash
+    ASTRO_SATELLITE_CACHE_SIZE = 256
+    
+    # Network pass prediction (/api/calculate-passes/batch): process pool size (None = all cores)
+    PASS_PREDICTION_WORKERS = int(os.environ['PASS_PREDICTION_WORKERS']) if os.environ.get('PASS_PREDICTION_WORKERS') else None
+    
+    # Regional coverage planner (/api/coverage-plan): shares the pass prediction process pool,
+    # so it uses the same size (a different size would recreate the pool)
+    COVERAGE_PLAN_WORKERS = PASS_PREDICTION_WORKERS
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,448 @@
+"""
+Screening konjungsi time-resolved (satelit dan debris pada grid waktu yang sama)
+================================================================================
+Satelit dan seluruh debris dipropagasi pada array epoch yang sama sebagai
+tensor state NumPy (debris x waktu x 3), diproses per chunk waktu agar memori
+tetap terbatas. Jarak yang dilaporkan adalah miss distance sebenarnya pada
+waktu yang sama, bukan jarak ke posisi debris yang dibekukan di "sekarang".
+
+Grid waktu hanya dipakai sebagai screening kasar: setiap minimum lokal jarak
+yang mungkin masuk threshold di antara dua sampel (berdasarkan kecepatan
+relatif dari sgp4) diperhalus dengan root-finding pada range-rate untuk
+mendapatkan time of closest approach (TCA) dengan presisi sub-detik.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+from scipy.optimize import brentq
+from sgp4.api import SatrecArray, jday
+
+from astro_context import get_satrec
+from collision_prediction import (
+    COLLISION_THRESHOLD,
+    calculate_orbital_period,
+    categorize_altitude,
+    eci_to_latlon_array,
+)
+
+# Batas memori kasar untuk satu chunk tensor posisi + kecepatan debris (byte)
+CHUNK_MEMORY_BYTES = 64 * 1024 * 1024
+
+# Jumlah step waktu maksimum per chunk jika ada callback progress, agar
+# progress dan pembatalan job dicek per blok waktu (bukan sekali per 64 MB)
+PROGRESS_CHUNK_STEPS = 32
+
+# Fraksi progress untuk screening grid saat refine (sisanya untuk refinement kandidat)
+REFINE_PROGRESS_START = 0.9
+
+# Toleransi waktu root-finding TCA (detik)
+TCA_TOLERANCE_SECONDS = 1e-3
+
+# Jumlah sub-interval jendela refine_tca untuk memisahkan akar range-rate
+TCA_SUBDIVISIONS = 8
+
+
+def build_time_grid(start_time, num_steps, time_step_minutes):
+    """
+    Grid waktu seragam mulai dari start_time
+
+    Returns:
+    --------
+    jd, fr : array (T,)
+        Julian date untuk sgp4 (fr boleh > 1, sgp4 menjumlahkan jd + fr)
+    offsets_minutes : array (T,)
+    """
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute, start_time.second)
+
+    offsets_minutes = np.arange(num_steps) * float(time_step_minutes)
+    jd = np.full(num_steps, jd0)
+    fr = fr0 + offsets_minutes / 1440.0
+
+    return jd, fr, offsets_minutes
+
+
+def default_chunk_size(num_debris):
+    """Jumlah step waktu per chunk agar tensor (M, Tc, 3) r+v muat di CHUNK_MEMORY_BYTES"""
+    bytes_per_step = max(num_debris, 1) * 2 * 3 * 8
+    return max(1, CHUNK_MEMORY_BYTES // bytes_per_step)
+
+
+def screen_time_grid(sat_satrec, debris_satrecs, jd, fr, threshold=COLLISION_THRESHOLD,
+                     chunk_size=None, progress=None):
+    """
+    Hitung miss distance time-matched antara satu satelit dan semua debris
+
+    Parameters:
+    -----------
+    sat_satrec : Satrec
+    debris_satrecs : SatrecArray atau list of Satrec
+    jd, fr : array (T,)
+    threshold : float
+        Jarak (km) untuk mencatat titik collision
+    chunk_size : int, optional
+        Jumlah step waktu per chunk (default dari CHUNK_MEMORY_BYTES, maksimal
+        PROGRESS_CHUNK_STEPS jika progress diberikan)
+    progress : callable, optional
+        Dipanggil dengan fraksi grid waktu (0-1) yang sudah discreening sebelum
+        chunk pertama dan setelah setiap chunk; exception dari callback
+        menghentikan screening
+
+    Returns:
+    --------
+    dict berisi:
+        'sat_position', 'sat_velocity' : (T, 3)
+        'sat_valid'      : (T,) bool
+        'min_distance'   : (M,) miss distance minimum per debris (inf jika tidak valid)
+        'min_index'      : (M,) index waktu miss distance minimum (-1 jika tidak valid)
+        'min_position'   : (M, 3) posisi debris saat miss distance minimum
+        'hits'           : (K, 2) pasangan (index waktu, index debris) dengan jarak < threshold,
+                           terurut per waktu lalu per debris
+        'hit_distance'   : (K,)
+        'hit_position'   : (K, 3) posisi debris saat hit
+        'candidates'     : (C, 2) pasangan (index waktu, index debris) minimum lokal
+                           yang bisa < threshold di antara sampel (untuk refine_tca)
+        'candidate_distance' : (C,) jarak sampel kandidat
+    """
+    jd = np.asarray(jd, dtype=float)
+    fr = np.asarray(fr, dtype=float)
+    num_steps = len(jd)
+
+    if not isinstance(debris_satrecs, SatrecArray):
+        debris_satrecs = SatrecArray(list(debris_satrecs)) if len(debris_satrecs) else None
+    num_debris = 0 if debris_satrecs is None else len(debris_satrecs)
+
+    error, sat_position, sat_velocity = sat_satrec.sgp4_array(jd, fr)
+    sat_valid = (error == 0) & np.isfinite(sat_position).all(axis=1)
+
+    min_distance = np.full(num_debris, np.inf)
+    min_index = np.full(num_debris, -1, dtype=int)
+    min_position = np.full((num_debris, 3), np.nan)
+    hits = []
+    hit_distance = []
+    hit_position = []
+    candidates = []
+    candidate_distance = []
+
+    if chunk_size is None:
+        chunk_size = default_chunk_size(num_debris)
+        if progress is not None:
+            chunk_size = min(chunk_size, PROGRESS_CHUNK_STEPS)
+    if progress is not None:
+        progress(0.0)
+
+    step_seconds = ((jd[1] - jd[0]) + (fr[1] - fr[0])) * 86400.0 if num_steps > 1 else 0.0
+
+    for start in range(0, num_steps if num_debris else 0, chunk_size):
+        stop = min(start + chunk_size, num_steps)
+        # Satu sampel tetangga di kiri/kanan untuk deteksi minimum lokal antar chunk
+        lo = max(start - 1, 0)
+        hi = min(stop + 1, num_steps)
+
+        # Tensor state debris (M, Tc, 3) untuk chunk waktu ini
+        d_error, d_position, d_velocity = debris_satrecs.sgp4(jd[lo:hi], fr[lo:hi])
+
+        delta = d_position - sat_position[None, lo:hi, :]
+        padded = np.sqrt(delta[..., 0]**2 + delta[..., 1]**2 + delta[..., 2]**2)
+        invalid = (d_error != 0) | ~sat_valid[None, lo:hi] | ~np.isfinite(padded)
+        padded[invalid] = np.inf
+        if lo == start:
+            padded = np.hstack((np.full((num_debris, 1), np.inf), padded))
+            d_position = np.concatenate((np.full((num_debris, 1, 3), np.nan), d_position), axis=1)
+            d_velocity = np.concatenate((np.full((num_debris, 1, 3), np.nan), d_velocity), axis=1)
+        if hi == stop:
+            padded = np.hstack((padded, np.full((num_debris, 1), np.inf)))
+
+        distance = padded[:, 1:stop - start + 1]
+        d_position = d_position[:, 1:stop - start + 1]
+        d_velocity = d_velocity[:, 1:stop - start + 1]
+
+        # Update minimum per debris
+        chunk_arg = np.argmin(distance, axis=1)
+        chunk_min = distance[np.arange(num_debris), chunk_arg]
+        better = chunk_min < min_distance
+        min_distance[better] = chunk_min[better]
+        min_index[better] = start + chunk_arg[better]
+        min_position[better] = d_position[np.arange(num_debris), chunk_arg][better]
+
+        # Titik collision dalam chunk (urut waktu, lalu debris)
+        debris_idx, time_idx = np.nonzero(distance < threshold)
+        order = np.lexsort((debris_idx, time_idx))
+        debris_idx = debris_idx[order]
+        time_idx = time_idx[order]
+        hits.append(np.column_stack((start + time_idx, debris_idx)))
+        hit_distance.append(distance[debris_idx, time_idx])
+        hit_position.append(d_position[debris_idx, time_idx])
+
+        # Kandidat TCA: minimum lokal yang bisa turun di bawah threshold sebelum
+        # sampel tetangga (batas atas perubahan jarak = kecepatan relatif * step)
+        local_min = ((distance <= padded[:, :-2]) &
+                     (distance < padded[:, 2:]) & np.isfinite(distance))
+        dv = d_velocity - sat_velocity[None, start:stop, :]
+        relative_speed = np.sqrt(dv[..., 0]**2 + dv[..., 1]**2 + dv[..., 2]**2)
+        reachable = distance < threshold + relative_speed * step_seconds
+        debris_idx, time_idx = np.nonzero(local_min & reachable)
+        candidates.append(np.column_stack((start + time_idx, debris_idx)))
+        candidate_distance.append(distance[debris_idx, time_idx])
+
+        if progress is not None:
+            progress(stop / num_steps)
+
+    return {
+        'sat_position': sat_position,
+        'sat_velocity': sat_velocity,
+        'sat_valid': sat_valid,
+        'min_distance': min_distance,
+        'min_index': min_index,
+        'min_position': min_position,
+        'hits': np.concatenate(hits) if hits else np.empty((0, 2), dtype=int),
+        'hit_distance': np.concatenate(hit_distance) if hit_distance else np.empty(0),
+        'hit_position': np.concatenate(hit_position) if hit_position else np.empty((0, 3)),
+        'candidates': np.concatenate(candidates) if candidates else np.empty((0, 2), dtype=int),
+        'candidate_distance': (np.concatenate(candidate_distance) if candidate_distance
+                               else np.empty(0))
+    }
+
+
+def _relative_state(sat_satrec, debris_satrec, jd, fr):
+    """Posisi/kecepatan satelit dan debris pada satu waktu (None jika sgp4 error)"""
+    sat_error, sat_r, sat_v = sat_satrec.sgp4(jd, fr)
+    debris_error, debris_r, debris_v = debris_satrec.sgp4(jd, fr)
+    if sat_error != 0 or debris_error != 0:
+        return None
+    return np.array(sat_r), np.array(sat_v), np.array(debris_r), np.array(debris_v)
+
+
+def refine_tca(sat_satrec, debris_satrec, jd0, fr0, t_lo, t_hi, t_guess=None,
+               tol_seconds=TCA_TOLERANCE_SECONDS, subdivisions=TCA_SUBDIVISIONS):
+    """
+    Time of closest approach di dalam [t_lo, t_hi] (menit sejak jd0 + fr0)
+
+    Range-rate (dr . dv, kecepatan dari sgp4) disampel pada t_lo, t_guess,
+    t_hi dan `subdivisions` sub-interval seragam; setiap pergantian tanda
+    negatif -> positif (minimum lokal jarak) dicari akarnya dengan metode
+    Brent. Dengan step kasar jendela bisa berisi lebih dari satu akar
+    (minimum dan maksimum), jadi jarak di semua akar dan semua titik sampel
+    dibandingkan dan yang terkecil dipakai. Sampel yang gagal dipropagasi
+    (mis. debris decay di dalam jendela) dilewati.
+
+    Returns:
+    --------
+    dict berisi 't' (menit), 'distance', 'relative_speed', 'sat_position',
+    'debris_position', atau None jika propagasi gagal di semua sampel.
+    """
+    def state_at(t):
+        return _relative_state(sat_satrec, debris_satrec, jd0, fr0 + t / 1440.0)
+
+    def range_rate(t):
+        state = state_at(t)
+        if state is None:
+            raise ValueError('sgp4 error')
+        sat_r, sat_v, debris_r, debris_v = state
+        return float(np.dot(debris_r - sat_r, debris_v - sat_v))
+
+    samples = np.linspace(t_lo, t_hi, max(1, int(subdivisions)) + 1)
+    if t_guess is not None and t_lo < t_guess < t_hi:
+        samples = np.union1d(samples, [t_guess])
+
+    times, rates = [], []
+    for t in samples.tolist():
+        try:
+            rates.append(range_rate(t))
+            times.append(t)
+        except ValueError:
+            continue
+
+    # Akar hanya dicari di antara sampel valid yang berurutan
+    for k in range(len(times) - 1):
+        if rates[k] < 0.0 < rates[k + 1]:
+            try:
+                times.append(brentq(range_rate, times[k], times[k + 1], xtol=tol_seconds / 60.0))
+            except ValueError:
+                # sgp4 error di antara dua sampel valid
+                continue
+
+    best = None
+    for t in times:
+        state = state_at(t)
+        if state is None:
+            continue
+        sat_r, sat_v, debris_r, debris_v = state
+        distance = float(np.sqrt(np.sum((debris_r - sat_r)**2)))
+        if best is None or distance < best['distance']:
+            best = {
+                't': float(t),
+                'distance': distance,
+                'relative_speed': float(np.sqrt(np.sum((debris_v - sat_v)**2))),
+                'sat_position': sat_r,
+                'debris_position': debris_r
+            }
+
+    return best
+
+
+def _grid_tca(sat_satrec, debris_satrec, jd, fr, t):
+    """State pada satu sampel grid dengan format hasil refine_tca (None jika sgp4 error)"""
+    state = _relative_state(sat_satrec, debris_satrec, jd, fr)
+    if state is None:
+        return None
+    sat_r, sat_v, debris_r, debris_v = state
+    return {
+        't': float(t),
+        'distance': float(np.sqrt(np.sum((debris_r - sat_r)**2))),
+        'relative_speed': float(np.sqrt(np.sum((debris_v - sat_v)**2))),
+        'sat_position': sat_r,
+        'debris_position': debris_r
+    }
+
+
+def _state_point(time, position):
+    """Dict posisi dengan format yang sama seperti titik lintasan / debris lama"""
+    x, y, z = (float(v) for v in position)
+    lat, lon, alt = (float(v) for v in eci_to_latlon_array(x, y, z))
+    return {'time': time, 'x': x, 'y': y, 'z': z, 'lat': lat, 'lon': lon, 'alt': alt}
+
+
+def _debris_point(position):
+    point = _state_point(None, position)
+    del point['time']
+    point['category'], point['cat_idx'] = categorize_altitude(point['alt'])
+    return point
+
+
+def time_resolved_collision(tle_line1, tle_line2, debris_satrecs, num_periods=5,
+                            time_step_minutes=1, threshold=COLLISION_THRESHOLD,
+                            start_time=None, chunk_size=None, refine=True,
+                            debris_array=None, candidates=None, progress=None):
+    """
+    Prediksi collision dengan debris dipropagasi pada grid waktu yang sama
+
+    Parameters:
+    -----------
+    debris_satrecs : list of Satrec
+        Katalog debris (dipakai per objek saat refine TCA)
+    refine : bool
+        True  : grid waktu hanya screening kasar, setiap kandidat diperhalus
+                dengan refine_tca (satu collision point per konjungsi, TCA sub-detik)
+        False : laporkan setiap sampel grid dengan jarak < threshold
+    debris_array : SatrecArray, optional
+        SatrecArray untuk debris_satrecs jika sudah dibuat (mis. dari katalog)
+    candidates : array int, optional
+        Hanya screening debris dengan index ini (mis. hasil orbit_sieve);
+        'debris_index' di hasil tetap mengacu ke index di debris_satrecs
+    progress : callable, optional
+        Lihat screen_time_grid. Dengan refine, screening dilaporkan sebagai
+        0-REFINE_PROGRESS_START dan refinement kandidat sebagai sisanya
+
+    Returns dict dengan key yang sama seperti check_collision, ditambah
+    'debris_index' (index katalog debris terdekat) dan 'num_steps'.
+    """
+    satellite = get_satrec(tle_line1, tle_line2)
+    period_minutes = calculate_orbital_period(tle_line1, tle_line2)
+    num_steps = int(period_minutes * num_periods / time_step_minutes)
+
+    if start_time is None:
+        start_time = datetime.utcnow()
+    # jday hanya memakai detik bulat; samakan label waktu dengan grid
+    start_time = start_time.replace(microsecond=0)
+
+    catalog_index = np.arange(len(debris_satrecs))
+    if candidates is not None:
+        catalog_index = np.asarray(candidates, dtype=int)
+        debris_satrecs = [debris_satrecs[k] for k in catalog_index]
+        debris_array = None
+
+    screening_progress = progress
+    if progress is not None and refine:
+        def screening_progress(fraction):
+            progress(REFINE_PROGRESS_START * fraction)
+
+    jd, fr, offsets = build_time_grid(start_time, num_steps, time_step_minutes)
+    screening = screen_time_grid(satellite,
+                                 debris_array if debris_array is not None else debris_satrecs,
+                                 jd, fr, threshold, chunk_size=chunk_size,
+                                 progress=screening_progress)
+
+    def time_at(minutes):
+        return start_time + timedelta(minutes=float(minutes))
+
+    result = {
+        'collision': False,
+        'collision_count': 0,
+        'min_distance': float('inf'),
+        'closest_sat_point': None,
+        'closest_debris': None,
+        'collision_points': [],
+        'debris_index': None,
+        'num_steps': num_steps
+    }
+
+    min_distance = screening['min_distance']
+    if len(min_distance) and np.isfinite(min_distance).any():
+        j = int(np.argmin(min_distance))
+        i = int(screening['min_index'][j])
+        result['min_distance'] = float(min_distance[j])
+        result['closest_sat_point'] = _state_point(time_at(offsets[i]),
+                                                   screening['sat_position'][i])
+        result['closest_debris'] = _debris_point(screening['min_position'][j])
+        result['debris_index'] = int(catalog_index[j])
+
+    if not refine:
+        sat_points = {}
+        for (i, j), distance, position in zip(screening['hits'].tolist(),
+                                              screening['hit_distance'].tolist(),
+                                              screening['hit_position']):
+            if i not in sat_points:
+                sat_points[i] = _state_point(time_at(offsets[i]), screening['sat_position'][i])
+            result['collision_points'].append({
+                'time': sat_points[i]['time'],
+                'distance': distance,
+                'sat_pos': sat_points[i],
+                'debris_pos': _debris_point(position)
+            })
+    else:
+        # Kandidat minimum lokal + minimum global (agar min_distance juga presisi)
+        candidates = screening['candidates'].tolist()
+        if result['debris_index'] is not None:
+            j = int(np.argmin(min_distance))
+            candidates.append([int(screening['min_index'][j]), j])
+
+        events = {}
+        for k, (i, j) in enumerate(candidates):
+            if (i, j) in events:
+                continue
+            if progress is not None:
+                progress(REFINE_PROGRESS_START + (1.0 - REFINE_PROGRESS_START) * k / len(candidates))
+            tca = refine_tca(satellite, debris_satrecs[j], jd[0], fr[0],
+                             offsets[max(i - 1, 0)], offsets[min(i + 1, num_steps - 1)],
+                             t_guess=offsets[i])
+            if tca is None:
+                # Refine gagal: pakai sampel grid agar hit tidak hilang
+                tca = _grid_tca(satellite, debris_satrecs[j], jd[i], fr[i], offsets[i])
+            if tca is not None:
+                events[(i, j)] = tca
+
+        for (i, j), tca in sorted(events.items(), key=lambda item: (item[1]['t'], item[0][1])):
+            if tca['distance'] < result['min_distance']:
+                result['min_distance'] = tca['distance']
+                result['closest_sat_point'] = _state_point(time_at(tca['t']), tca['sat_position'])
+                result['closest_debris'] = _debris_point(tca['debris_position'])
+                result['debris_index'] = int(catalog_index[j])
+
+            if tca['distance'] < threshold:
+                sat_point = _state_point(time_at(tca['t']), tca['sat_position'])
+                result['collision_points'].append({
+                    'time': sat_point['time'],
+                    'tca_offset_seconds': tca['t'] * 60.0,
+                    'distance': tca['distance'],
+                    'relative_speed': tca['relative_speed'],
+                    'sat_pos': sat_point,
+                    'debris_pos': _debris_point(tca['debris_position']),
+                    'debris_index': int(catalog_index[j])
+                })
+
+    result['collision_count'] = len(result['collision_points'])
+    result['collision'] = result['collision_count'] > 0
+
+    return result
@@ -0,0 +1,297 @@
+"""
+Akumulasi cakupan spotbeam pada grid equal-area
+===============================================
+Union polygon shapely + luas geodesik lambat untuk simulasi panjang dan
+tidak stabil di antimeridian/kutub. Di sini permukaan bumi (bola, radius
+EARTH_RADIUS) dibagi menjadi sel pada ring lintang (iso-latitude, mirip
+HEALPix): tinggi ring tetap cell_km, jumlah sel per ring sebanding cos(lat)
+sehingga sel hampir persegi, dan luas setiap sel dihitung eksak.
+
+Sampel ground track (boleh dari banyak satelit) ditambahkan per jendela
+waktu. Setiap sampel menandai sel yang pusatnya berada dalam radius swath
+(jarak great-circle) - dirasterisasi sekaligus sebagai interval sel per ring
+yang digabung (sort + running max), tanpa loop per sampel dan tanpa operasi
+sepanjang seluruh grid. Luas = jumlah bobot sel yang pernah tercakup;
+statistik per sel (jumlah kunjungan, waktu akses, gap revisit maksimum) ikut
+diperbarui. Memori hanya bergantung pada jumlah sel, bukan panjang simulasi.
+
+Satu kunjungan = rangkaian jendela berurutan yang mencakup sel, jadi
+panjang jendela adalah resolusi waktu statistik revisit.
+
+EqualAreaGrid hanya menyimpan geometri per ring (rasterisasi, pusat dan
+luas sel); CoverageStats menyimpan statistik untuk sekumpulan sel, sehingga
+statistik wilayah kecil tidak perlu array seukuran seluruh bumi.
+CoverageGrid = keduanya untuk seluruh bumi.
+"""
+
+import numpy as np
+
+from collision_prediction import EARTH_RADIUS
+
+DEFAULT_CELL_KM = 25.0
+
+
+def _merge_intervals(starts, ends):
+    """Index unik terurut dari gabungan interval [start, end)"""
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    new_group = np.empty(len(starts), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > reach[:-1]
+    group_start = starts[new_group]
+    group_end = reach[np.append(np.flatnonzero(new_group)[1:] - 1, len(starts) - 1)]
+
+    lengths = group_end - group_start
+    total = int(lengths.sum())
+    shift = np.repeat(group_start - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(total, dtype=np.int64) + shift
+
+
+class EqualAreaGrid:
+    """
+    Geometri grid equal-area (hanya array per ring, tanpa array per sel)
+
+    Parameters:
+    -----------
+    cell_km : float
+        Ukuran sel (km) arah lintang; arah bujur mendekati nilai yang sama
+    """
+
+    def __init__(self, cell_km=DEFAULT_CELL_KM):
+        self.cell_km = float(cell_km)
+        n_rings = max(2, int(round(np.pi * EARTH_RADIUS / self.cell_km)))
+        self.ring_height = np.pi / n_rings
+        edges = np.linspace(-np.pi / 2, np.pi / 2, n_rings + 1)
+        self.ring_lat = 0.5 * (edges[:-1] + edges[1:])
+        self.ring_cells = np.maximum(
+            1, np.round(2 * np.pi * np.cos(self.ring_lat) / self.ring_height)).astype(np.int64)
+        self.ring_offset = np.concatenate([[0], np.cumsum(self.ring_cells)])
+        self.size = int(self.ring_offset[-1])
+
+        # Luas eksak sel pada ring k: R^2 * dlon * (sin lat1 - sin lat0)
+        self.ring_area = (EARTH_RADIUS**2 * (2 * np.pi / self.ring_cells) *
+                          (np.sin(edges[1:]) - np.sin(edges[:-1])))
+
+    @property
+    def total_area_km2(self):
+        return float(np.sum(self.ring_area * self.ring_cells))
+
+    def cell_ring(self, index):
+        """Index ring untuk index sel"""
+        return np.searchsorted(self.ring_offset, np.asarray(index, dtype=np.int64), side='right') - 1
+
+    def cell_area(self, index):
+        """Luas (km²) sel-sel dengan index ini"""
+        return self.ring_area[self.cell_ring(index)]
+
+    def cell_centers(self, index=None):
+        """Lintang dan bujur pusat sel (derajat); semua sel jika index None"""
+        if index is None:
+            ring = np.repeat(np.arange(len(self.ring_cells)), self.ring_cells)
+            index = np.arange(self.size)
+        else:
+            index = np.asarray(index, dtype=np.int64)
+            ring = self.cell_ring(index)
+        j = index - self.ring_offset[ring]
+        lat = np.degrees(self.ring_lat[ring])
+        lon = -180.0 + (j + 0.5) * 360.0 / self.ring_cells[ring]
+        return lat, lon
+
+    def cells_in_box(self, min_lat, max_lat, min_lon, max_lon):
+        """Index sel (terurut) yang pusatnya di dalam kotak lintang/bujur (derajat)"""
+        ring_lat = np.degrees(self.ring_lat)
+        rings = np.flatnonzero((ring_lat >= min_lat) & (ring_lat <= max_lat))
+        n = self.ring_cells[rings]
+        # Rentang j kandidat (+/- 1 sel); pusat dicek ulang dengan rumus cell_centers
+        j_lo = np.clip(np.floor((min_lon + 180.0) / 360.0 * n - 0.5).astype(np.int64) - 1, 0, n)
+        j_hi = np.clip(np.ceil((max_lon + 180.0) / 360.0 * n - 0.5).astype(np.int64) + 2, 0, n)
+        counts = np.maximum(j_hi - j_lo, 0)
+        first = np.repeat(self.ring_offset[rings] + j_lo, counts)
+        index = first + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        _, lon = self.cell_centers(index)
+        return index[(lon >= min_lon) & (lon <= max_lon)]
+
+    def cell_index(self, lat, lon):
+        """Index sel untuk titik-titik (derajat)"""
+        lat = np.radians(np.asarray(lat, dtype=float))
+        lon = np.asarray(lon, dtype=float)
+        ring = np.clip(((lat + np.pi / 2) / self.ring_height).astype(np.int64),
+                       0, len(self.ring_cells) - 1)
+        n = self.ring_cells[ring]
+        j = np.floor(((lon + 180.0) % 360.0) / 360.0 * n).astype(np.int64) % n
+        return self.ring_offset[ring] + j
+
+    def rasterize(self, lat, lon, radius_km):
+        """
+        Index sel yang pusatnya berada dalam radius_km dari salah satu titik
+
+        Parameters:
+        -----------
+        lat, lon : array (derajat); titik NaN diabaikan
+        radius_km : float
+
+        Returns:
+        --------
+        array int64 index sel (terurut, unik)
+        """
+        lat = np.radians(np.asarray(lat, dtype=float).ravel())
+        lon = np.radians(np.asarray(lon, dtype=float).ravel())
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        lat, lon = lat[valid], lon[valid]
+        if not len(lat):
+            return np.zeros(0, dtype=np.int64)
+        rho = radius_km / EARTH_RADIUS
+
+        # Pasangan (titik, ring) untuk ring yang bisa tersentuh lingkaran
+        n_rings = len(self.ring_cells)
+        k_lo = np.clip(np.floor((lat - rho + np.pi / 2) / self.ring_height), 0, n_rings - 1).astype(np.int64)
+        k_hi = np.clip(np.floor((lat + rho + np.pi / 2) / self.ring_height), 0, n_rings - 1).astype(np.int64)
+        counts = k_hi - k_lo + 1
+        point = np.repeat(np.arange(len(lat)), counts)
+        ring = k_lo[point] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        # Setengah lebar bujur lingkaran pada lintang pusat ring
+        ring_lat = self.ring_lat[ring]
+        p_lat = lat[point]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos_dlon = ((np.cos(rho) - np.sin(ring_lat) * np.sin(p_lat)) /
+                        (np.cos(ring_lat) * np.cos(p_lat)))
+        hit = ~(cos_dlon > 1.0)
+        full = hit & ~(cos_dlon > -1.0)
+        half = np.arccos(np.clip(cos_dlon, -1.0, 1.0))
+
+        n = self.ring_cells[ring]
+        width = 2 * np.pi / n
+        start = np.ceil((lon[point] - half + np.pi) / width - 0.5).astype(np.int64)
+        stop = np.floor((lon[point] + half + np.pi) / width - 0.5).astype(np.int64) + 1
+        count = np.minimum(stop - start, n)
+        start = np.where(full, 0, start % n)
+        count = np.where(full, n, count)
+        hit &= count > 0
+
+        # Interval per ring (dipecah dua jika melewati antimeridian) dalam index global
+        start, count, n, offset = start[hit], count[hit], n[hit], self.ring_offset[ring[hit]]
+        first_end = np.minimum(start + count, n)
+        wrapped = start + count > n
+        starts = np.concatenate([offset + start, offset[wrapped]])
+        ends = np.concatenate([offset + first_end, offset[wrapped] + (start + count - n)[wrapped]])
+        return _merge_intervals(starts, ends)
+
+
+class CoverageStats:
+    """
+    Statistik cakupan per sel (cakupan, kunjungan, waktu akses, gap revisit)
+    untuk sekumpulan sel dengan luas cell_area_km2 - seluruh grid
+    (CoverageGrid) atau hanya sel wilayah (index lokal 0..len-1)
+    """
+
+    def __init__(self, cell_area_km2):
+        self.cell_area_km2 = np.asarray(cell_area_km2, dtype=float)
+        self.size = len(self.cell_area_km2)
+        self.covered = np.zeros(self.size, dtype=bool)
+        self.visits = np.zeros(self.size, dtype=np.uint32)
+        self.access_seconds = np.zeros(self.size)
+        self.first_seen = np.full(self.size, np.nan)
+        self.last_seen = np.full(self.size, np.nan)
+        self.max_gap_seconds = np.zeros(self.size)
+        self._last_window = np.full(self.size, -2, dtype=np.int64)
+
+        self.covered_area_km2 = 0.0
+        self.windows = 0
+        self.start_time = None
+        self.end_time = None
+
+    def add_cells(self, t_start, t_end, index):
+        """Tambahkan jendela [t_start, t_end) dengan index sel (unik) yang tercakup"""
+        index = np.asarray(index, dtype=np.int64)
+        duration = t_end - t_start
+        if self.start_time is None:
+            self.start_time = t_start
+        self.end_time = t_end
+
+        new_cells = index[~self.covered[index]]
+        added = float(self.cell_area_km2[new_cells].sum())
+        self.covered_area_km2 += added
+        self.covered[new_cells] = True
+        self.first_seen[new_cells] = t_start
+
+        # Kunjungan baru jika sel tidak tercakup pada jendela sebelumnya
+        new_visit = index[self._last_window[index] != self.windows - 1]
+        revisit = new_visit[np.isfinite(self.last_seen[new_visit])]
+        self.max_gap_seconds[revisit] = np.maximum(self.max_gap_seconds[revisit],
+                                                   t_start - self.last_seen[revisit])
+        self.visits[new_visit] += 1
+        self.access_seconds[index] += duration
+        self.last_seen[index] = t_end
+        self._last_window[index] = self.windows
+
+        self.windows += 1
+        return added
+
+    def coverage_fraction(self, mask=None):
+        """Fraksi luas (0-1) yang pernah tercakup, opsional di dalam mask sel"""
+        weights = self.cell_area_km2 if mask is None else self.cell_area_km2[mask]
+        covered = self.covered if mask is None else self.covered[mask]
+        total = weights.sum()
+        return float(weights[covered].sum() / total) if total > 0 else 0.0
+
+    def summary(self, mask=None):
+        """
+        Ringkasan statistik cakupan (seluruh bumi atau sel di dalam mask)
+
+        Gap revisit maksimum ikut memperhitungkan waktu dari awal simulasi
+        sampai kunjungan pertama dan dari kunjungan terakhir sampai akhir.
+        """
+        index = np.arange(self.size) if mask is None else np.flatnonzero(mask)
+        weights = self.cell_area_km2[index]
+        covered = self.covered[index]
+        visits = self.visits[index]
+
+        max_gap = None
+        if self.start_time is not None and len(index):
+            first = np.where(covered, self.first_seen[index], self.end_time) - self.start_time
+            last = self.end_time - np.where(covered, self.last_seen[index], self.start_time)
+            max_gap = float(np.max(np.maximum(self.max_gap_seconds[index], np.maximum(first, last))))
+
+        visited = visits > 0
+        return {
+            'cells': int(len(index)),
+            'area_km2': float(weights.sum()),
+            'covered_area_km2': float(weights[covered].sum()),
+            'coverage_percent': float(100.0 * weights[covered].sum() / weights.sum()) if len(index) else 0.0,
+            'mean_visits': float(np.average(visits, weights=weights)) if len(index) else 0.0,
+            'max_visits': int(visits.max()) if len(index) else 0,
+            'mean_access_seconds': (float(np.average(self.access_seconds[index][visited] / visits[visited],
+                                                     weights=weights[visited]))
+                                    if visited.any() else None),
+            'max_revisit_gap_seconds': max_gap
+        }
+
+
+class CoverageGrid(EqualAreaGrid, CoverageStats):
+    """
+    Grid equal-area + statistik cakupan per sel (seluruh bumi)
+
+    Parameters:
+    -----------
+    cell_km : float
+        Ukuran sel (km) arah lintang; arah bujur mendekati nilai yang sama
+    """
+
+    def __init__(self, cell_km=DEFAULT_CELL_KM):
+        EqualAreaGrid.__init__(self, cell_km)
+        CoverageStats.__init__(self, np.repeat(self.ring_area, self.ring_cells))
+
+    def add_window(self, t_start, t_end, lat, lon, radius_km):
+        """
+        Tambahkan sampel ground track untuk jendela waktu [t_start, t_end)
+        (detik sejak awal simulasi). Jendela harus berurutan dan tidak tumpang tindih.
+
+        Returns:
+        --------
+        float : luas (km²) yang baru tercakup pada jendela ini
+        """
+        return self.add_cells(t_start, t_end, self.rasterize(lat, lon, radius_km))
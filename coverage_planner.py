@@ -0,0 +1,407 @@
+"""
+Perencana cakupan regional untuk konstelasi satelit
+===================================================
+Pertanyaan utama perencanaan komersialisasi: seberapa baik sekumpulan
+satelit (dipilih dari TLE.txt berdasarkan nama / nomor NORAD, atau TLE yang
+diberikan) mencakup suatu wilayah, mis. Indonesia.
+
+1. Satelit dibagi ke process pool (pool bersama pass_prediction). Worker
+   mempropagasi ground track per chunk, membuang sampel yang jauh dari
+   wilayah, lalu merasterisasi swath per jendela waktu pada grid equal-area
+   dan hanya mengembalikan sel di dalam wilayah (pasangan jendela, sel).
+2. Proses utama menggabungkan sel semua satelit per jendela dan mengisi
+   satu CoverageStats seukuran sel wilayah, sehingga statistik
+   mencerminkan konstelasi (dua satelit yang mencakup sel pada jendela
+   yang sama = satu akses). Memori tidak bergantung pada luas bumi.
+
+Hasil: persentase cakupan per jendela (sesaat dan kumulatif), gap revisit
+maksimum dan rata-rata waktu akses per kunjungan di dalam wilayah.
+
+Contoh:
+    python coverage_planner.py --names "ISS (ZARYA)" --norad 25544 --hours 24
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from sgp4.api import jday
+
+from astro_context import get_satrec
+from collision_prediction import EARTH_RADIUS
+from coverage_grid import DEFAULT_CELL_KM, CoverageStats, EqualAreaGrid
+from pass_prediction import get_pool
+from spotbeam_revisit import (CHUNK_SAMPLES, DEFAULT_SPOTBEAM_WIDTH_KM, RASTER_STEP_SECONDS,
+                              central_angle, ground_track, ground_track_rate)
+from tle_catalog import load_catalog, satrec_from_record
+
+MAX_PLAN_SATELLITES = 200
+MAX_PLAN_HOURS = 24 * 14
+MAX_PLAN_WINDOWS = 20160
+MIN_PLAN_CELL_KM = 10.0
+DEFAULT_PLAN_HOURS = 24.0
+
+# Jendela waktu statistik (resolusi gap revisit / waktu akses), detik
+DEFAULT_PLAN_WINDOW_SECONDS = 60.0
+
+# Jumlah satelit per task worker
+SATELLITES_PER_TASK = 2
+
+# Perkiraan kasar wilayah Indonesia (darat + perairan), (lon, lat)
+INDONESIA_REGION = [
+    (95.0, 5.9), (97.6, 5.3), (100.4, 2.4), (103.5, 1.3), (105.8, 2.6), (108.0, 4.8),
+    (109.6, 1.9), (112.0, 1.5), (114.5, 1.5), (115.6, 4.0), (117.6, 4.3), (119.0, 3.0),
+    (125.5, 4.8), (127.2, 4.6), (129.5, 2.8), (132.5, -0.3), (135.0, -0.6), (141.0, -2.6),
+    (141.0, -9.1), (138.0, -8.4), (134.5, -7.0), (131.0, -8.5), (125.0, -10.2),
+    (123.0, -10.9), (120.0, -10.5), (117.0, -9.2), (110.0, -8.5), (105.0, -7.0),
+    (104.5, -5.9), (101.0, -3.5), (98.5, -0.5), (96.0, 2.5)
+]
+
+REGIONS = {
+    'indonesia': INDONESIA_REGION
+}
+
+
+class CoveragePlanError(ValueError):
+    """Input perencana cakupan tidak valid (dikembalikan sebagai HTTP 400)"""
+
+
+def resolve_region(region):
+    """
+    Koordinat polygon wilayah dari nama di REGIONS atau list [lon, lat]
+
+    Returns:
+    --------
+    tuple (lon, lat) titik-titik polygon
+    """
+    if region is None:
+        region = 'indonesia'
+    if isinstance(region, str):
+        coords = REGIONS.get(region.lower())
+        if coords is None:
+            raise CoveragePlanError(f"Unknown region '{region}' (known: {', '.join(REGIONS)})")
+    else:
+        coords = region
+    try:
+        coords = tuple((float(lon), float(lat)) for lon, lat in coords)
+    except (TypeError, ValueError):
+        raise CoveragePlanError('region must be a name or a list of [lon, lat] points')
+    if len(coords) < 3 or not Polygon(coords).is_valid:
+        raise CoveragePlanError('region polygon must have at least 3 points and not self-intersect')
+    return coords
+
+
+def _catalog_name(name):
+    # Nama di TLE.txt memakai awalan baris "0 "
+    name = name.strip()
+    return name[2:] if name.startswith('0 ') else name
+
+
+def select_satellites(tle_file, names=None, norad_ids=None):
+    """
+    Pilih satelit dari katalog TLE berdasarkan nama (tidak case-sensitive)
+    dan/atau nomor NORAD
+
+    Returns:
+    --------
+    list dict ('name', 'satnum', 'catalog_index')
+    """
+    catalog = load_catalog(tle_file)
+    selected = []
+    seen = set()
+
+    if norad_ids:
+        try:
+            index = catalog.indices_for_satnums(norad_ids)
+        except (TypeError, ValueError):
+            raise CoveragePlanError('norad_ids must be integers')
+        missing = [int(n) for n, k in zip(norad_ids, index) if k < 0]
+        if missing:
+            raise CoveragePlanError(f'Unknown NORAD ids: {missing[:20]}')
+        for k in index.tolist():
+            if k not in seen:
+                seen.add(k)
+                selected.append(k)
+
+    if names:
+        lookup = {}
+        for k, name in enumerate(catalog.names):
+            lookup.setdefault(_catalog_name(name).upper(), k)
+        missing = [name for name in names if _catalog_name(name).upper() not in lookup]
+        if missing:
+            raise CoveragePlanError(f'Unknown satellite names: {missing[:20]}')
+        for name in names:
+            k = lookup[_catalog_name(name).upper()]
+            if k not in seen:
+                seen.add(k)
+                selected.append(k)
+
+    names_all = catalog.names
+    return [{'name': _catalog_name(names_all[k]),
+             'satnum': int(catalog.elements['satnum'][k]),
+             'catalog_index': k} for k in selected]
+
+
+def _satrec_for(sat, tle_file):
+    if 'catalog_index' in sat:
+        return satrec_from_record(load_catalog(tle_file).elements[sat['catalog_index']])
+    return get_satrec(sat['tle_line1'], sat['tle_line2'])
+
+
+# Grid wilayah per proses, di-key (cell_km, region); cache dibatasi jumlah
+# entri dan total sel wilayah
+MAX_REGION_GRIDS = 8
+MAX_REGION_GRID_CELLS = 4_000_000
+_region_grids = {}
+
+
+class RegionGrid:
+    """Geometri grid (EqualAreaGrid, tanpa array per sel) + sel di dalam polygon wilayah"""
+
+    def __init__(self, cell_km, region):
+        self.grid = EqualAreaGrid(cell_km)
+        self.region = region
+        polygon = Polygon(region)
+        min_lon, min_lat, max_lon, max_lat = polygon.bounds
+        near = self.grid.cells_in_box(min_lat, max_lat, min_lon, max_lon)
+        lat, lon = self.grid.cell_centers(near)
+        # Index global terurut (untuk pemetaan global -> lokal dengan searchsorted)
+        self.cells = near[shapely.contains_xy(polygon, lon, lat)]
+        self.area_km2 = self.grid.cell_area(self.cells)
+
+        # Lingkaran pembatas wilayah untuk membuang sampel yang jauh
+        self.center_lon, self.center_lat = polygon.centroid.x, polygon.centroid.y
+        coords = np.asarray(region)
+        self.radius = float(central_angle(self.center_lat, self.center_lon,
+                                          coords[:, 1], coords[:, 0]).max())
+
+    def local_index(self, index):
+        """Index lokal wilayah untuk index sel global; sel di luar wilayah dibuang"""
+        local = np.searchsorted(self.cells, index)
+        inside = local < len(self.cells)
+        inside[inside] = self.cells[local[inside]] == index[inside]
+        return local[inside]
+
+    @classmethod
+    def get(cls, cell_km, region):
+        key = (float(cell_km), region)
+        region_grid = _region_grids.get(key)
+        if region_grid is None:
+            region_grid = cls(cell_km, region)
+            cached = sum(len(g.cells) for g in _region_grids.values())
+            if (len(_region_grids) >= MAX_REGION_GRIDS or
+                    cached + len(region_grid.cells) > MAX_REGION_GRID_CELLS):
+                _region_grids.clear()
+            _region_grids[key] = region_grid
+        return region_grid
+
+
+def region_access(satrec, region_grid, jd0, fr0, duration_seconds, window_seconds,
+                  spotbeam_width_km, step_seconds=RASTER_STEP_SECONDS):
+    """
+    Sel wilayah yang dicakup satu satelit per jendela
+
+    Returns:
+    --------
+    windows, cells : array int64 (index jendela, index sel lokal wilayah)
+    """
+    grid = region_grid.grid
+    radius_km = spotbeam_width_km / 2.0
+    reach = region_grid.radius + radius_km / EARTH_RADIUS
+    step_seconds = min(step_seconds, window_seconds,
+                       radius_km / EARTH_RADIUS / 4.0 / ground_track_rate(satrec))
+
+    windows, cells = [], []
+    chunk_start = 0.0
+    while chunk_start < duration_seconds:
+        chunk_end = min(duration_seconds, chunk_start + CHUNK_SAMPLES * step_seconds)
+        offsets = np.append(np.arange(chunk_start, chunk_end, step_seconds), chunk_end)
+        lat, lon, _ = ground_track(satrec, jd0, fr0, offsets)
+        near = np.flatnonzero(central_angle(region_grid.center_lat, region_grid.center_lon,
+                                            lat, lon) <= reach)
+        if near.size:
+            # Sampel di batas jendela ikut kedua jendela (sama seperti accumulate_coverage_grid)
+            window_of = np.floor(offsets[near] / window_seconds).astype(np.int64)
+            on_edge = (offsets[near] % window_seconds == 0) & (window_of > 0)
+            sample = np.concatenate([near, near[on_edge]])
+            window_of = np.concatenate([window_of, window_of[on_edge] - 1])
+            last_window = int(np.ceil(duration_seconds / window_seconds)) - 1
+            keep = window_of <= last_window
+            sample, window_of = sample[keep], window_of[keep]
+
+            order = np.argsort(window_of, kind='stable')
+            sample, window_of = sample[order], window_of[order]
+            groups = np.flatnonzero(np.diff(window_of)) + 1
+            for rows, w in zip(np.split(sample, groups), window_of[np.append(0, groups)]):
+                local = region_grid.local_index(grid.rasterize(lat[rows], lon[rows], radius_km))
+                if local.size:
+                    windows.append(np.full(local.size, w, dtype=np.int64))
+                    cells.append(local)
+        chunk_start = chunk_end
+
+    if not windows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(windows), np.concatenate(cells)
+
+
+def _coverage_task(task):
+    """Akses wilayah untuk satu blok satelit (dijalankan di worker)"""
+    sats, tle_file, jd0, fr0, duration, window, width, cell_km, region = task
+    region_grid = RegionGrid.get(cell_km, region)
+    results = []
+    for sat in sats:
+        windows, cells = region_access(_satrec_for(sat, tle_file), region_grid, jd0, fr0,
+                                       duration, window, width)
+        results.append((windows, cells))
+    return results
+
+
+def plan_coverage(satellites, start_time, duration_hours=DEFAULT_PLAN_HOURS, region=None,
+                  spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM, cell_km=DEFAULT_CELL_KM,
+                  window_seconds=DEFAULT_PLAN_WINDOW_SECONDS, tle_file='TLE.txt', workers=None):
+    """
+    Statistik cakupan wilayah untuk sekumpulan satelit
+
+    Parameters:
+    -----------
+    satellites : list dict
+        {'name', 'tle_line1', 'tle_line2'} atau hasil select_satellites
+        ({'name', 'catalog_index'} dari tle_file)
+    start_time : datetime (UTC)
+    region : str atau list [lon, lat] (default 'indonesia')
+    workers : int, optional
+        Jumlah proses (default: semua core); 1 = dijalankan di proses ini
+
+    Returns:
+    --------
+    dict ringkasan + time series per jendela
+    """
+    started = time.perf_counter()
+    if not satellites:
+        raise CoveragePlanError('At least one satellite required')
+    if len(satellites) > MAX_PLAN_SATELLITES:
+        raise CoveragePlanError(f'At most {MAX_PLAN_SATELLITES} satellites per plan')
+    if not 0 < duration_hours <= MAX_PLAN_HOURS:
+        raise CoveragePlanError(f'duration_hours must be in (0, {MAX_PLAN_HOURS}]')
+    if spotbeam_width_km <= 0 or window_seconds <= 0:
+        raise CoveragePlanError('spotbeam_width_km and window_seconds must be positive')
+    if cell_km < MIN_PLAN_CELL_KM:
+        raise CoveragePlanError(f'cell_km must be at least {MIN_PLAN_CELL_KM}')
+    if duration_hours * 3600.0 / window_seconds > MAX_PLAN_WINDOWS:
+        raise CoveragePlanError(f'At most {MAX_PLAN_WINDOWS} windows (duration_hours / window_seconds)')
+
+    region = resolve_region(region)
+    region_grid = RegionGrid.get(cell_km, region)
+    if not len(region_grid.cells):
+        raise CoveragePlanError('Region is smaller than one grid cell')
+
+    workers = workers or os.cpu_count() or 1
+    duration = duration_hours * 3600.0
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute,
+                    start_time.second + start_time.microsecond / 1e6)
+
+    tasks = [(satellites[k:k + SATELLITES_PER_TASK], tle_file, jd0, fr0, duration,
+              window_seconds, spotbeam_width_km, cell_km, region)
+             for k in range(0, len(satellites), SATELLITES_PER_TASK)]
+    if workers > 1 and len(tasks) > 1:
+        blocks = get_pool(workers).map(_coverage_task, tasks)
+    else:
+        blocks = [_coverage_task(task) for task in tasks]
+    accesses = [access for block in blocks for access in block]
+
+    # Gabungkan semua satelit: sel unik per jendela
+    n_windows = int(np.ceil(duration / window_seconds))
+    n_cells = len(region_grid.cells)
+    keys = np.unique(np.concatenate([w * n_cells + c for w, c in accesses]))
+    key_window = keys // n_cells
+    bounds = np.searchsorted(key_window, np.arange(n_windows + 1))
+
+    # Statistik per rencana hanya untuk sel wilayah (index lokal)
+    stats = CoverageStats(region_grid.area_km2)
+    region_area = float(region_grid.area_km2.sum())
+    instant = np.zeros(n_windows)
+    cumulative = np.zeros(n_windows)
+    covered_area = 0.0
+    for w in range(n_windows):
+        local = keys[bounds[w]:bounds[w + 1]] % n_cells
+        t_start = w * window_seconds
+        covered_area += stats.add_cells(t_start, min(duration, t_start + window_seconds), local)
+        instant[w] = region_grid.area_km2[local].sum() / region_area * 100.0
+        cumulative[w] = covered_area / region_area * 100.0
+
+    summary = stats.summary()
+    per_satellite = []
+    for sat, (windows, cells) in zip(satellites, accesses):
+        per_satellite.append({
+            'name': sat.get('name'),
+            'access_windows': int(len(np.unique(windows))),
+            'coverage_percent': float(region_grid.area_km2[np.unique(cells)].sum() / region_area * 100.0)
+        })
+
+    times = [(start_time + timedelta(seconds=w * window_seconds)).strftime('%Y-%m-%d %H:%M:%S')
+             for w in range(n_windows)]
+    return {
+        'region_area_km2': region_area,
+        'region_cells': n_cells,
+        'coverage_percent': summary['coverage_percent'],
+        'mean_coverage_percent': float(instant.mean()),
+        'max_revisit_gap_seconds': summary['max_revisit_gap_seconds'],
+        'mean_access_seconds': summary['mean_access_seconds'],
+        'mean_visits': summary['mean_visits'],
+        'satellites': per_satellite,
+        'timeseries': {
+            'time': times,
+            'coverage_percent': instant.tolist(),
+            'cumulative_percent': cumulative.tolist()
+        },
+        'stats': {
+            'satellites': len(satellites),
+            'windows': n_windows,
+            'window_seconds': window_seconds,
+            'workers': workers if len(tasks) > 1 else 1,
+            'elapsed_seconds': time.perf_counter() - started
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Statistik cakupan wilayah untuk konstelasi satelit')
+    parser.add_argument('--tle-file', default='TLE.txt')
+    parser.add_argument('--names', nargs='*', default=[], help='Nama satelit di file TLE')
+    parser.add_argument('--norad', nargs='*', type=int, default=[], help='Nomor katalog NORAD')
+    parser.add_argument('--region', default='indonesia', help=f"Wilayah ({', '.join(REGIONS)})")
+    parser.add_argument('--start', help='Waktu awal UTC (YYYY-MM-DDTHH:MM:SS), default sekarang')
+    parser.add_argument('--hours', type=float, default=DEFAULT_PLAN_HOURS, help='Panjang simulasi (jam)')
+    parser.add_argument('--width', type=float, default=DEFAULT_SPOTBEAM_WIDTH_KM, help='Lebar spotbeam (km)')
+    parser.add_argument('--cell', type=float, default=DEFAULT_CELL_KM, help='Ukuran sel grid (km)')
+    parser.add_argument('--window', type=float, default=DEFAULT_PLAN_WINDOW_SECONDS, help='Jendela statistik (detik)')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah proses (default: semua core)')
+    args = parser.parse_args()
+
+    start_time = datetime.fromisoformat(args.start) if args.start else datetime.utcnow().replace(microsecond=0)
+    satellites = select_satellites(args.tle_file, args.names, args.norad)
+
+    print(f"[INFO] {len(satellites)} satelit, wilayah {args.region}, {args.hours} jam mulai {start_time} UTC")
+    result = plan_coverage(satellites, start_time, args.hours, args.region, args.width, args.cell,
+                           args.window, args.tle_file, args.workers)
+
+    for sat in result['satellites']:
+        print(f"   {sat['name']}: {sat['access_windows']} jendela akses, "
+              f"{sat['coverage_percent']:.1f}% wilayah")
+    gap = result['max_revisit_gap_seconds']
+    access = result['mean_access_seconds']
+    print(f"[OK] Cakupan kumulatif: {result['coverage_percent']:.1f}% dari {result['region_area_km2']:.0f} km²")
+    print(f"[OK] Cakupan sesaat rata-rata: {result['mean_coverage_percent']:.1f}%")
+    print(f"[OK] Gap revisit maksimum: {gap / 3600.0:.2f} jam" if gap is not None else "[OK] Gap revisit maksimum: -")
+    print(f"[OK] Rata-rata waktu akses: {access / 60.0:.1f} menit" if access is not None else "[OK] Rata-rata waktu akses: -")
+    print(f"[OK] Selesai dalam {result['stats']['elapsed_seconds']:.1f} detik "
+          f"({result['stats']['workers']} worker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Render peta sebaran debris dengan basemap raster yang di-cache
+==============================================================
+Fitur cartopy (LAND, OCEAN, COASTLINE, BORDERS) dan gridlines adalah bagian
+paling mahal dari render peta. Basemap tersebut dirender sekali per ukuran
+dan proyeksi menjadi array RGBA, lalu setiap request hanya menggambar:
+raster basemap (imshow), scatter debris, colorbar dan judul.
+
+Karena PlateCarree adalah proyeksi equirectangular, raster basemap dalam
+koordinat lon/lat bisa ditempel langsung dengan imshow(extent=...) dan
+scatter digambar di koordinat lon/lat biasa tanpa GeoAxes.
+
+Render memakai matplotlib.figure.Figure + FigureCanvasAgg (tanpa state
+global pyplot) sehingga aman dipanggil dari beberapa thread Flask.
+"""
+
+import io
+import threading
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FixedLocator, FuncFormatter
+
+# Lebar area peta default (pixel); tinggi = lebar / 2 untuk peta global PlateCarree
+DEFAULT_MAP_WIDTH = 1200
+MIN_MAP_WIDTH = 400
+MAX_MAP_WIDTH = 2400
+MAP_DPI = 100
+
+# Proyeksi basemap yang didukung (hanya equirectangular yang bisa dikomposit di lon/lat)
+MAP_PROJECTIONS = ('platecarree',)
+
+# Margin di sekitar area peta (pixel): judul, label tick, colorbar
+_MARGIN_LEFT = 70
+_MARGIN_RIGHT = 70
+_MARGIN_TOP = 80
+_MARGIN_BOTTOM = 130
+_COLORBAR_HEIGHT = 22
+_COLORBAR_GAP = 50
+
+_GRID_LONS = np.arange(-180, 181, 60)
+_GRID_LATS = np.arange(-90, 91, 30)
+
+_basemaps = {}
+_basemaps_lock = threading.Lock()
+
+
+def _lon_label(value, _=None):
+    value = int(round(value))
+    if value in (0, 180, -180):
+        return f"{abs(value)}°"
+    return f"{abs(value)}°{'E' if value > 0 else 'W'}"
+
+
+def _lat_label(value, _=None):
+    value = int(round(value))
+    if value == 0:
+        return "0°"
+    return f"{abs(value)}°{'N' if value > 0 else 'S'}"
+
+
+def render_basemap(width, projection='platecarree'):
+    """
+    Render basemap (fitur cartopy + gridlines) sebagai array RGBA (height, width, 4)
+    yang mencakup tepat extent [-180, 180, -90, 90]
+    """
+    import cartopy.crs as ccrs
+    import cartopy.feature as cfeature
+
+    if projection not in MAP_PROJECTIONS:
+        raise ValueError(f"projection harus salah satu dari {MAP_PROJECTIONS}")
+
+    height = width // 2
+    fig = Figure(figsize=(width / MAP_DPI, height / MAP_DPI), dpi=MAP_DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1], projection=ccrs.PlateCarree())
+
+    ax.add_feature(cfeature.LAND, facecolor='lightgray', alpha=0.5)
+    ax.add_feature(cfeature.OCEAN, facecolor='lightblue', alpha=0.3)
+    ax.add_feature(cfeature.COASTLINE, linewidth=0.5)
+    ax.add_feature(cfeature.BORDERS, linewidth=0.3, alpha=0.5)
+    ax.gridlines(xlocs=_GRID_LONS, ylocs=_GRID_LATS, linewidth=0.5, alpha=0.5)
+    ax.set_extent([-180, 180, -90, 90], crs=ccrs.PlateCarree())
+    ax.spines['geo'].set_visible(False)
+
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def get_basemap(width, projection='platecarree'):
+    """Basemap raster dari cache (dirender sekali per ukuran/proyeksi per proses)"""
+    key = (int(width), projection)
+    with _basemaps_lock:
+        basemap = _basemaps.get(key)
+        if basemap is None:
+            basemap = render_basemap(key[0], projection)
+            _basemaps[key] = basemap
+        return basemap
+
+
+def clamp_map_width(width):
+    if width is None:
+        return DEFAULT_MAP_WIDTH
+    return int(min(MAX_MAP_WIDTH, max(MIN_MAP_WIDTH, int(width))))
+
+
+def render_debris_map(lats, lons, alts, title, width=DEFAULT_MAP_WIDTH,
+                      projection='platecarree'):
+    """
+    Komposit scatter debris di atas basemap raster
+
+    Returns:
+    --------
+    png : bytes
+    timing : dict
+        'basemap_ms' (waktu mengambil/merender basemap), 'render_ms' (total)
+    """
+    started = time.perf_counter()
+    basemap = get_basemap(width, projection)
+    basemap_ms = (time.perf_counter() - started) * 1000.0
+
+    map_width = basemap.shape[1]
+    map_height = basemap.shape[0]
+    fig_width = map_width + _MARGIN_LEFT + _MARGIN_RIGHT
+    fig_height = map_height + _MARGIN_TOP + _MARGIN_BOTTOM
+
+    fig = Figure(figsize=(fig_width / MAP_DPI, fig_height / MAP_DPI), dpi=MAP_DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([_MARGIN_LEFT / fig_width, _MARGIN_BOTTOM / fig_height,
+                       map_width / fig_width, map_height / fig_height])
+
+    ax.imshow(basemap, extent=[-180, 180, -90, 90], origin='upper',
+              interpolation='nearest', aspect='auto')
+    ax.set_xlim(-180, 180)
+    ax.set_ylim(-90, 90)
+    ax.xaxis.set_major_locator(FixedLocator(_GRID_LONS))
+    ax.yaxis.set_major_locator(FixedLocator(_GRID_LATS))
+    ax.xaxis.set_major_formatter(FuncFormatter(_lon_label))
+    ax.yaxis.set_major_formatter(FuncFormatter(_lat_label))
+    ax.tick_params(labelsize=8, length=0, labeltop=True, labelright=True)
+
+    if len(lats) > 0:
+        scatter = ax.scatter(lons, lats, c=alts, s=15, alpha=0.6, cmap='jet')
+
+        cax = fig.add_axes([(_MARGIN_LEFT + 0.15 * map_width) / fig_width,
+                            (_MARGIN_BOTTOM - _COLORBAR_GAP - _COLORBAR_HEIGHT) / fig_height,
+                            0.7 * map_width / fig_width, _COLORBAR_HEIGHT / fig_height])
+        cbar = fig.colorbar(scatter, cax=cax, orientation='horizontal')
+        cbar.set_label('Debris Altitude (km)', fontsize=10)
+
+    fig.suptitle(title, fontsize=14, fontweight='bold',
+                 y=1 - 12 / fig_height, va='top')
+
+    img_bytes = io.BytesIO()
+    canvas.print_png(img_bytes)
+
+    return img_bytes.getvalue(), {
+        'basemap_ms': basemap_ms,
+        'render_ms': (time.perf_counter() - started) * 1000.0
+    }
@@ -0,0 +1,199 @@
+"""
+Snapshot posisi debris per time bucket, dipakai bersama oleh semua endpoint
+==========================================================================
+Seluruh katalog debris dipropagasi sekali per bucket waktu
+(SNAPSHOT_BUCKET_SECONDS, mis. 10 detik) lalu disimpan di memori sebagai
+array NumPy. /api/debris-data, /api/debris-map dan /api/predict-collision
+(mode snapshot) membaca dari snapshot yang sama, termasuk semua filter
+kategori. Request bersamaan dalam bucket yang sama menunggu satu propagasi
+yang sama (dilindungi lock), bukan masing-masing mempropagasi ulang.
+
+Waktu snapshot adalah awal bucket, sehingga posisi yang dilayani paling
+lama tertinggal SNAPSHOT_BUCKET_SECONDS dari "sekarang".
+"""
+
+import struct
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+from sgp4.api import jday
+
+from collision_prediction import debris_state_to_dicts, propagate_catalog
+from spatial_index import DebrisIndex
+from tle_catalog import load_catalog
+
+# Jumlah snapshot (bucket) terakhir yang disimpan
+SNAPSHOT_KEEP = 4
+
+# Format binary kolom debris (little-endian):
+#   header 24 byte: magic b'DEBR', version uint16, reserved uint16, count uint32,
+#                   reserved uint32, waktu snapshot (detik Unix) float64
+#   lat float32[count], lon float32[count], alt float32[count], category uint8[count]
+# Kategori -1 (di luar range altitude) ditulis sebagai 255.
+DEBRIS_BINARY_MAGIC = b'DEBR'
+DEBRIS_BINARY_VERSION = 1
+DEBRIS_BINARY_MIMETYPE = 'application/octet-stream'
+_DEBRIS_BINARY_HEADER = struct.Struct('<4sHHIId')
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+class DebrisSnapshot:
+    """
+    Posisi seluruh katalog debris pada satu waktu (hasil propagate_catalog)
+
+    Semua turunan (list dict, KD-tree, binary) dibuat lazily dan di-cache per snapshot.
+    """
+
+    def __init__(self, time, bucket, state, catalog_version):
+        self.time = time
+        self.bucket = bucket
+        self.catalog_version = catalog_version
+        self.state = state
+        self._selections = {}
+        self._dicts = {}
+        self._binary = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    def select(self, category=None):
+        """Index katalog untuk debris valid (opsional hanya satu kategori altitude)"""
+        with self._lock:
+            index = self._selections.get(category)
+            if index is None:
+                mask = self.state['valid']
+                if category is not None:
+                    mask = mask & (self.state['cat_idx'] == category)
+                index = np.flatnonzero(mask)
+                self._selections[category] = index
+            return index
+
+    def count(self, category=None):
+        return len(self.select(category))
+
+    def debris(self, category=None):
+        """List dict debris (format parse_debris_tle); jangan diubah oleh pemanggil"""
+        index = self.select(category)
+        with self._lock:
+            debris_positions = self._dicts.get(category)
+            if debris_positions is None:
+                debris_positions = debris_state_to_dicts(self.state, index)
+                self._dicts[category] = debris_positions
+            return debris_positions
+
+    def debris_index(self):
+        """KD-tree atas semua debris valid (urutan sama dengan debris())"""
+        index = self.select()
+        with self._lock:
+            if self._index is None:
+                self._index = DebrisIndex(self.state['position'][index])
+            return self._index
+
+    def columns(self, category=None):
+        """Array lat, lon, alt, cat_idx untuk debris terpilih"""
+        index = self.select(category)
+        return (self.state['lat'][index], self.state['lon'][index],
+                self.state['alt'][index], self.state['cat_idx'][index])
+
+    def to_binary(self, category=None):
+        """Kolom lat/lon/alt/kategori dalam format binary DEBR (di-cache per kategori)"""
+        lats, lons, alts, cat_idx = self.columns(category)
+        with self._lock:
+            payload = self._binary.get(category)
+            if payload is None:
+                header = _DEBRIS_BINARY_HEADER.pack(
+                    DEBRIS_BINARY_MAGIC, DEBRIS_BINARY_VERSION, 0, len(lats), 0,
+                    (self.time - _UNIX_EPOCH).total_seconds())
+                payload = b''.join([
+                    header,
+                    lats.astype('<f4').tobytes(),
+                    lons.astype('<f4').tobytes(),
+                    alts.astype('<f4').tobytes(),
+                    cat_idx.astype(np.uint8).tobytes()
+                ])
+                self._binary[category] = payload
+            return payload
+
+
+class DebrisSnapshotService:
+    """
+    Penyedia DebrisSnapshot per bucket waktu untuk satu file TLE
+
+    Parameters:
+    -----------
+    tle_file_path : str
+    bucket_seconds : int
+        Lebar bucket waktu; semua request dalam bucket yang sama memakai
+        snapshot yang sama
+    """
+
+    def __init__(self, tle_file_path, bucket_seconds=10, keep=SNAPSHOT_KEEP):
+        self.tle_file_path = tle_file_path
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.keep = keep
+        self.builds = 0
+        self.hits = 0
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bucket_for(self, time):
+        return int((time - _UNIX_EPOCH).total_seconds() // self.bucket_seconds)
+
+    def bucket_start(self, bucket):
+        return _UNIX_EPOCH + timedelta(seconds=bucket * self.bucket_seconds)
+
+    def get(self, at=None):
+        """
+        Snapshot untuk bucket yang memuat waktu `at` (UTC, default sekarang).
+        Jika file TLE tidak ada, snapshot kosong dikembalikan (seperti
+        parse_debris_tle yang mengembalikan list kosong).
+        """
+        if at is None:
+            at = datetime.utcnow()
+        bucket = self.bucket_for(at)
+
+        try:
+            catalog = load_catalog(self.tle_file_path)
+        except FileNotFoundError:
+            print(f"Error: File {self.tle_file_path} tidak ditemukan")
+            catalog = None
+        key = (bucket, catalog.version if catalog is not None else None)
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+                self.hits += 1
+                return snapshot
+
+            # Propagasi di dalam lock: request lain untuk bucket ini menunggu hasil yang sama
+            snapshot = self._build(catalog, bucket)
+            self._snapshots[key] = snapshot
+            while len(self._snapshots) > self.keep:
+                self._snapshots.popitem(last=False)
+            self.builds += 1
+            return snapshot
+
+    def _build(self, catalog, bucket):
+        time = self.bucket_start(bucket)
+        jd, fr = jday(time.year, time.month, time.day, time.hour, time.minute, time.second)
+
+        if catalog is not None and len(catalog) > 0:
+            satrecs = catalog.satrec_array()
+        else:
+            satrecs = []
+        state = propagate_catalog(satrecs, jd, fr)
+
+        return DebrisSnapshot(time, bucket, state,
+                              catalog.version if catalog is not None else None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'bucket_seconds': self.bucket_seconds,
+                'builds': self.builds,
+                'hits': self.hits,
+                'snapshots': len(self._snapshots)
+            }
@@ -0,0 +1,202 @@
+"""
+Tile XYZ (web mercator) untuk peta sebaran debris
+=================================================
+Posisi debris dari snapshot bersama (debris_snapshot) dirasterisasi menjadi
+tile PNG 256x256 dengan skema XYZ (sama seperti OpenStreetMap/Leaflet).
+Setiap titik digambar sebagai lingkaran kecil berwarna sesuai kategori
+altitude (warna sama dengan getColorForAltitude di debris-visualization.js).
+
+Tile di-cache per (z, x, y, time bucket, kategori, versi katalog). Piramida
+zoom rendah (0..DEBRIS_TILE_PRECOMPUTE_ZOOM) dirender di background thread
+setiap kali bucket snapshot berganti, untuk setiap kategori (termasuk tanpa
+filter) yang masih di-request dalam TILE_WARM_IDLE_SECONDS terakhir.
+"""
+
+import io
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+TILE_SIZE = 256
+MAX_TILE_ZOOM = 12
+
+# Batas latitude web mercator
+MAX_MERCATOR_LAT = 85.05112878
+
+# Warna RGBA per kategori altitude 0-4; index terakhir untuk 'Out of range'
+CATEGORY_COLORS = np.array([
+    [255, 0, 0, 220],
+    [255, 136, 0, 220],
+    [255, 255, 0, 220],
+    [0, 255, 0, 220],
+    [0, 0, 255, 220],
+    [128, 128, 128, 220],
+], dtype=np.uint8)
+
+# Background warmer berhenti jika tidak ada request tile selama ini (detik)
+TILE_WARM_IDLE_SECONDS = 300
+
+
+def mercator_pixels(lats, lons, zoom):
+    """Koordinat pixel global web mercator (x, y) pada level zoom"""
+    scale = TILE_SIZE * (1 << zoom)
+    lat = np.radians(np.clip(lats, -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT))
+    x = (np.asarray(lons) + 180.0) / 360.0 * scale
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0 * scale
+    return x, y
+
+
+def _dot_offsets(radius):
+    """Offset pixel (dx, dy) untuk lingkaran dengan radius tertentu"""
+    d = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(d, d)
+    inside = dx**2 + dy**2 <= radius**2 + radius
+    return dx[inside], dy[inside]
+
+
+def dot_radius(zoom):
+    return 1 if zoom <= 1 else 2 if zoom <= 4 else 3
+
+
+def render_tile(lats, lons, cat_idx, z, x, y):
+    """
+    Rasterisasi debris ke satu tile
+
+    Returns:
+    --------
+    png : bytes (RGBA, transparan di luar titik debris)
+    """
+    radius = dot_radius(z)
+    px, py = mercator_pixels(lats, lons, z)
+    px = px - x * TILE_SIZE
+    py = py - y * TILE_SIZE
+
+    inside = ((px > -radius - 1) & (px < TILE_SIZE + radius) &
+              (py > -radius - 1) & (py < TILE_SIZE + radius))
+    px = px[inside].astype(int)
+    py = py[inside].astype(int)
+    colors = CATEGORY_COLORS[np.where(cat_idx[inside] >= 0, cat_idx[inside], -1)]
+
+    tile = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+    for dx, dy in zip(*_dot_offsets(radius)):
+        tx = px + dx
+        ty = py + dy
+        ok = (tx >= 0) & (tx < TILE_SIZE) & (ty >= 0) & (ty < TILE_SIZE)
+        tile[ty[ok], tx[ok]] = colors[ok]
+
+    img_bytes = io.BytesIO()
+    Image.fromarray(tile, 'RGBA').save(img_bytes, format='PNG', optimize=False)
+    return img_bytes.getvalue()
+
+
+def valid_tile(z, x, y):
+    return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)
+
+
+class DebrisTileService:
+    """
+    Tile debris dari DebrisSnapshotService dengan cache LRU per
+    (tile, bucket, kategori, versi katalog)
+    """
+
+    def __init__(self, snapshots, cache_size=2048, precompute_zoom=2):
+        self.snapshots = snapshots
+        self.cache_size = cache_size
+        self.precompute_zoom = precompute_zoom
+        self.hits = 0
+        self.renders = 0
+        self.last_request = 0.0
+        # Waktu request tile terakhir per kategori (None = tanpa filter)
+        self._category_requests = {}
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmer = None
+
+    def get_tile(self, z, x, y, category=None):
+        """
+        Returns:
+        --------
+        png : bytes
+        snapshot : DebrisSnapshot yang dipakai
+        """
+        now = time.time()
+        self.last_request = now
+        with self._lock:
+            self._category_requests[category] = now
+        snapshot = self.snapshots.get()
+        return self._tile_for(snapshot, z, x, y, category), snapshot
+
+    def _tile_for(self, snapshot, z, x, y, category):
+        key = (z, x, y, snapshot.bucket, category, snapshot.catalog_version)
+        with self._lock:
+            png = self._tiles.get(key)
+            if png is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return png
+
+        lats, lons, _, cat_idx = snapshot.columns(category)
+        png = render_tile(lats, lons, cat_idx, z, x, y)
+
+        with self._lock:
+            self._tiles[key] = png
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.cache_size:
+                self._tiles.popitem(last=False)
+            self.renders += 1
+        return png
+
+    def precompute(self, snapshot, category=None):
+        """Render piramida zoom 0..precompute_zoom untuk satu snapshot"""
+        for z in range(self.precompute_zoom + 1):
+            for x in range(1 << z):
+                for y in range(1 << z):
+                    self._tile_for(snapshot, z, x, y, category)
+
+    def active_categories(self):
+        """Kategori yang di-request dalam TILE_WARM_IDLE_SECONDS terakhir"""
+        cutoff = time.time() - TILE_WARM_IDLE_SECONDS
+        with self._lock:
+            return [category for category, last in self._category_requests.items()
+                    if last >= cutoff]
+
+    def start_background_precompute(self):
+        """Jalankan thread daemon yang merender piramida zoom rendah setiap bucket baru"""
+        if self._warmer is not None or self.precompute_zoom < 0:
+            return
+        self._warmer = threading.Thread(target=self._warm_loop, name='debris-tile-warmer',
+                                        daemon=True)
+        self._warmer.start()
+
+    def _warm_loop(self):
+        bucket_seconds = self.snapshots.bucket_seconds
+        while True:
+            # Tunggu sampai awal bucket berikutnya
+            time.sleep(bucket_seconds - time.time() % bucket_seconds + 0.05)
+            categories = self.active_categories()
+            if not categories:
+                continue
+            try:
+                snapshot = self.snapshots.get()
+                for category in categories:
+                    self.precompute(snapshot, category)
+            except Exception as e:
+                print(f"[INFO] Precompute tile debris gagal: {e}")
+
+    def seconds_until_next_bucket(self):
+        bucket_seconds = self.snapshots.bucket_seconds
+        return bucket_seconds - int(time.time() % bucket_seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tiles': len(self._tiles),
+                'cache_size': self.cache_size,
+                'hits': self.hits,
+                'renders': self.renders,
+                'precompute_zoom': self.precompute_zoom
+            }
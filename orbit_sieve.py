@@ -0,0 +1,233 @@
+"""
+Sieve geometri orbit sebelum screening konjungsi berpasangan
+=============================================================
+Filter klasik (Hoots et al. 1984) yang dijalankan pada elemen orbit sebelum
+propagasi grid waktu:
+
+1. Apogee/perigee : kulit radial [perigee, apogee] satelit dan debris harus
+                    saling tumpang tindih (dengan pad).
+2. Orbit path     : titik kedua orbit yang berdekatan harus sama-sama dekat
+                    dengan garis potong kedua bidang orbit (mutual node).
+                    Jangkauan radius tiap orbit di sekitar node tersebut harus
+                    tumpang tindih; ini adalah batas bawah MOID.
+
+Elemen yang dipakai adalah elemen rata-rata SGP4 pada awal dan akhir jendela
+prediksi (bukan epoch TLE), sehingga peluruhan orbit dan presesi J2 selama
+jendela ikut diperhitungkan. Pad = threshold + SIEVE_MARGIN_KM untuk menutup
+perturbasi periode pendek (radial ~11 km, keluar bidang ~20 km di LEO).
+Objek yang elemennya tidak valid tidak pernah dibuang (tanpa false negative).
+
+sgp4() menulis elemen rata-rata ke atribut Satrec sebagai efek samping. Satrec
+dari cache bersama (get_satrec, TLECatalog.satrecs) dipakai thread lain, jadi
+sieve selalu bekerja pada salinan privat yang dibangun ulang dari elemen epoch.
+"""
+
+import numpy as np
+from sgp4.api import jday
+
+from tle_catalog import satrec_from_record
+
+# Margin (km) di atas threshold untuk perbedaan posisi oskulasi vs elemen rata-rata
+SIEVE_MARGIN_KM = 25.0
+
+# Bidang orbit dianggap sejajar (filter orbit path dilewati) di bawah nilai ini
+COPLANAR_SIN_TOLERANCE = 1e-6
+
+# Elemen epoch Satrec; hanya ditulis oleh sgp4init, tidak oleh sgp4()
+_EPOCH_FIELDS = ('satnum', 'jdsatepoch', 'jdsatepochF', 'bstar', 'ndot', 'nddot',
+                 'ecco', 'argpo', 'inclo', 'mo', 'no_kozai', 'nodeo')
+
+
+def _wrap(angle):
+    """Normalisasi sudut ke [-pi, pi)"""
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def private_satrecs(satrecs):
+    """Salinan Satrec yang tidak dibagi dengan thread lain (identik hasil sgp4-nya)"""
+    return [satrec_from_record({field: getattr(sat, field) for field in _EPOCH_FIELDS})
+            for sat in satrecs]
+
+
+def mean_elements(satrecs, jd, fr):
+    """
+    Elemen rata-rata SGP4 pada satu waktu
+
+    satrecs harus salinan privat (lihat private_satrecs): atributnya ditimpa.
+
+    Returns:
+    --------
+    dict berisi array (N,): 'a' (km), 'e', 'i', 'Om', 'om' (rad); NaN jika sgp4 error
+    """
+    values = np.full((len(satrecs), 5), np.nan)
+
+    for k, sat in enumerate(satrecs):
+        error, _, _ = sat.sgp4(jd, fr)
+        if error == 0:
+            values[k] = (sat.am * sat.radiusearthkm, sat.em, sat.im, sat.Om, sat.om)
+
+    return {
+        'a': values[:, 0],
+        'e': values[:, 1],
+        'i': values[:, 2],
+        'Om': values[:, 3],
+        'om': values[:, 4]
+    }
+
+
+def orbit_bounds(satrecs, start_time, duration_minutes):
+    """
+    Geometri orbit untuk sieve: elemen rata-rata di awal jendela plus batas
+    radial dan drift sudut sepanjang jendela
+    """
+    satrecs = private_satrecs(satrecs)
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute, start_time.second)
+    start = mean_elements(satrecs, jd0, fr0)
+    end = mean_elements(satrecs, jd0, fr0 + duration_minutes / 1440.0)
+
+    q_start = start['a'] * (1 - start['e'])
+    Q_start = start['a'] * (1 + start['e'])
+    q_end = end['a'] * (1 - end['e'])
+    Q_end = end['a'] * (1 + end['e'])
+
+    bounds = dict(start)
+    bounds['q_start'] = q_start
+    bounds['Q_start'] = Q_start
+    bounds['q_min'] = np.fmin(q_start, q_end)
+    bounds['Q_max'] = np.fmax(Q_start, Q_end)
+    bounds['dOm'] = np.abs(_wrap(end['Om'] - start['Om']))
+    bounds['dom'] = np.abs(_wrap(end['om'] - start['om']))
+    bounds['valid'] = np.isfinite(q_start) & np.isfinite(q_end) & np.isfinite(end['Om'])
+
+    return bounds
+
+
+def _select(bounds, index):
+    return {key: value[index] for key, value in bounds.items()}
+
+
+def apogee_perigee_filter(sat, debris, pad):
+    """True untuk debris yang kulit radialnya tumpang tindih dengan satelit"""
+    gap = np.fmax(sat['q_min'], debris['q_min']) - np.fmin(sat['Q_max'], debris['Q_max'])
+    return ~debris['valid'] | ~(gap > pad)
+
+
+def _plane_basis(i, Om):
+    """Normal bidang orbit (h), arah node naik (P) dan Q = h x P"""
+    h = np.stack([np.sin(i) * np.sin(Om), -np.sin(i) * np.cos(Om), np.cos(i)], axis=-1)
+    P = np.stack([np.cos(Om), np.sin(Om), np.zeros_like(Om)], axis=-1)
+    return h, P, np.cross(h, P)
+
+
+def _radius_range(orbit, u_center, half_width):
+    """
+    Rentang radius orbit untuk argumen lintang dalam [u_center - w, u_center + w],
+    diperlebar dengan peluruhan/perubahan eksentrisitas selama jendela
+    """
+    a, e = orbit['a'], orbit['e']
+    semi_latus = a * (1 - e**2)
+    nu_center = _wrap(u_center - orbit['om'])
+
+    def radius(nu):
+        return semi_latus / (1 + e * np.cos(nu))
+
+    r1 = radius(nu_center - half_width)
+    r2 = radius(nu_center + half_width)
+
+    whole = half_width >= np.pi
+    r_min = np.where(whole | (np.abs(nu_center) <= half_width), orbit['q_start'], np.fmin(r1, r2))
+    r_max = np.where(whole | (np.abs(_wrap(nu_center - np.pi)) <= half_width),
+                     orbit['Q_start'], np.fmax(r1, r2))
+
+    return (r_min - (orbit['q_start'] - orbit['q_min']),
+            r_max + (orbit['Q_max'] - orbit['Q_start']))
+
+
+def _overlap(range_a, range_b, pad):
+    return ~(np.fmax(range_a[0], range_b[0]) - np.fmin(range_a[1], range_b[1]) > pad)
+
+
+def orbit_path_filter(sat, debris, pad):
+    """
+    True untuk debris yang orbitnya bisa berada dalam jarak pad dari orbit
+    satelit (filter orbit path / batas bawah MOID)
+    """
+    h_s, P_s, Q_s = _plane_basis(sat['i'], sat['Om'])
+    h_d, P_d, Q_d = _plane_basis(debris['i'], debris['Om'])
+
+    # Garis potong kedua bidang (mutual node)
+    K = np.cross(h_s, h_d)
+    sin_rel = np.linalg.norm(K, axis=-1)
+    coplanar = ~(sin_rel > COPLANAR_SIN_TOLERANCE)
+    sin_safe = np.where(coplanar, 1.0, sin_rel)
+    K = K / sin_safe[:, None]
+
+    # Argumen lintang mutual node di masing-masing bidang
+    u_s = np.arctan2(np.sum(K * Q_s, axis=1), np.sum(K * P_s, axis=1))
+    u_d = np.arctan2(np.sum(K * Q_d, axis=1), np.sum(K * P_d, axis=1))
+
+    # Setengah lebar jendela: jarak ke bidang lain = r |sin(u - u_node)| sin(I_R) < pad,
+    # ditambah drift argumen perigee dan pergeseran node akibat presesi RAAN
+    node_drift = (sat['dOm'] + debris['dOm']) / sin_safe
+    w_s = (np.arcsin(np.clip(pad / (sat['q_min'] * sin_safe), 0.0, 1.0))
+           + sat['dom'] + node_drift)
+    w_d = (np.arcsin(np.clip(pad / (debris['q_min'] * sin_safe), 0.0, 1.0))
+           + debris['dom'] + node_drift)
+    w_s = np.where(w_s >= np.pi / 2, np.pi, w_s)
+    w_d = np.where(w_d >= np.pi / 2, np.pi, w_d)
+
+    sat_ranges = [_radius_range(sat, u_s, w_s), _radius_range(sat, u_s + np.pi, w_s)]
+    debris_ranges = [_radius_range(debris, u_d, w_d), _radius_range(debris, u_d + np.pi, w_d)]
+
+    keep = (_overlap(sat_ranges[0], debris_ranges[0], pad) |
+            _overlap(sat_ranges[1], debris_ranges[1], pad))
+
+    # Jendela lebar: titik dekat node berlawanan bisa saja saling dekat
+    r_min = np.fmin(sat['q_min'], debris['q_min'])
+    cross_possible = (w_s + w_d + 2 * np.arcsin(np.clip(pad / (2 * r_min), 0.0, 1.0))
+                      >= np.pi)
+    keep |= cross_possible & (_overlap(sat_ranges[0], debris_ranges[1], pad) |
+                              _overlap(sat_ranges[1], debris_ranges[0], pad))
+
+    return keep | coplanar | ~debris['valid']
+
+
+def sieve_candidates(sat_satrec, debris_satrecs, start_time, duration_minutes, threshold,
+                     margin=SIEVE_MARGIN_KM):
+    """
+    Jalankan sieve apogee/perigee lalu orbit path
+
+    Returns:
+    --------
+    candidates : array int
+        Index debris yang lolos sieve (harus tetap discreening)
+    stats : dict
+        'total', 'apogee_perigee_removed', 'orbit_path_removed', 'candidates'
+    """
+    pad = threshold + margin
+    total = len(debris_satrecs)
+
+    sat = orbit_bounds([sat_satrec], start_time, duration_minutes)
+    if not sat['valid'][0] or total == 0:
+        # Elemen satelit tidak valid: jangan membuang apa pun
+        return np.arange(total), {
+            'total': total,
+            'apogee_perigee_removed': 0,
+            'orbit_path_removed': 0,
+            'candidates': total
+        }
+
+    debris = orbit_bounds(debris_satrecs, start_time, duration_minutes)
+
+    stage1 = np.flatnonzero(apogee_perigee_filter(sat, debris, pad))
+    stage2 = stage1[orbit_path_filter(sat, _select(debris, stage1), pad)]
+
+    stats = {
+        'total': total,
+        'apogee_perigee_removed': int(total - len(stage1)),
+        'orbit_path_removed': int(len(stage1) - len(stage2)),
+        'candidates': int(len(stage2))
+    }
+
+    return stage2, stats
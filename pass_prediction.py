@@ -0,0 +1,526 @@
+"""
+Prediksi passing satelit untuk jaringan ground station
+======================================================
+find_passes adalah logika pencarian pass yang sama dengan
+/api/calculate-passes (almanac.find_discrete pada elevasi minimum).
+calculate_network_passes menjalankannya untuk setiap pasangan
+(satelit, station) di process pool. Setiap worker memuat timescale skyfield
+sekali saat start dan menyimpan EarthSatellite yang sudah diparse (lihat
+astro_context), sehingga task berikutnya tidak mengulang setup. Hasilnya digabung menjadi satu tabel
+kontak yang terurut berdasarkan waktu AOS.
+
+Prefilter visibilitas: sebelum root-finding skyfield, satelit dipropagasi
+kasar (satu panggilan sgp4_array, rotasi GMST sederhana) dan hanya jendela
+waktu di mana sudut pusat bumi antara observer dan sub-satellite point
+cukup kecil (lihat max_ground_angle) yang disampel elevasinya. Margin
+mencakup gerak satelit dan rotasi bumi dalam satu step kasar. Step sampel
+diskalakan ke pass terpendek orbit (lihat pass_sample_step), dan maksimum
+lokal elevasi yang tersampel di bawah mask dipertajam dengan golden-section
+sehingga pass grazing yang lebih pendek dari step tetap terdeteksi. Jika
+jendela menutupi sebagian besar rentang (GEO/MEO yang hampir selalu
+terlihat), prefilter tidak menghemat apa pun dan find_discrete dipakai.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from sgp4.api import jday
+from skyfield import almanac
+from skyfield.api import wgs84
+
+from astro_context import get_context, get_earth_satellite
+from collision_prediction import eci_to_latlon_array
+
+MAX_NETWORK_SATELLITES = 200
+MAX_NETWORK_STATIONS = 100
+
+# Jumlah pasangan (satelit, station) per task worker
+PAIRS_PER_TASK = 4
+
+# Step propagasi kasar prefilter visibilitas (detik), minimal; satelit lambat
+# (MEO/GEO) memakai step lebih panjang dengan gerak sudut per step yang sama
+PREFILTER_STEP_SECONDS = 60.0
+PREFILTER_STEP_DEGREES = 4.0
+
+# Fraksi rentang pencarian yang tertutup jendela; di atas ini find_discrete dipakai
+PREFILTER_MAX_COVERAGE = 0.5
+
+# Jumlah sampel elevasi minimum per pass terpendek (pass overhead di perigee)
+PREFILTER_SAMPLES_PER_PASS = 8
+PREFILTER_MIN_SAMPLE_SECONDS = 1.0
+
+# Presisi waktu puncak elevasi pass grazing (hari)
+PEAK_EPSILON_DAYS = 1.0 / 86400.0
+
+EARTH_MU = 398600.4418  # km^3/s^2
+
+# Radius polar bumi (km); radius terkecil memberi batas sudut visibilitas terbesar
+EARTH_POLAR_RADIUS = 6356.752
+EARTH_ROTATION_RATE = 7.2921159e-5  # rad/s
+
+# Slack sudut (derajat) untuk geodetic vs geocentric latitude, TEME vs ITRS dan UT1-UTC
+PREFILTER_SLACK_DEGREES = 0.5
+
+# Jumlah sampel per pass untuk mencari elevasi maksimum
+PASS_SAMPLES = 20
+
+# Presisi waktu AOS/LOS (hari), sama dengan default almanac.find_discrete
+TRANSITION_EPSILON_DAYS = 0.001 / 86400.0
+
+# Start method pool: get_pool dipanggil dari thread request Flask/gunicorn, dan
+# fork dari proses multi-thread bisa mewarisi lock yang sedang dipegang thread
+# lain. forkserver mem-fork worker dari proses server bersih (spawn jika tidak ada)
+POOL_START_METHODS = ('forkserver', 'spawn')
+
+# Modul yang diimpor sekali di proses forkserver agar worker baru langsung hangat
+POOL_PRELOAD_MODULES = ['pass_prediction']
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def gmst_array(jd_ut1):
+    """Greenwich mean sidereal time (rad) untuk array Julian date, rumus IAU-82 (sgp4 gstime)"""
+    tut1 = (jd_ut1 - 2451545.0) / 36525.0
+    seconds = (-6.2e-6 * tut1**3 + 0.093104 * tut1**2 +
+               (876600.0 * 3600 + 8640184.812866) * tut1 + 67310.54841)
+    return np.radians(seconds / 240.0) % (2 * np.pi)
+
+
+def max_ground_angle(radius_km, min_elevation):
+    """
+    Sudut pusat bumi maksimum (rad) antara observer dan sub-satellite point
+    agar satelit pada radius_km terlihat di atas min_elevation
+    """
+    elevation = np.radians(min_elevation)
+    ratio = np.clip(EARTH_POLAR_RADIUS * np.cos(elevation) / radius_km, -1.0, 1.0)
+    return np.maximum(np.arccos(ratio) - elevation, 0.0)
+
+
+def ground_angular_rate(satrec, radius=None):
+    """
+    Laju sudut maksimum (rad/s) sub-satellite point relatif observer pada
+    radius orbit (default: perigee), ditambah rotasi bumi
+    """
+    mean_motion = satrec.no_kozai / 60.0  # rad/s
+    ecc = satrec.ecco
+    if radius is None:
+        return mean_motion * (1 + ecc)**2 / (1 - ecc**2)**1.5 + EARTH_ROTATION_RATE
+    # Momentum sudut spesifik / r^2
+    a = (EARTH_MU / mean_motion**2) ** (1.0 / 3.0)
+    return mean_motion * a**2 * np.sqrt(1 - ecc**2) / radius**2 + EARTH_ROTATION_RATE
+
+
+def pass_sample_step(satrec, min_elevation, radius=None):
+    """
+    Step sampel elevasi (hari) di dalam jendela prefilter: pass overhead pada
+    radius terkecil di jendela (default: perigee) dibagi
+    PREFILTER_SAMPLES_PER_PASS, maksimal 1/20 periode (step find_discrete)
+    """
+    mean_motion = satrec.no_kozai / 60.0  # rad/s
+    period = 2 * np.pi / mean_motion
+    if radius is None or not np.isfinite(radius):
+        radius = (EARTH_MU / mean_motion**2) ** (1.0 / 3.0) * (1 - satrec.ecco)
+    shortest_pass = (2 * max_ground_angle(radius, min_elevation) /
+                     ground_angular_rate(satrec, radius))
+    step = np.clip(shortest_pass / PREFILTER_SAMPLES_PER_PASS,
+                   PREFILTER_MIN_SAMPLE_SECONDS, period / 20.0)
+    return float(step) / 86400.0
+
+
+def visibility_windows(satrec, latitude, longitude, start_time, end_time, min_elevation=10,
+                       step_seconds=None):
+    """
+    Jendela waktu kandidat pass dari propagasi kasar
+
+    step_seconds default: waktu untuk gerak sudut PREFILTER_STEP_DEGREES,
+    minimal PREFILTER_STEP_SECONDS dan maksimal 1/20 periode
+
+    Returns:
+    --------
+    list (lo, hi, radius_min) dengan lo/hi dalam hari sejak start_time (sudah
+    digabung dan dipotong ke [start_time, end_time]) dan radius orbit terkecil
+    (km, NaN jika propagasi gagal) di dalam jendela; di luar jendela satelit
+    pasti di bawah min_elevation
+    """
+    duration = end_time.tt - start_time.tt
+    if duration <= 0:
+        return []
+    if step_seconds is None:
+        period_seconds = 2 * np.pi / (satrec.no_kozai / 60.0)
+        step_seconds = min(max(np.radians(PREFILTER_STEP_DEGREES) / ground_angular_rate(satrec),
+                               PREFILTER_STEP_SECONDS), period_seconds / 20.0)
+    step = step_seconds / 86400.0
+    offsets = np.append(np.arange(0.0, duration, step), duration)
+
+    year, month, day, hour, minute, second = start_time.utc
+    jd0, fr0 = jday(int(year), int(month), int(day), int(hour), int(minute), float(second))
+    error, position, _ = satrec.sgp4_array(np.full(len(offsets), jd0), fr0 + offsets)
+
+    # TEME -> bumi berputar (hanya rotasi GMST)
+    with np.errstate(invalid='ignore'):
+        sat_lat, sat_lon, _ = eci_to_latlon_array(position[:, 0], position[:, 1],
+                                                  position[:, 2])
+    sat_lat = np.radians(sat_lat)
+    sat_lon = np.radians(sat_lon) - gmst_array(jd0 + fr0 + offsets)
+    radius = np.linalg.norm(position, axis=1)
+
+    obs_lat = np.radians(latitude)
+    obs_lon = np.radians(longitude)
+    cos_angle = (np.sin(sat_lat) * np.sin(obs_lat) +
+                 np.cos(sat_lat) * np.cos(obs_lat) * np.cos(sat_lon - obs_lon))
+    angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+
+    # Radius bisa naik/turun di antara dua sampel: pakai ekstrem di sekitarnya
+    radius_max = np.maximum(radius, np.maximum(np.roll(radius, 1), np.roll(radius, -1)))
+    radius_min = np.minimum(radius, np.minimum(np.roll(radius, 1), np.roll(radius, -1)))
+
+    margin = ground_angular_rate(satrec) * step_seconds + np.radians(PREFILTER_SLACK_DEGREES)
+
+    candidate = (angle <= max_ground_angle(radius_max, min_elevation) + margin)
+    # Sampel gagal propagasi diserahkan ke skyfield
+    candidate |= (error != 0) | ~np.isfinite(angle)
+
+    windows = []
+    for k in np.flatnonzero(candidate):
+        lo = max(0.0, offsets[k] - step)
+        hi = min(duration, offsets[k] + step)
+        if windows and lo <= windows[-1][1]:
+            windows[-1][1] = hi
+            windows[-1][2] = min(windows[-1][2], radius_min[k])
+        else:
+            windows.append([lo, hi, radius_min[k]])
+    return [tuple(w) for w in windows]
+
+
+def _refine_peaks(ts, lo, hi, g, epsilon=PEAK_EPSILON_DAYS):
+    """
+    Maksimum g (fungsi kontinu waktu) di setiap bracket [lo, hi] (TT) dengan
+    golden-section yang divektorisasi untuk semua bracket sekaligus
+
+    Returns:
+    --------
+    jd : array waktu puncak (TT)
+    values : array g pada waktu puncak
+    """
+    ratio = (np.sqrt(5.0) - 1.0) / 2.0
+    while len(lo) and np.max(hi - lo) > epsilon:
+        left = hi - ratio * (hi - lo)
+        right = lo + ratio * (hi - lo)
+        g_left, g_right = np.split(g(ts.tt_jd(np.concatenate([left, right]))), 2)
+        keep_left = g_left >= g_right
+        hi = np.where(keep_left, right, hi)
+        lo = np.where(keep_left, lo, left)
+
+    jd = (lo + hi) / 2.0
+    return jd, (g(ts.tt_jd(jd)) if len(jd) else np.zeros(0))
+
+
+def _sample_elevation(ts, grid, elevation, min_elevation):
+    """
+    Elevasi pada grid per jendela (list array TT) ditambah puncak pass
+    grazing: maksimum lokal tersampel di bawah min_elevation yang puncak
+    sebenarnya di atasnya
+
+    Returns:
+    --------
+    jd, alt : array terurut waktu
+    """
+    jd = np.concatenate(grid)
+    alt = elevation(ts.tt_jd(jd))
+
+    # Hanya sampel dengan kedua tetangga di jendela yang sama
+    interior = np.ones(len(jd), dtype=bool)
+    edges = np.cumsum([len(g) for g in grid])
+    interior[edges - 1] = False
+    interior[edges[:-1]] = False
+    interior[0] = False
+    interior = interior[1:-1]
+    middle = alt[1:-1]
+    peak = 1 + np.flatnonzero(interior & (middle >= alt[:-2]) & (middle >= alt[2:]) &
+                              (middle < min_elevation))
+
+    peak_jd, peak_alt = _refine_peaks(ts, jd[peak - 1], jd[peak + 1], elevation)
+    above = peak_alt >= min_elevation
+    if np.any(above):
+        jd = np.concatenate([jd, peak_jd[above]])
+        alt = np.concatenate([alt, peak_alt[above]])
+        order = np.argsort(jd, kind='stable')
+        jd, alt = jd[order], alt[order]
+
+    return jd, alt
+
+
+def _find_transitions(ts, jd, f, y=None, epsilon=TRANSITION_EPSILON_DAYS):
+    """
+    Waktu perubahan nilai f (fungsi diskret waktu) pada grid jd (TT), dengan
+    bisection yang divektorisasi untuk semua bracket sekaligus
+
+    y : nilai f pada grid jika sudah dihitung
+
+    Returns:
+    --------
+    times : skyfield Time (nilai baru berlaku mulai waktu ini)
+    events : array nilai baru
+    """
+    if y is None:
+        y = f(ts.tt_jd(jd))
+    index = np.flatnonzero(np.diff(y))
+    lo = jd[index]
+    hi = jd[index + 1]
+    y_lo = y[index]
+    y_hi = y[index + 1]
+
+    while len(lo) and np.max(hi - lo) > epsilon:
+        mid = (lo + hi) / 2.0
+        same = f(ts.tt_jd(mid)) == y_lo
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+
+    return ts.tt_jd(hi), y_hi
+
+
+def find_passes(satellite, observer_topos, ts, start_time, end_time, min_elevation=10,
+                prefilter=True):
+    """
+    Cari semua pass (AOS -> LOS) di atas min_elevation dalam [start_time, end_time]
+
+    Parameters:
+    -----------
+    satellite : EarthSatellite
+    observer_topos : wgs84.latlon
+    ts : Timescale
+    start_time, end_time : skyfield Time
+    prefilter : bool
+        True  = elevasi hanya disampel di dalam visibility_windows (step
+                pass_sample_step, puncak grazing dipertajam) lalu AOS/LOS
+                dicari dengan bisection; pass pendek yang terlewat oleh step
+                kasar find_discrete (1/20 periode) ikut terdeteksi. Jika
+                jendela menutupi lebih dari PREFILTER_MAX_COVERAGE rentang,
+                sama dengan False
+        False = almanac.find_discrete pada seluruh rentang (perilaku lama)
+
+    Returns:
+    --------
+    list dict: 'aos_time', 'los_time', 'max_alt_time', 'max_alt_degrees',
+    'max_azimuth_degrees', 'duration_minutes' (string, format /api/calculate-passes)
+    """
+    # Calculate orbital period for step size
+    # no_kozai: elemen epoch; nm ditimpa sgp4() thread lain pada objek bersama
+    mean_motion_rad_per_min = satellite.model.no_kozai
+    orbital_period_minutes = (2 * np.pi) / mean_motion_rad_per_min
+    orbital_period_days = orbital_period_minutes / (24 * 60)
+    step_days = orbital_period_days / 20.0
+
+    difference = satellite - observer_topos
+
+    def elevation(t):
+        alt, _, _ = difference.at(t).altaz()
+        return alt.degrees
+
+    def is_satellite_above_horizon(t):
+        return (elevation(t) >= min_elevation).astype(int)
+
+    is_satellite_above_horizon.step_days = step_days
+
+    windows = None
+    if prefilter:
+        windows = visibility_windows(satellite.model, observer_topos.latitude.degrees,
+                                     observer_topos.longitude.degrees, start_time, end_time,
+                                     min_elevation)
+        # Satelit hampir selalu dalam jangkauan (GEO/MEO): sampling jendela lebih mahal
+        if sum(hi - lo for lo, hi, _ in windows) > PREFILTER_MAX_COVERAGE * (end_time.tt -
+                                                                          start_time.tt):
+            windows = None
+
+    # Find passes
+    if windows is None:
+        times, events = almanac.find_discrete(start_time, end_time, is_satellite_above_horizon)
+    elif windows:
+        # Grid sampel hanya di dalam jendela kandidat; tepi jendela (kecuali awal/akhir
+        # pencarian) selalu di bawah horizon sehingga tidak ada transisi palsu antar jendela
+        grid = []
+        for lo, hi, radius in windows:
+            # Step per jendela: lebih rapat di dekat perigee orbit eksentrik
+            sample_days = pass_sample_step(satellite.model, min_elevation, radius)
+            grid.append(start_time.tt + np.linspace(lo, hi, int((hi - lo) / sample_days) + 2))
+        jd, alt = _sample_elevation(ts, grid, elevation, min_elevation)
+        times, events = _find_transitions(ts, jd, is_satellite_above_horizon,
+                                          y=(alt >= min_elevation).astype(int))
+    else:
+        times, events = [], []
+
+    # Process results: pasangkan AOS (1) -> LOS (0)
+    pairs = []
+    i = 0
+
+    if len(events) > 0 and events[0] == 0:
+        i = 1
+
+    while i < len(events) - 1:
+        if events[i] == 1:
+            if i + 1 < len(events) and events[i + 1] == 0:
+                pairs.append((times[i], times[i + 1]))
+                i += 2
+            else:
+                i += 1
+        else:
+            i += 1
+
+    if not pairs:
+        return []
+
+    # Find max altitude: 20 sampel per pass (sama dengan ts.linspace), dievaluasi sekaligus
+    whole = np.concatenate([np.linspace(aos.whole, los.whole, PASS_SAMPLES) for aos, los in pairs])
+    fraction = np.concatenate([np.linspace(aos.tt_fraction, los.tt_fraction, PASS_SAMPLES)
+                               for aos, los in pairs])
+    t_sample = ts.tt_jd(whole, fraction)
+    alt, az, _ = difference.at(t_sample).altaz()
+    alt_deg = alt.degrees.reshape(len(pairs), PASS_SAMPLES)
+    az_deg = az.degrees.reshape(len(pairs), PASS_SAMPLES)
+
+    passes = []
+    for k, (aos_time, los_time) in enumerate(pairs):
+        max_alt_index = np.argmax(alt_deg[k])
+        max_alt_time = t_sample[k * PASS_SAMPLES + max_alt_index]
+        max_alt_deg = alt_deg[k, max_alt_index]
+        max_az_deg = az_deg[k, max_alt_index]
+
+        # Calculate duration
+        pass_duration = (los_time.tt - aos_time.tt) * 24 * 60
+
+        passes.append({
+            'aos_time': aos_time.utc_strftime('%Y-%m-%d %H:%M:%S UTC'),
+            'los_time': los_time.utc_strftime('%Y-%m-%d %H:%M:%S UTC'),
+            'max_alt_time': max_alt_time.utc_strftime('%H:%M:%S UTC'),
+            'max_alt_degrees': f'{max_alt_deg:.2f}',
+            'max_azimuth_degrees': f'{max_az_deg:.2f}',
+            'duration_minutes': f'{pass_duration:.2f}'
+        })
+
+    return passes
+
+
+def skyfield_time(ts, value):
+    return ts.utc(value.year, value.month, value.day,
+                  value.hour, value.minute, value.second)
+
+
+def _init_worker():
+    get_context().warm()
+
+
+def _passes_task(task):
+    """Hitung pass untuk satu blok pasangan (satelit, station)"""
+    pairs, start_dt, end_dt, prefilter = task
+    ts = get_context().timescale
+    start_time = skyfield_time(ts, start_dt)
+    end_time = skyfield_time(ts, end_dt)
+
+    contacts = []
+    for sat_idx, sat, station_idx, station, min_elevation in pairs:
+        satellite = get_earth_satellite(sat['tle_line1'], sat['tle_line2'], sat['name'])
+        observer_topos = wgs84.latlon(
+            latitude_degrees=station['latitude'],
+            longitude_degrees=station['longitude'],
+            elevation_m=station['elevation']
+        )
+        for pass_info in find_passes(satellite, observer_topos, ts,
+                                     start_time, end_time, min_elevation, prefilter):
+            contacts.append(dict({
+                'satellite': sat['name'],
+                'satellite_index': sat_idx,
+                'station': station['name'],
+                'station_index': station_idx,
+                'min_elevation': min_elevation
+            }, **pass_info))
+    return contacts
+
+
+def pool_context():
+    """Context multiprocessing untuk pool (lihat POOL_START_METHODS)"""
+    available = multiprocessing.get_all_start_methods()
+    method = next(m for m in POOL_START_METHODS if m in available)
+    context = multiprocessing.get_context(method)
+    if method == 'forkserver':
+        context.set_forkserver_preload(POOL_PRELOAD_MODULES)
+    return context
+
+
+def get_pool(workers):
+    """
+    Process pool bersama (dibuat sekali per proses, worker tetap hangat).
+
+    Worker tidak di-fork dari proses pemanggil (lihat POOL_START_METHODS),
+    sehingga modul __main__ diimpor ulang di worker sebagai __mp_main__.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.terminate()
+            _pool = pool_context().Pool(workers, initializer=_init_worker)
+            _pool_workers = workers
+        return _pool
+
+
+def calculate_network_passes(satellites, stations, start_dt, search_duration_hours=24,
+                             min_elevation=10, workers=None, prefilter=True):
+    """
+    Pass semua satelit di atas semua ground station
+
+    Parameters:
+    -----------
+    satellites : list dict
+        'name', 'tle_line1', 'tle_line2'
+    stations : list dict
+        'name', 'latitude', 'longitude', 'elevation' (m), opsional
+        'min_elevation' (override min_elevation untuk station ini)
+    start_dt : datetime (UTC)
+    workers : int, optional
+        Jumlah proses (default: semua core); 1 = dijalankan di proses ini
+    prefilter : bool
+        Lihat find_passes
+
+    Returns:
+    --------
+    contacts : list dict
+        Data pass (format find_passes) ditambah 'satellite', 'satellite_index',
+        'station', 'station_index', 'min_elevation'; terurut berdasarkan AOS
+    stats : dict
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    end_dt = start_dt + timedelta(hours=search_duration_hours)
+
+    pairs = []
+    for sat_idx, sat in enumerate(satellites):
+        for station_idx, station in enumerate(stations):
+            pairs.append((sat_idx, sat, station_idx, station,
+                          float(station.get('min_elevation', min_elevation))))
+
+    # Pasangan dengan satelit yang sama berdekatan, jadi cache EarthSatellite worker terpakai
+    tasks = [(pairs[k:k + PAIRS_PER_TASK], start_dt, end_dt, prefilter)
+             for k in range(0, len(pairs), PAIRS_PER_TASK)]
+
+    if workers > 1 and len(tasks) > 1:
+        blocks = get_pool(workers).map(_passes_task, tasks)
+    else:
+        blocks = [_passes_task(task) for task in tasks]
+
+    contacts = [contact for block in blocks for contact in block]
+    # String waktu '%Y-%m-%d %H:%M:%S UTC' terurut secara leksikografis
+    contacts.sort(key=lambda c: (c['aos_time'], c['satellite_index'], c['station_index']))
+
+    return contacts, {
+        'satellites': len(satellites),
+        'stations': len(stations),
+        'pairs': len(pairs),
+        'workers': workers if len(tasks) > 1 else 1,
+        'elapsed_seconds': time.perf_counter() - started
+    }
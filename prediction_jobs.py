@@ -0,0 +1,209 @@
+"""
+Antrian job asinkron untuk prediksi collision yang lama
+=======================================================
+Prediksi dengan num_periods besar atau time_step kecil bisa berjalan lebih
+lama dari timeout proxy. Job dijalankan di thread pool lokal (tanpa broker
+eksternal): client submit, lalu polling status (termasuk progress = persen
+grid waktu yang sudah discreening) dan mengambil hasil setelah selesai.
+
+Job yang sedang berjalan dibatalkan secara kooperatif: callback progress
+melempar JobCancelled pada pemanggilan berikutnya. Job yang sudah selesai
+disimpan di memori sampai result_ttl detik atau sampai melebihi `keep`.
+Jumlah job yang belum selesai (antre + berjalan) dibatasi `max_pending`;
+submit di atas batas itu melempar JobQueueFull.
+
+Antrian ada di memori satu proses, jadi semua request job harus sampai ke
+proses yang sama (mis. gunicorn --workers 1 --threads N).
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Dilempar dari callback progress saat job dibatalkan"""
+
+
+class JobQueueFull(Exception):
+    """Dilempar dari submit saat job yang belum selesai mencapai max_pending"""
+
+
+class Job:
+    """Satu job beserta status, progress dan hasilnya"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = JOB_QUEUED
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    def report_progress(self, fraction):
+        """Callback progress untuk fungsi job (fraksi 0-1)"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.progress = max(self.progress, min(1.0, float(fraction)))
+
+    def to_dict(self):
+        """Status job tanpa hasil"""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': round(self.progress * 100.0, 1),
+            'created_at': _format_timestamp(self.created_at),
+            'started_at': _format_timestamp(self.started_at),
+            'finished_at': _format_timestamp(self.finished_at),
+            'elapsed_seconds': elapsed,
+            'error': self.error
+        }
+
+
+def _format_timestamp(value):
+    if value is None:
+        return None
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(value))
+
+
+class JobQueue:
+    """
+    Thread pool + registry job
+
+    Parameters:
+    -----------
+    max_workers : int
+        Jumlah job yang berjalan bersamaan
+    keep : int
+        Jumlah maksimum job yang disimpan (yang paling lama selesai dibuang dulu)
+    result_ttl : float
+        Umur (detik) hasil job yang sudah selesai sebelum dibuang
+    max_pending : int
+        Jumlah maksimum job yang belum selesai (antre + berjalan)
+    """
+
+    def __init__(self, max_workers=2, keep=200, result_ttl=3600, max_pending=20):
+        self.max_workers = max_workers
+        self.keep = keep
+        self.result_ttl = result_ttl
+        self.max_pending = max_pending
+        self.submitted = 0
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='prediction-job')
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Jadwalkan func(*args, progress=job.report_progress, **kwargs)
+
+        Returns:
+        --------
+        Job
+
+        Raises JobQueueFull jika sudah ada max_pending job yang belum selesai
+        """
+        job = Job(uuid.uuid4().hex)
+        with self._lock:
+            self._prune()
+            pending = sum(1 for other in self._jobs.values() if not other.finished)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f'Too many pending jobs (max {self.max_pending})')
+            self._jobs[job.id] = job
+            self.submitted += 1
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        with self._lock:
+            if job.status != JOB_QUEUED:
+                return
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+        if job._cancel.is_set():
+            self._finish(job, JOB_CANCELLED)
+            return
+        try:
+            result = func(*args, progress=job.report_progress, **kwargs)
+        except JobCancelled:
+            self._finish(job, JOB_CANCELLED)
+        except Exception as e:
+            self._finish(job, JOB_FAILED, error=str(e))
+        else:
+            job.progress = 1.0
+            self._finish(job, JOB_DONE, result=result)
+
+    def _finish(self, job, status, result=None, error=None):
+        with self._lock:
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            job.status = status
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Batalkan job (job yang masih antre langsung dibatalkan, job yang sedang
+        berjalan berhenti pada laporan progress berikutnya)
+
+        Returns:
+        --------
+        Job atau None jika tidak ditemukan
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job._cancel.set()
+            if job.status == JOB_QUEUED and job.future is not None and job.future.cancel():
+                job.status = JOB_CANCELLED
+                job.finished_at = time.time()
+        return job
+
+    def _prune(self):
+        """Buang job selesai yang kedaluwarsa / melebihi keep (dipanggil dengan lock)"""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        finished.sort(key=lambda job: job.finished_at)
+        excess = len(self._jobs) - self.keep + 1
+        for job in finished:
+            if now - job.finished_at > self.result_ttl or excess > 0:
+                del self._jobs[job.id]
+                excess -= 1
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'submitted': self.submitted,
+                'jobs': len(self._jobs),
+                'status': counts
+            }
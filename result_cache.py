@@ -0,0 +1,259 @@
+"""
+Cache hasil prediksi collision
+==============================
+Hasil /api/predict-collision di-cache berdasarkan TLE yang dinormalisasi,
+parameter prediksi, versi katalog debris dan epoch awal yang dikuantisasi
+(CACHE_EPOCH_QUANTUM_SECONDS). Karena prediksi dijalankan dari epoch yang
+sudah dikuantisasi, request yang sama dalam satu kuantum menghasilkan
+jawaban yang identik dan aman diambil dari cache.
+
+Backend dipilih dengan Config.CACHE_TYPE:
+    'simple'     : di memori proses (LRU + TTL)
+    'filesystem' : file JSON di CACHE_DIR (bisa dipakai bersama antar worker)
+    'null'       : tanpa cache
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+def normalize_tle_line(line):
+    """Hilangkan whitespace/CRLF di awal dan akhir baris TLE"""
+    return (line or '').strip()
+
+
+def quantize_epoch(value, quantum_seconds):
+    """Bulatkan datetime ke bawah ke kelipatan quantum_seconds (detik sejak epoch Unix)"""
+    if quantum_seconds <= 1:
+        return value.replace(microsecond=0)
+    epoch = datetime(1970, 1, 1)
+    seconds = int((value - epoch).total_seconds())
+    return datetime.utcfromtimestamp(seconds - seconds % int(quantum_seconds))
+
+
+def prediction_cache_key(tle_line1, tle_line2, catalog_version, start_time, **params):
+    """Key cache (sha256 hex) untuk satu request prediksi"""
+    payload = {
+        'tle': [normalize_tle_line(tle_line1), normalize_tle_line(tle_line2)],
+        'catalog': catalog_version,
+        'start': start_time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'params': params
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class BaseCache:
+    """Interface cache dengan counter hit/miss"""
+
+    backend = 'null'
+
+    def __init__(self, default_timeout=300, threshold=500):
+        self.default_timeout = default_timeout
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        self._count(False)
+        return None
+
+    def set(self, key, value, timeout=None):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+    def _expires_at(self, timeout):
+        timeout = self.default_timeout if timeout is None else timeout
+        return time.time() + timeout if timeout > 0 else None
+
+    def stats(self):
+        with self._stats_lock:
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        total = hits + misses
+        return {
+            'backend': self.backend,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'evictions': evictions,
+            'size': len(self),
+            'threshold': self.threshold,
+            'default_timeout': self.default_timeout
+        }
+
+
+class NullCache(BaseCache):
+    """Cache nonaktif (setiap get adalah miss)"""
+
+
+class MemoryCache(BaseCache):
+    """Cache di memori proses: LRU dengan batas jumlah entri + TTL per entri"""
+
+    backend = 'simple'
+
+    def __init__(self, default_timeout=300, threshold=500):
+        super().__init__(default_timeout, threshold)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self._count(True)
+                    return value
+                del self._entries[key]
+        self._count(False)
+        return None
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._entries[key] = (value, self._expires_at(timeout))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.threshold:
+                self._entries.popitem(last=False)
+                with self._stats_lock:
+                    self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class FileSystemCache(BaseCache):
+    """
+    Cache di disk lokal: satu file JSON per key di cache_dir. Penulisan atomik
+    (file sementara + os.replace) sehingga aman dipakai bersama oleh beberapa
+    worker. Jika jumlah file melebihi threshold, file yang paling lama tidak
+    diakses (mtime) dihapus.
+    """
+
+    backend = 'filesystem'
+    suffix = '.json'
+
+    def __init__(self, cache_dir, default_timeout=300, threshold=500):
+        super().__init__(default_timeout, threshold)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self.suffix)
+
+    def _files(self):
+        try:
+            return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                    if name.endswith(self.suffix)]
+        except OSError:
+            return []
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(False)
+            return None
+
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._count(False)
+            return None
+
+        # mtime = waktu akses terakhir untuk eviction LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(True)
+        return entry['value']
+
+    def set(self, key, value, timeout=None):
+        entry = {'expires_at': self._expires_at(timeout), 'value': value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._prune()
+
+    def _prune(self):
+        files = self._files()
+        excess = len(files) - self.threshold
+        if excess <= 0:
+            return
+
+        def mtime(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+
+        for path in sorted(files, key=mtime)[:excess]:
+            try:
+                os.remove(path)
+                with self._stats_lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+
+    def clear(self):
+        for path in self._files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._files())
+
+
+def create_cache(config):
+    """Buat backend cache dari config Flask (CACHE_TYPE, CACHE_DEFAULT_TIMEOUT, ...)"""
+    cache_type = config.get('CACHE_TYPE', 'simple')
+    timeout = config.get('CACHE_DEFAULT_TIMEOUT', 300)
+    threshold = config.get('CACHE_THRESHOLD', 500)
+
+    if cache_type == 'simple':
+        return MemoryCache(timeout, threshold)
+    if cache_type == 'filesystem':
+        return FileSystemCache(config['CACHE_DIR'], timeout, threshold)
+    if cache_type == 'null':
+        return NullCache(timeout, threshold)
+
+    raise ValueError(f"CACHE_TYPE tidak dikenal: {cache_type}")
@@ -0,0 +1,137 @@
+"""
+Posisi banyak satelit pada banyak waktu dalam satu request
+==========================================================
+Satelit diberikan sebagai TLE atau nomor katalog NORAD (dicari di katalog
+TLE.txt), lalu semuanya dipropagasi dengan satu panggilan SatrecArray untuk
+seluruh array waktu. Hasilnya berbentuk kolom (satelit x waktu), bukan
+satu objek per titik.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+from sgp4.api import SatrecArray, jday
+
+from astro_context import get_satrec
+from collision_prediction import propagate_catalog
+
+MAX_BATCH_SATELLITES = 2000
+MAX_BATCH_TIMES = 1440
+MAX_BATCH_POINTS = 500000
+
+
+class BatchRequestError(ValueError):
+    """Input batch tidak valid (dikembalikan sebagai HTTP 400)"""
+
+
+def parse_time_list(values):
+    """
+    Parse list waktu ISO 8601 (mis. '2025-10-05T14:00:00Z') menjadi datetime UTC
+    tanpa timezone. None/kosong = [sekarang].
+    """
+    if not values:
+        return [datetime.utcnow()]
+    if len(values) > MAX_BATCH_TIMES:
+        raise BatchRequestError(f'At most {MAX_BATCH_TIMES} times per request')
+
+    times = []
+    for value in values:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            raise BatchRequestError(f'Invalid time: {value}')
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        times.append(parsed)
+    return times
+
+
+def resolve_satellites(satellites=None, catalog_ids=None, catalog=None):
+    """
+    Gabungkan satelit dari TLE dan dari nomor katalog
+
+    Returns:
+    --------
+    satrecs : list Satrec
+    info : list dict ('name', 'satnum') sesuai urutan satrecs
+    """
+    satellites = satellites or []
+    catalog_ids = catalog_ids or []
+    if len(satellites) + len(catalog_ids) == 0:
+        raise BatchRequestError('satellites or catalog_ids required')
+    if len(satellites) + len(catalog_ids) > MAX_BATCH_SATELLITES:
+        raise BatchRequestError(f'At most {MAX_BATCH_SATELLITES} satellites per request')
+
+    satrecs = []
+    info = []
+
+    for k, sat in enumerate(satellites):
+        if not isinstance(sat, dict):
+            raise BatchRequestError(f'satellites[{k}] must be an object')
+        line1 = (sat.get('tle_line1') or '').strip()
+        line2 = (sat.get('tle_line2') or '').strip()
+        if not (line1.startswith('1 ') and line2.startswith('2 ')
+                and len(line1) >= 69 and len(line2) >= 69):
+            raise BatchRequestError(f'Invalid TLE at satellites[{k}]')
+        try:
+            satrec = get_satrec(line1, line2)
+        except ValueError:
+            raise BatchRequestError(f'Invalid TLE at satellites[{k}]')
+        satrecs.append(satrec)
+        info.append({'name': sat.get('name', ''), 'satnum': satrec.satnum})
+
+    if catalog_ids:
+        if catalog is None:
+            raise BatchRequestError('Satellite catalog not available')
+        try:
+            index = catalog.indices_for_satnums(catalog_ids)
+        except (TypeError, ValueError):
+            raise BatchRequestError('catalog_ids must be integers')
+        missing = [int(n) for n, k in zip(catalog_ids, index) if k < 0]
+        if missing:
+            raise BatchRequestError(f'Unknown catalog ids: {missing[:20]}')
+
+        catalog_satrecs = catalog.satrecs()
+        names = catalog.elements['name']
+        for k in index:
+            satrecs.append(catalog_satrecs[k])
+            info.append({'name': names[k].decode('ascii', 'replace'),
+                         'satnum': int(catalog.elements['satnum'][k])})
+
+    return satrecs, info
+
+
+def batch_positions(satrecs, times):
+    """
+    Propagasi semua satelit pada semua waktu dengan satu panggilan SatrecArray
+
+    Returns:
+    --------
+    dict berisi list bersarang (satelit x waktu): 'lat', 'lon', 'alt', 'x',
+    'y', 'z' (None jika propagasi gagal) dan 'valid'
+    """
+    if len(satrecs) * len(times) > MAX_BATCH_POINTS:
+        raise BatchRequestError(f'At most {MAX_BATCH_POINTS} satellite-time points per request')
+
+    jd = np.empty(len(times))
+    fr = np.empty(len(times))
+    for k, t in enumerate(times):
+        jd[k], fr[k] = jday(t.year, t.month, t.day, t.hour, t.minute,
+                            t.second + t.microsecond / 1e6)
+
+    state = propagate_catalog(SatrecArray(satrecs), jd, fr)
+
+    def column(values):
+        values = np.where(state['valid'], values, np.nan)
+        return [[None if v != v else v for v in row] for row in values.tolist()]
+
+    position = state['position']
+    return {
+        'lat': column(state['lat']),
+        'lon': column(state['lon']),
+        'alt': column(state['alt']),
+        'x': column(position[..., 0]),
+        'y': column(position[..., 1]),
+        'z': column(position[..., 2]),
+        'valid': state['valid'].tolist()
+    }
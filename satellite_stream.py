@@ -0,0 +1,128 @@
+"""
+Stream posisi satelit (Server-Sent Events)
+==========================================
+Pengganti polling /api/satellite-position: TLE diparse sekali per koneksi,
+posisi dipropagasi per chunk (satu panggilan sgp4_array untuk banyak tick)
+lalu dikirim satu per satu pada cadence yang dipilih client.
+
+Setiap event berisi JSON yang sama dengan response /api/satellite-position,
+sehingga client bisa memakai fungsi tampilan yang sama.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sgp4.api import jday
+
+from astro_context import get_satrec
+from collision_prediction import calculate_orbital_period, eci_to_latlon_array
+
+DEFAULT_STREAM_INTERVAL = 5
+MIN_STREAM_INTERVAL = 1
+MAX_STREAM_INTERVAL = 60
+
+# Umur koneksi default (detik); klien EventSource tersambung ulang setelahnya
+DEFAULT_STREAM_MAX_SECONDS = 120
+
+# Jumlah tick yang dipropagasi sekaligus
+EPHEMERIS_CHUNK = 60
+
+# Jeda reconnect (ms) yang disarankan ke EventSource
+SSE_RETRY_MS = 3000
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def clamp_interval(interval):
+    if interval is None:
+        return DEFAULT_STREAM_INTERVAL
+    return int(min(MAX_STREAM_INTERVAL, max(MIN_STREAM_INTERVAL, int(interval))))
+
+
+def sse_event(data, event=None):
+    """Format satu event SSE"""
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def ephemeris_chunk(satellite, start_time, interval_seconds, count):
+    """
+    Propagasi `count` tick mulai start_time dengan satu panggilan sgp4_array
+
+    Returns:
+    --------
+    times : list datetime
+    error : array (count,)
+    position : array (count, 3)
+    lat, lon, alt : array (count,)
+    """
+    times = [start_time + timedelta(seconds=i * interval_seconds) for i in range(count)]
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute, start_time.second)
+    offsets = np.arange(count) * interval_seconds / 86400.0
+
+    error, position, _ = satellite.sgp4_array(np.full(count, jd0), fr0 + offsets)
+    lat, lon, alt = eci_to_latlon_array(position[:, 0], position[:, 1], position[:, 2])
+
+    return times, error, position, lat, lon, alt
+
+
+def position_stream(tle_line1, tle_line2, interval_seconds=DEFAULT_STREAM_INTERVAL,
+                    max_seconds=DEFAULT_STREAM_MAX_SECONDS, clock=time.time, sleep=time.sleep):
+    """
+    Generator event SSE posisi satelit setiap interval_seconds (selaras detik
+    jam dinding) sampai max_seconds. Raises ValueError jika TLE tidak valid.
+    """
+    satellite = get_satrec(tle_line1, tle_line2)
+    period = calculate_orbital_period(tle_line1, tle_line2)
+
+    def generate():
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+
+        started = clock()
+        next_tick = int(started)
+        deadline = started + max_seconds
+
+        while next_tick <= deadline:
+            tick_time = _UNIX_EPOCH + timedelta(seconds=next_tick)
+            times, error, position, lat, lon, alt = ephemeris_chunk(
+                satellite, tick_time, interval_seconds, EPHEMERIS_CHUNK)
+
+            for i in range(EPHEMERIS_CHUNK):
+                tick = next_tick + i * interval_seconds
+                if tick > deadline:
+                    break
+
+                wait = tick - clock()
+                if wait > 0:
+                    sleep(wait)
+
+                if error[i] != 0:
+                    yield sse_event({'error': 'SGP4 propagation error'}, event='propagation_error')
+                    return
+
+                x, y, z = position[i].tolist()
+                yield sse_event({
+                    'success': True,
+                    'position': {
+                        'lat': float(lat[i]),
+                        'lon': float(lon[i]),
+                        'alt': float(alt[i]),
+                        'x': x,
+                        'y': y,
+                        'z': z
+                    },
+                    'orbital_period': period,
+                    'time': times[i].strftime('%Y-%m-%d %H:%M:%S')
+                })
+
+            next_tick += EPHEMERIS_CHUNK * interval_seconds
+
+        yield sse_event({'reason': 'max_duration'}, event='end')
+
+    return generate()
@@ -0,0 +1,117 @@
+"""
+Indeks spasial (KD-tree) untuk screening jarak satelit - debris
+================================================================
+Menggantikan loop bersarang O(N*M) di check_collision dengan query KD-tree
+per titik lintasan. Jarak akhir selalu dihitung ulang dengan rumus yang sama
+seperti collision_prediction.calculate_distance sehingga hasilnya identik
+(termasuk urutan debris dan pemilihan debris terdekat saat jarak sama).
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Toleransi relatif untuk kandidat dari KD-tree sebelum jarak dihitung ulang
+_TREE_RTOL = 1e-9
+_TREE_ATOL = 1e-9
+
+
+def exact_distance(points, positions):
+    """
+    Jarak Euclidean dengan urutan operasi yang sama seperti calculate_distance
+    (points - positions, dx**2 + dy**2 + dz**2, lalu sqrt)
+    """
+    d = np.asarray(points) - np.asarray(positions)
+    return np.sqrt(d[..., 0]**2 + d[..., 1]**2 + d[..., 2]**2)
+
+
+class DebrisIndex:
+    """
+    KD-tree atas posisi debris (x, y, z dalam km)
+
+    Parameters:
+    -----------
+    positions : array (M, 3)
+    """
+
+    def __init__(self, positions):
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        self.tree = cKDTree(self.positions) if len(self.positions) else None
+
+    @classmethod
+    def from_debris(cls, debris_positions):
+        """Bangun indeks dari list dict debris (format parse_debris_tle)"""
+        positions = np.array([[d['x'], d['y'], d['z']] for d in debris_positions],
+                             dtype=float).reshape(-1, 3)
+        return cls(positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _exact_ball(self, point, radius):
+        """Index (terurut) dan jarak eksak semua debris dalam radius (inklusif)"""
+        candidates = self.tree.query_ball_point(
+            point, radius * (1 + _TREE_RTOL) + _TREE_ATOL)
+        candidates = np.array(sorted(candidates), dtype=int)
+        distances = exact_distance(point, self.positions[candidates])
+        return candidates, distances
+
+    def query_within(self, points, threshold):
+        """
+        Cari semua debris dengan jarak < threshold untuk setiap titik
+
+        Returns:
+        --------
+        list berisi (indices, distances) per titik, indices terurut naik
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        empty = (np.empty(0, dtype=int), np.empty(0))
+        if self.tree is None or len(points) == 0:
+            return [empty] * len(points)
+
+        radius = threshold * (1 + _TREE_RTOL) + _TREE_ATOL
+        candidate_lists = self.tree.query_ball_point(points, radius)
+
+        results = []
+        for point, candidates in zip(points, candidate_lists):
+            if not candidates:
+                results.append(empty)
+                continue
+            candidates = np.array(sorted(candidates), dtype=int)
+            distances = exact_distance(point, self.positions[candidates])
+            inside = distances < threshold
+            results.append((candidates[inside], distances[inside]))
+
+        return results
+
+    def query_nearest(self, points):
+        """
+        Debris terdekat untuk setiap titik. Jika ada beberapa debris dengan
+        jarak sama, yang dipilih adalah index terkecil (sama seperti loop lama).
+
+        Returns:
+        --------
+        distances : array (N,)
+        indices : array (N,) int
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self.tree is None or len(points) == 0:
+            return np.full(len(points), np.inf), np.full(len(points), -1, dtype=int)
+
+        k = min(2, len(self.positions))
+        tree_dist, tree_idx = self.tree.query(points, k=k)
+        tree_dist = tree_dist.reshape(len(points), k)
+        tree_idx = tree_idx.reshape(len(points), k)
+
+        indices = tree_idx[:, 0].copy()
+        distances = exact_distance(points, self.positions[indices])
+
+        # Kandidat kedua hampir sama jauhnya: selesaikan dengan query radius
+        if k > 1:
+            ambiguous = tree_dist[:, 1] <= tree_dist[:, 0] * (1 + _TREE_RTOL) + _TREE_ATOL
+            for i in np.flatnonzero(ambiguous):
+                candidates, exact = self._exact_ball(points[i], tree_dist[i, 1])
+                best = np.argmin(exact)
+                indices[i] = candidates[best]
+                distances[i] = exact[best]
+
+        return distances, indices
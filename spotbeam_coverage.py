@@ -0,0 +1,166 @@
+"""
+Akumulasi area cakupan spotbeam secara inkremental
+==================================================
+Sebelumnya setiap frame menghitung unary_union(cakupan, strip) lalu luas
+geodesik seluruh union dihitung ulang, sehingga biaya per frame naik terus
+seiring bertambahnya geometri. Di sini:
+
+- strip dikumpulkan per batch lalu digabung dengan satu unary_union
+  (cascaded union GEOS = penggabungan bertingkat/tree),
+- cakupan disimpan per tile lon/lat, sehingga overlay hanya menyentuh
+  tile yang dilewati batch baru (ukuran geometrinya terbatas),
+- luas disimpan sebagai total berjalan: hanya luas bagian batch yang
+  belum tercakup (batch - cakupan tile) yang ditambahkan.
+
+Bagian strip di luar -180..180 (strip yang melewati antimeridian) digeser
+360 derajat ke tile di sisi lain peta, bukan dibuang, sehingga luasnya tetap
+dihitung dan overlap dengan cakupan di sisi tersebut tidak dihitung dua kali.
+"""
+
+import math
+
+from pyproj import Geod
+import shapely
+from shapely import affinity
+from shapely.geometry import Point, box
+from shapely.geometry.polygon import orient
+from shapely.ops import unary_union
+
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_TILE_DEG = 15.0
+
+# Jarak vertex tepi tile (derajat). Tepi polygon dihitung pyproj sebagai
+# geodesic, jadi garis potong tile dipadatkan agar dua tile yang bersebelahan
+# berbagi vertex yang sama dan luasnya saling meniadakan di garis potong.
+TILE_SEGMENT_DEG = 0.5
+
+
+def _polygons(geom):
+    """Semua Polygon di dalam geometri (garis/titik hasil overlay diabaikan)"""
+    if geom.is_empty:
+        return []
+    if geom.geom_type == 'Polygon':
+        return [geom]
+    if geom.geom_type in ('MultiPolygon', 'GeometryCollection'):
+        polys = []
+        for part in geom.geoms:
+            polys.extend(_polygons(part))
+        return polys
+    return []
+
+
+def geodesic_area_m2(geom, geod):
+    """Luas geodesik (m²) semua polygon, termasuk pengurangan hole"""
+    total = 0.0
+    for poly in _polygons(geom):
+        area, _ = geod.geometry_area_perimeter(orient(poly, 1.0))
+        total += abs(area)
+    return total
+
+
+class SpotbeamCoverage:
+    """
+    Union cakupan strip spotbeam dengan luas total berjalan
+
+    Parameters:
+    -----------
+    geod : pyproj.Geod
+        Ellipsoid untuk luas (default WGS84)
+    batch_size : int
+        Jumlah strip yang dikumpulkan sebelum digabung ke cakupan
+    tile_deg : float
+        Ukuran tile lon/lat (derajat) tempat cakupan disimpan; harus membagi 360
+    """
+
+    def __init__(self, geod=None, batch_size=DEFAULT_BATCH_SIZE, tile_deg=DEFAULT_TILE_DEG):
+        self.geod = geod or Geod(ellps="WGS84")
+        self.batch_size = max(1, int(batch_size))
+        self.tile_deg = float(tile_deg)
+        self._lon_tiles = int(round(360.0 / self.tile_deg))
+        if abs(self._lon_tiles * self.tile_deg - 360.0) > 1e-9:
+            raise ValueError('tile_deg must divide 360')
+        self.area_m2 = 0.0
+        self.strips = 0
+        self._pending = []
+        self._tiles = {}
+
+    @property
+    def area_km2(self):
+        """Luas cakupan (km²) sampai batch terakhir yang sudah digabung"""
+        return self.area_m2 / 1e6
+
+    @property
+    def is_empty(self):
+        return not self._tiles and not self._pending
+
+    def add(self, strip):
+        """Tambah satu strip; batch digabung otomatis setiap batch_size strip"""
+        if strip.is_empty:
+            return
+        self._pending.append(strip)
+        self.strips += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Gabungkan strip yang masih tertunda ke cakupan dan perbarui luas"""
+        if not self._pending:
+            return
+        batch = unary_union(self._pending)
+        self._pending = []
+        if not batch.is_valid:
+            batch = batch.buffer(0)
+
+        for key, cell, shift in self._tiles_for_bounds(batch.bounds):
+            piece = batch.intersection(cell)
+            if not _polygons(piece):
+                continue
+            if shift:
+                piece = affinity.translate(piece, xoff=-shift)
+            covered = self._tiles.get(key)
+            if covered is None:
+                added = piece
+                self._tiles[key] = piece
+            else:
+                added = piece.difference(covered)
+                if not _polygons(added):
+                    continue
+                self._tiles[key] = covered.union(piece)
+            self.area_m2 += geodesic_area_m2(added, self.geod)
+
+    def contains(self, point):
+        """True jika titik berada di dalam cakupan (termasuk strip tertunda)"""
+        shifted = [point, Point(point.x - 360.0, point.y), Point(point.x + 360.0, point.y)]
+        for strip in self._pending:
+            if any(strip.contains(p) for p in shifted):
+                return True
+        lon = (point.x + 180.0) % 360.0 - 180.0
+        covered = self._tiles.get(self._tile_key(lon, point.y))
+        return covered is not None and covered.contains(Point(lon, point.y))
+
+    def geometry(self):
+        """Union seluruh cakupan sebagai satu geometri (untuk plot/ekspor)"""
+        self.flush()
+        return unary_union(list(self._tiles.values()))
+
+    def _tile_key(self, lon, lat):
+        return (int(math.floor(lon / self.tile_deg)), int(math.floor(lat / self.tile_deg)))
+
+    def _tiles_for_bounds(self, bounds):
+        """
+        (key, box, shift) untuk semua tile yang disentuh bounds. Tile di luar
+        -180..180 dipetakan ke key tile yang sama di dalam peta; bagian batch di
+        dalam box harus digeser -shift derajat. Bagian di luar -90..90 dibuang.
+        """
+        min_lon, min_lat, max_lon, max_lat = bounds
+        i0, j0 = self._tile_key(min_lon, max(min_lat, -90.0))
+        i1, j1 = self._tile_key(max_lon, min(max_lat, 90.0 - 1e-9))
+        size = self.tile_deg
+        half = self._lon_tiles // 2
+        for i in range(i0, i1 + 1):
+            # Index tile kanonik di -180..180 dan jumlah putaran 360 derajat
+            turns = (i + half) // self._lon_tiles
+            key_i = i - turns * self._lon_tiles
+            for j in range(j0, j1 + 1):
+                cell = box(i * size, max(j * size, -90.0), (i + 1) * size, min((j + 1) * size, 90.0))
+                yield (key_i, j), shapely.segmentize(cell, TILE_SEGMENT_DEG), turns * 360.0
@@ -0,0 +1,404 @@
+"""
+Solver revisit spotbeam tanpa animasi (headless)
+================================================
+tlesatellite.py menjawab "kapan titik awal tercakup lagi" dengan menjalankan
+FuncAnimation (TkAgg, speedup 127, 200 ms per frame), sehingga satu jawaban
+butuh beberapa menit waktu nyata dan layar. Di sini ground track
+dipropagasi langsung dengan sgp4_array per chunk waktu:
+
+1. Jarak sudut sub-satellite point ke titik awal dihitung untuk semua
+   sampel sekaligus. Setelah satelit keluar dari swath titik awal, interval
+   sampel pertama yang masuk kembali ke swath (atau yang jarak minimumnya
+   mungkin masuk, lihat margin laju ground track) diperhalus dengan bisection
+   sampai REVISIT_TOLERANCE_SECONDS.
+2. Luas cakupan sampai waktu revisit (atau akhir simulasi) dihitung dengan
+   CoverageGrid (engine 'raster', default: grid equal-area, memori tetap)
+   atau dari strip polygon dengan SpotbeamCoverage (engine 'polygon').
+
+Swath didefinisikan dalam km: titik tercakup jika jarak great-circle ke
+sub-satellite point <= spotbeam_width_km / 2 (bumi bulat, seperti
+eci_to_latlon_array).
+
+Contoh:
+    python spotbeam_revisit.py --orbits 500 --width 2000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import shapely
+from sgp4.api import jday
+
+from astro_context import get_satrec
+from collision_prediction import EARTH_RADIUS, eci_to_latlon_array
+from coverage_grid import DEFAULT_CELL_KM, CoverageGrid
+from pass_prediction import EARTH_ROTATION_RATE, gmst_array
+from spotbeam_coverage import SpotbeamCoverage
+
+DEFAULT_SPOTBEAM_WIDTH_KM = 2000.0
+DEFAULT_MAX_ORBITS = 100
+
+# Step pencarian revisit dan step strip untuk luas cakupan (detik)
+REVISIT_STEP_SECONDS = 10.0
+AREA_STEP_SECONDS = 60.0
+
+# Engine 'raster': step sampel dan panjang jendela CoverageGrid (detik)
+RASTER_STEP_SECONDS = 20.0
+RASTER_WINDOW_SECONDS = 600.0
+
+COVERAGE_ENGINES = ('raster', 'polygon')
+
+# Toleransi waktu revisit hasil bisection (detik)
+REVISIT_TOLERANCE_SECONDS = 0.01
+
+# Jumlah sampel yang dipropagasi per panggilan sgp4_array
+CHUNK_SAMPLES = 8640
+
+# Jumlah sub-sampel untuk interval yang mungkin menyentuh tepi swath
+GRAZE_SUBSAMPLES = 32
+
+# cos(lat) minimum untuk lebar strip dalam derajat longitude (dekat kutub)
+MIN_STRIP_COS_LAT = 0.05
+
+KM_PER_DEGREE = EARTH_RADIUS * np.pi / 180.0
+
+# TLE default sama dengan tlesatellite.py
+DEFAULT_TLE = (
+    "EXPLORER 22",
+    "1 00899U 64064A   25276.49600160  .00000579  00000-0  49569-3 0  9991",
+    "2 00899  79.6909  47.8810 0120383 146.1380 214.7533 13.82947257 69497"
+)
+
+
+def orbital_period_seconds(satrec):
+    return 2 * np.pi / satrec.no_kozai * 60.0
+
+
+def ground_track_rate(satrec):
+    """Laju sudut maksimum sub-satellite point (rad/s): gerak orbit di perigee + rotasi bumi"""
+    mean_motion = satrec.no_kozai / 60.0
+    ecc = satrec.ecco
+    return mean_motion * (1 + ecc)**2 / (1 - ecc**2)**1.5 + EARTH_ROTATION_RATE
+
+
+def ground_track(satrec, jd0, fr0, offsets_seconds):
+    """
+    Sub-satellite point untuk array offset waktu (detik sejak jd0 + fr0)
+
+    Returns:
+    --------
+    lat, lon, alt : array (lon dalam -180..180; NaN jika propagasi gagal)
+    """
+    offsets = np.asarray(offsets_seconds, dtype=float) / 86400.0
+    error, position, _ = satrec.sgp4_array(np.full(len(offsets), jd0), fr0 + offsets)
+    position[error != 0] = np.nan
+
+    with np.errstate(invalid='ignore'):
+        lat, lon, alt = eci_to_latlon_array(position[:, 0], position[:, 1], position[:, 2])
+    lon = (lon - np.degrees(gmst_array(jd0 + fr0 + offsets)) + 180.0) % 360.0 - 180.0
+    return lat, lon, alt
+
+
+def central_angle(lat1, lon1, lat2, lon2):
+    """Jarak sudut great-circle (rad) antara titik-titik dalam derajat (haversine)"""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    h = (np.sin((lat2 - lat1) / 2)**2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2)
+    return 2 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def spotbeam_strips(lat, lon, spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM):
+    """
+    Strip (Polygon lon/lat) selebar spotbeam_width_km antara sampel ground
+    track berurutan. Segmen yang melewati antimeridian dibuka (unwrap) dan
+    salinannya digeser 360 derajat agar sisi lain peta juga tercakup.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    lat0, lat1 = lat[:-1], lat[1:]
+    lon0 = lon[:-1]
+    lon1 = lon0 + (lon[1:] - lon0 + 180.0) % 360.0 - 180.0
+
+    # Arah segmen dalam metrik lokal (derajat longitude diskalakan cos(lat))
+    cos_mid = np.cos(np.radians((lat0 + lat1) / 2))
+    dx = (lon1 - lon0) * cos_mid
+    dy = lat1 - lat0
+    length = np.hypot(dx, dy)
+    keep = np.isfinite(length) & (length > 0)
+    lat0, lat1, lon0, lon1 = lat0[keep], lat1[keep], lon0[keep], lon1[keep]
+    nx, ny = -dy[keep] / length[keep], dx[keep] / length[keep]
+
+    half_w = spotbeam_width_km / 2.0 / KM_PER_DEGREE
+    scale0 = half_w / np.maximum(np.cos(np.radians(lat0)), MIN_STRIP_COS_LAT)
+    scale1 = half_w / np.maximum(np.cos(np.radians(lat1)), MIN_STRIP_COS_LAT)
+
+    coords = np.empty((len(lat0), 4, 2))
+    coords[:, 0] = np.column_stack([lon0 + nx * scale0, lat0 + ny * half_w])
+    coords[:, 1] = np.column_stack([lon0 - nx * scale0, lat0 - ny * half_w])
+    coords[:, 2] = np.column_stack([lon1 - nx * scale1, lat1 - ny * half_w])
+    coords[:, 3] = np.column_stack([lon1 + nx * scale1, lat1 + ny * half_w])
+
+    shifted = [coords]
+    west = coords[:, :, 0].min(axis=1) < -180.0
+    east = coords[:, :, 0].max(axis=1) > 180.0
+    for mask, shift in ((west, 360.0), (east, -360.0)):
+        if mask.any():
+            copy = coords[mask].copy()
+            copy[:, :, 0] += shift
+            shifted.append(copy)
+    return list(shapely.polygons(np.concatenate(shifted)))
+
+
+class _StartPointAngle:
+    """Jarak sudut (rad) sub-satellite point ke titik awal sebagai fungsi offset (detik)"""
+
+    def __init__(self, satrec, jd0, fr0, lat, lon):
+        self.satrec = satrec
+        self.jd0 = jd0
+        self.fr0 = fr0
+        self.lat = lat
+        self.lon = lon
+
+    def __call__(self, offsets_seconds):
+        lat, lon, _ = ground_track(self.satrec, self.jd0, self.fr0, offsets_seconds)
+        return central_angle(self.lat, self.lon, lat, lon)
+
+
+def _entry_time(angle_at, t_lo, t_hi, half_angle, tolerance):
+    """
+    Waktu pertama dalam (t_lo, t_hi] saat angle_at <= half_angle (None jika
+    swath tidak tersentuh). t_lo harus di luar swath.
+    """
+    if not angle_at(np.array([t_hi]))[0] <= half_angle:
+        # Kedua ujung di luar: cek sub-sampel untuk lintasan yang menyerempet
+        sub = np.linspace(t_lo, t_hi, GRAZE_SUBSAMPLES + 1)
+        inside = np.flatnonzero(angle_at(sub) <= half_angle)
+        if not inside.size:
+            return None
+        t_lo, t_hi = sub[inside[0] - 1], sub[inside[0]]
+
+    while t_hi - t_lo > tolerance:
+        t_mid = 0.5 * (t_lo + t_hi)
+        if angle_at(np.array([t_mid]))[0] <= half_angle:
+            t_hi = t_mid
+        else:
+            t_lo = t_mid
+    return t_hi
+
+
+def find_revisit(satrec, jd0, fr0, max_seconds, spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM,
+                 step_seconds=REVISIT_STEP_SECONDS, tolerance=REVISIT_TOLERANCE_SECONDS):
+    """
+    Waktu (detik sejak jd0 + fr0) saat titik awal ground track masuk kembali
+    ke swath setelah pertama kali keluar
+
+    Returns:
+    --------
+    (revisit_seconds atau None, start_lat, start_lon)
+    """
+    start_lat, start_lon, _ = ground_track(satrec, jd0, fr0, [0.0])
+    start_lat, start_lon = float(start_lat[0]), float(start_lon[0])
+    if not np.isfinite(start_lat):
+        return None, None, None
+
+    angle_at = _StartPointAngle(satrec, jd0, fr0, start_lat, start_lon)
+    half_angle = spotbeam_width_km / 2.0 / EARTH_RADIUS
+    # Jarak minimum di antara dua sampel bisa lebih kecil dari kedua ujungnya
+    margin = ground_track_rate(satrec) * step_seconds / 2.0
+
+    left = False
+    chunk_start = 0.0
+    while chunk_start < max_seconds:
+        chunk_end = min(max_seconds, chunk_start + CHUNK_SAMPLES * step_seconds)
+        offsets = np.append(np.arange(chunk_start, chunk_end, step_seconds), chunk_end)
+        angle = angle_at(offsets)
+        inside = angle <= half_angle
+
+        first = 0
+        if not left:
+            outside = np.flatnonzero(~inside & np.isfinite(angle))
+            if not outside.size:
+                chunk_start = chunk_end
+                continue
+            left = True
+            first = outside[0]
+
+        before, after = angle[first:-1], angle[first + 1:]
+        candidate = ((after <= half_angle) |
+                     (np.minimum(before, after) - margin <= half_angle)) & (before > half_angle)
+        for k in np.flatnonzero(candidate) + first:
+            entry = _entry_time(angle_at, offsets[k], offsets[k + 1], half_angle, tolerance)
+            if entry is not None:
+                return entry, start_lat, start_lon
+
+        chunk_start = chunk_end
+
+    return None, start_lat, start_lon
+
+
+def accumulate_coverage(satrec, jd0, fr0, end_seconds, spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM,
+                        step_seconds=AREA_STEP_SECONDS, coverage=None):
+    """Tambahkan strip ground track [0, end_seconds] ke coverage (SpotbeamCoverage)"""
+    if coverage is None:
+        coverage = SpotbeamCoverage(batch_size=64)
+
+    chunk_start = 0.0
+    while chunk_start < end_seconds:
+        chunk_end = min(end_seconds, chunk_start + CHUNK_SAMPLES * step_seconds)
+        # Chunk saling berbagi satu sampel agar strip antar chunk tidak putus
+        offsets = np.append(np.arange(chunk_start, chunk_end, step_seconds), chunk_end)
+        lat, lon, _ = ground_track(satrec, jd0, fr0, offsets)
+        for strip in spotbeam_strips(lat, lon, spotbeam_width_km):
+            coverage.add(strip)
+        chunk_start = chunk_end
+
+    coverage.flush()
+    return coverage
+
+
+def accumulate_coverage_grid(satrec, jd0, fr0, end_seconds, spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM,
+                             step_seconds=RASTER_STEP_SECONDS, window_seconds=RASTER_WINDOW_SECONDS,
+                             grid=None, cell_km=DEFAULT_CELL_KM):
+    """
+    Rasterisasi swath [0, end_seconds] ke grid (CoverageGrid) per jendela
+    window_seconds; setiap sampel mencakup sel dalam spotbeam_width_km / 2.
+    Step diperkecil untuk swath sempit agar jarak antar sampel <= radius / 4
+    (lingkaran berurutan menyambung menjadi swath).
+    """
+    if grid is None:
+        grid = CoverageGrid(cell_km)
+    radius_km = spotbeam_width_km / 2.0
+    step_seconds = min(step_seconds, radius_km / EARTH_RADIUS / 4.0 / ground_track_rate(satrec))
+
+    samples_per_window = max(1, int(round(window_seconds / step_seconds)))
+    window = samples_per_window * step_seconds
+    chunk_windows = max(1, CHUNK_SAMPLES // samples_per_window)
+
+    chunk_start = 0.0
+    while chunk_start < end_seconds:
+        chunk_end = min(end_seconds, chunk_start + chunk_windows * window)
+        offsets = np.append(np.arange(chunk_start, chunk_end, step_seconds), chunk_end)
+        lat, lon, _ = ground_track(satrec, jd0, fr0, offsets)
+        for k in range(0, len(offsets) - 1, samples_per_window):
+            # Sampel akhir jendela = sampel awal jendela berikutnya
+            stop = k + samples_per_window + 1
+            grid.add_window(offsets[k], offsets[min(stop, len(offsets)) - 1],
+                            lat[k:stop], lon[k:stop], radius_km)
+        chunk_start = chunk_end
+
+    return grid
+
+
+def solve_revisit(satrec, start_time=None, spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM,
+                  max_orbits=DEFAULT_MAX_ORBITS, step_seconds=REVISIT_STEP_SECONDS,
+                  area_step_seconds=None, stop_at_revisit=True, compute_area=True,
+                  engine='raster', cell_km=DEFAULT_CELL_KM):
+    """
+    Revisit pertama titik awal dan luas cakupan spotbeam tanpa animasi
+
+    Parameters:
+    -----------
+    satrec : Satrec
+    start_time : datetime (UTC, default sekarang)
+    max_orbits : float
+        Batas simulasi dalam jumlah periode orbit
+    stop_at_revisit : bool
+        True: luas dihitung sampai revisit (seperti tlesatellite.py);
+        False: sampai max_orbits
+    compute_area : bool
+        False untuk hanya mencari waktu revisit
+    engine : str
+        'raster' (CoverageGrid, resolusi cell_km) atau 'polygon' (SpotbeamCoverage)
+    area_step_seconds : float
+        Step sampel ground track untuk luas (default per engine)
+
+    Returns:
+    --------
+    dict
+    """
+    if engine not in COVERAGE_ENGINES:
+        raise ValueError(f"engine must be one of {COVERAGE_ENGINES}")
+    if start_time is None:
+        start_time = datetime.utcnow()
+    jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                    start_time.hour, start_time.minute,
+                    start_time.second + start_time.microsecond / 1e6)
+
+    period = orbital_period_seconds(satrec)
+    max_seconds = max_orbits * period
+
+    started = time.time()
+    revisit, start_lat, start_lon = find_revisit(satrec, jd0, fr0, max_seconds,
+                                                 spotbeam_width_km, step_seconds)
+    revisit_elapsed = time.time() - started
+
+    end_seconds = revisit if (stop_at_revisit and revisit is not None) else max_seconds
+    area_km2 = None
+    if compute_area and start_lat is not None and engine == 'raster':
+        area_km2 = accumulate_coverage_grid(satrec, jd0, fr0, end_seconds, spotbeam_width_km,
+                                            area_step_seconds or RASTER_STEP_SECONDS,
+                                            cell_km=cell_km).covered_area_km2
+    elif compute_area and start_lat is not None:
+        area_km2 = accumulate_coverage(satrec, jd0, fr0, end_seconds, spotbeam_width_km,
+                                       area_step_seconds or AREA_STEP_SECONDS).area_km2
+
+    return {
+        'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'start_lat': start_lat,
+        'start_lon': start_lon,
+        'spotbeam_width_km': spotbeam_width_km,
+        'orbital_period_minutes': period / 60.0,
+        'revisit_found': revisit is not None,
+        'revisit_seconds': revisit,
+        'revisit_orbits': revisit / period if revisit is not None else None,
+        'revisit_time': ((start_time + timedelta(seconds=revisit)).strftime('%Y-%m-%d %H:%M:%S')
+                         if revisit is not None else None),
+        'simulated_seconds': end_seconds,
+        'coverage_area_km2': area_km2,
+        'coverage_engine': engine,
+        'revisit_compute_seconds': revisit_elapsed,
+        'total_compute_seconds': time.time() - started
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Revisit titik awal dan luas cakupan spotbeam (headless)')
+    parser.add_argument('--line1', help='TLE baris 1 (default EXPLORER 22 seperti tlesatellite.py)')
+    parser.add_argument('--line2', help='TLE baris 2')
+    parser.add_argument('--start', help='Waktu awal UTC (YYYY-MM-DDTHH:MM:SS), default sekarang')
+    parser.add_argument('--width', type=float, default=DEFAULT_SPOTBEAM_WIDTH_KM, help='Lebar spotbeam (km)')
+    parser.add_argument('--orbits', type=float, default=DEFAULT_MAX_ORBITS, help='Batas simulasi (orbit)')
+    parser.add_argument('--step', type=float, default=REVISIT_STEP_SECONDS, help='Step pencarian revisit (detik)')
+    parser.add_argument('--area-step', type=float, default=None, help='Step sampel luas (detik, default per engine)')
+    parser.add_argument('--engine', choices=COVERAGE_ENGINES, default='raster', help='Engine luas cakupan')
+    parser.add_argument('--cell', type=float, default=DEFAULT_CELL_KM, help='Ukuran sel grid raster (km)')
+    parser.add_argument('--full', action='store_true', help='Hitung luas sampai batas orbit, bukan sampai revisit')
+    args = parser.parse_args()
+
+    line1, line2 = args.line1 or DEFAULT_TLE[1], args.line2 or DEFAULT_TLE[2]
+    start_time = datetime.fromisoformat(args.start) if args.start else datetime.utcnow()
+
+    result = solve_revisit(get_satrec(line1, line2), start_time, args.width, args.orbits,
+                           args.step, args.area_step, stop_at_revisit=not args.full,
+                           engine=args.engine, cell_km=args.cell)
+
+    if result['start_lat'] is None:
+        print(f"[ERROR] Propagasi titik awal gagal ({result['start_time']} UTC)")
+        return
+    print(f"[INFO] Titik awal: lat={result['start_lat']:.2f}, lon={result['start_lon']:.2f} "
+          f"({result['start_time']} UTC)")
+    if result['revisit_found']:
+        print(f"[OK] Revisit: {result['revisit_time']} UTC "
+              f"(+{result['revisit_seconds']:.1f} detik, {result['revisit_orbits']:.2f} orbit)")
+    else:
+        print(f"[INFO] Titik awal tidak tercakup lagi dalam {args.orbits} orbit")
+    area = result['coverage_area_km2']
+    print(f"[OK] Cakupan spotbeam: {f'{area:.0f} km²' if area is not None else '-'} "
+          f"({result['simulated_seconds'] / 3600.0:.2f} jam simulasi)")
+    print(f"[OK] Selesai dalam {result['total_compute_seconds']:.2f} detik")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+Runner batch simulasi spotbeam untuk banyak satelit
+===================================================
+tlesatellite.py membuka spotbeam_data.csv (mode append) untuk setiap baris,
+berhenti setelah max_saves = 5 dan hanya untuk satu satelit hardcoded.
+Runner ini mensimulasikan banyak TLE tanpa animasi dan tanpa variabel
+global modul:
+
+- setiap satelit menghasilkan kolom bertipe (waktu, lat, lon, alt, luas
+  cakupan kumulatif) yang dibuffer di array NumPy, satu baris per
+  output_step_seconds, ditambah waktu revisit titik awal di dalam durasi run;
+- hasil per satelit langsung disimpan sebagai part (<output>.parts/*.npz,
+  ditulis atomik) sehingga run yang terhenti bisa dilanjutkan: satelit yang
+  part-nya sudah ada dilewati;
+- setelah semua satelit selesai, part digabung menjadi satu file .npz
+  kolumnar per run (lihat load_run); kolom ditulis bertahap per part
+  sehingga katalog penuh tidak perlu dimuat ke memori sekaligus.
+
+Satelit disimulasikan paralel di process pool bersama pass_prediction.
+
+Contoh:
+    python spotbeam_runner.py --limit 500 --hours 24 -o spotbeam_run.npz
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+import numpy as np
+from sgp4.api import jday
+
+from astro_context import get_satrec, tle_hash
+from collision_prediction import EARTH_RADIUS
+from coverage_grid import DEFAULT_CELL_KM, CoverageGrid
+from coverage_planner import _catalog_name, _satrec_for, select_satellites
+from pass_prediction import get_pool
+from spotbeam_revisit import (CHUNK_SAMPLES, DEFAULT_SPOTBEAM_WIDTH_KM, RASTER_STEP_SECONDS,
+                              find_revisit, ground_track, ground_track_rate)
+from tle_catalog import load_catalog
+
+RUN_FORMAT_VERSION = 1
+DEFAULT_RUN_HOURS = 24.0
+DEFAULT_OUTPUT_STEP_SECONDS = 60.0
+
+COLUMNS = ('time_utc', 'lat', 'lon', 'alt_km', 'area_km2')
+
+
+def simulate_satellite(satrec, jd0, fr0, duration_seconds,
+                       output_step_seconds=DEFAULT_OUTPUT_STEP_SECONDS,
+                       spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM, cell_km=DEFAULT_CELL_KM,
+                       grid=None):
+    """
+    Simulasi satu satelit: baris pada t = 0, step, 2*step, ..., duration
+
+    Returns:
+    --------
+    dict kolom: 'offset_seconds' (float64), 'lat', 'lon', 'alt_km' (float32),
+    'area_km2' (float64, luas cakupan kumulatif sampai baris tersebut)
+    """
+    radius_km = spotbeam_width_km / 2.0
+    raster_step = min(RASTER_STEP_SECONDS, output_step_seconds,
+                      radius_km / EARTH_RADIUS / 4.0 / ground_track_rate(satrec))
+    samples_per_row = int(np.ceil(output_step_seconds / raster_step))
+
+    row_offsets = np.append(np.arange(0.0, duration_seconds, output_step_seconds), duration_seconds)
+    n_rows = len(row_offsets)
+    lat_out = np.full(n_rows, np.nan, dtype=np.float32)
+    lon_out = np.full(n_rows, np.nan, dtype=np.float32)
+    alt_out = np.full(n_rows, np.nan, dtype=np.float32)
+    area_out = np.zeros(n_rows)
+
+    if grid is None:
+        grid = CoverageGrid(cell_km)
+
+    rows_per_chunk = max(1, CHUNK_SAMPLES // samples_per_row)
+    for first in range(0, n_rows, rows_per_chunk):
+        last = min(n_rows - 1, first + rows_per_chunk)
+        # Sampel raster dari baris first sampai last (baris last dipakai bersama chunk berikutnya)
+        segments = [np.linspace(row_offsets[k], row_offsets[k + 1], samples_per_row + 1)[:-1]
+                    for k in range(first, last)]
+        offsets = np.concatenate(segments + [row_offsets[last:last + 1]])
+        lat, lon, alt = ground_track(satrec, jd0, fr0, offsets)
+
+        row_sample = np.arange(last - first + 1) * samples_per_row
+        lat_out[first:last + 1] = lat[row_sample]
+        lon_out[first:last + 1] = lon[row_sample]
+        alt_out[first:last + 1] = alt[row_sample]
+
+        for k in range(first, last):
+            s = (k - first) * samples_per_row
+            grid.add_window(row_offsets[k], row_offsets[k + 1],
+                            lat[s:s + samples_per_row + 1], lon[s:s + samples_per_row + 1], radius_km)
+            area_out[k + 1] = grid.covered_area_km2
+
+    return {
+        'offset_seconds': row_offsets,
+        'lat': lat_out,
+        'lon': lon_out,
+        'alt_km': alt_out,
+        'area_km2': area_out
+    }
+
+
+def satellite_key(sat):
+    """Identitas satelit untuk nama file part (stabil antar run)"""
+    if 'catalog_index' in sat:
+        return f"{sat['satnum']}-c{sat['catalog_index']}"
+    return f"{sat['satnum']}-{tle_hash(sat['tle_line1'], sat['tle_line2'])[:12]}"
+
+
+def _save_npz_atomic(path, **arrays):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _simulate_task(task):
+    """Simulasikan satu satelit dan tulis part-nya (dijalankan di worker)"""
+    run_config, part_path, sat = task
+    started = time.perf_counter()
+    satrec = _satrec_for(sat, run_config['tle_file'])
+    jd0, fr0 = run_config['jd0'], run_config['fr0']
+
+    columns = simulate_satellite(satrec, jd0, fr0, run_config['duration_seconds'],
+                                 run_config['output_step_seconds'],
+                                 run_config['spotbeam_width_km'], run_config['cell_km'])
+    # Revisit titik awal hanya dicari di dalam durasi run (NaN jika tidak ada)
+    revisit, _, _ = find_revisit(satrec, jd0, fr0, run_config['duration_seconds'],
+                                 run_config['spotbeam_width_km'])
+
+    _save_npz_atomic(part_path, revisit_seconds=np.float64(np.nan if revisit is None else revisit),
+                     **columns)
+    return len(columns['offset_seconds']), time.perf_counter() - started
+
+
+class SpotbeamRun:
+    """
+    Satu run batch: konfigurasi, part per satelit dan file hasil
+
+    Parameters:
+    -----------
+    output_path : str
+        File hasil .npz; part disimpan di output_path + '.parts'
+    start_time : datetime (UTC)
+    duration_hours, output_step_seconds, spotbeam_width_km, cell_km : float
+    tle_file : str
+        Katalog untuk satelit yang dipilih dari TLE.txt (catalog_index)
+    """
+
+    def __init__(self, output_path, start_time, duration_hours=DEFAULT_RUN_HOURS,
+                 output_step_seconds=DEFAULT_OUTPUT_STEP_SECONDS,
+                 spotbeam_width_km=DEFAULT_SPOTBEAM_WIDTH_KM, cell_km=DEFAULT_CELL_KM,
+                 tle_file='TLE.txt'):
+        if duration_hours <= 0 or output_step_seconds <= 0 or spotbeam_width_km <= 0 or cell_km <= 0:
+            raise ValueError('duration_hours, output_step_seconds, spotbeam_width_km and cell_km must be positive')
+        self.output_path = output_path
+        self.parts_dir = output_path + '.parts'
+        self.start_time = start_time
+        jd0, fr0 = jday(start_time.year, start_time.month, start_time.day,
+                        start_time.hour, start_time.minute,
+                        start_time.second + start_time.microsecond / 1e6)
+        self.config = {
+            'version': RUN_FORMAT_VERSION,
+            'start_time': start_time.isoformat(),
+            'jd0': jd0,
+            'fr0': fr0,
+            'duration_seconds': duration_hours * 3600.0,
+            'output_step_seconds': float(output_step_seconds),
+            'spotbeam_width_km': float(spotbeam_width_km),
+            'cell_km': float(cell_km),
+            'tle_file': os.path.abspath(tle_file),
+            'catalog_version': None
+        }
+
+    def part_path(self, sat):
+        return os.path.join(self.parts_dir, satellite_key(sat) + '.npz')
+
+    def _prepare(self, satellites, resume):
+        """Buat direktori part atau cek bahwa run lama memakai konfigurasi yang sama"""
+        if any('catalog_index' in sat for sat in satellites):
+            self.config['catalog_version'] = load_catalog(self.config['tle_file']).version
+
+        config_path = os.path.join(self.parts_dir, 'run.json')
+        if os.path.isdir(self.parts_dir) and not resume:
+            shutil.rmtree(self.parts_dir)
+        os.makedirs(self.parts_dir, exist_ok=True)
+
+        if os.path.exists(config_path):
+            with open(config_path) as f:
+                previous = json.load(f)
+            if previous != json.loads(json.dumps(self.config)):
+                raise ValueError(f'{self.parts_dir} belongs to a run with a different configuration '
+                                 f'(use resume=False / --restart to start over)')
+        else:
+            with open(config_path, 'w') as f:
+                json.dump(self.config, f, indent=2)
+
+    def pending(self, satellites):
+        return [sat for sat in satellites if not os.path.exists(self.part_path(sat))]
+
+    def run(self, satellites, workers=None, resume=True, assemble=True, log=print):
+        """
+        Simulasikan semua satelit yang belum punya part, lalu gabungkan hasilnya
+
+        Parameters:
+        -----------
+        satellites : list dict
+            {'name', 'satnum', 'catalog_index'} (select_satellites / catalog_satellites)
+            atau {'name', 'tle_line1', 'tle_line2'}
+        workers : int, optional
+            Jumlah proses (default: semua core); 1 = dijalankan di proses ini
+        resume : bool
+            False: hapus part run sebelumnya
+
+        Returns:
+        --------
+        dict statistik run
+        """
+        started = time.perf_counter()
+        satellites = [self._with_satnum(sat) for sat in satellites]
+        if len({satellite_key(sat) for sat in satellites}) != len(satellites):
+            raise ValueError('Duplicate satellites in run')
+
+        self._prepare(satellites, resume)
+        todo = self.pending(satellites)
+        skipped = len(satellites) - len(todo)
+        if skipped and log:
+            log(f"[INFO] Melanjutkan run: {skipped} satelit sudah selesai, {len(todo)} tersisa")
+
+        workers = workers or os.cpu_count() or 1
+        tasks = [(self.config, self.part_path(sat), sat) for sat in todo]
+        if workers > 1 and len(tasks) > 1:
+            results = get_pool(workers).imap_unordered(_simulate_task, tasks)
+        else:
+            results = map(_simulate_task, tasks)
+
+        rows = 0
+        for done, (n_rows, _) in enumerate(results, 1):
+            rows += n_rows
+            if log and (done % 50 == 0 or done == len(tasks)):
+                log(f"[INFO] {done}/{len(tasks)} satelit selesai")
+
+        if assemble:
+            self.assemble(satellites)
+
+        return {
+            'satellites': len(satellites),
+            'simulated': len(todo),
+            'skipped': skipped,
+            'rows': rows,
+            'workers': workers if len(tasks) > 1 else 1,
+            'elapsed_seconds': time.perf_counter() - started
+        }
+
+    @staticmethod
+    def _with_satnum(sat):
+        if 'satnum' in sat or 'catalog_index' in sat:
+            return sat
+        return dict(sat, satnum=get_satrec(sat['tle_line1'], sat['tle_line2']).satnum)
+
+    def assemble(self, satellites, keep_parts=False):
+        """
+        Gabungkan part semua satelit menjadi satu file .npz kolumnar
+
+        Kolom ditulis bertahap ke file .npy (np.lib.format.open_memmap) yang
+        dialokasikan dari jumlah baris per part, satu part dibaca per langkah,
+        lalu file .npy disimpan ke arsip .npz (format np.savez, tanpa
+        kompresi). Memori tidak bergantung pada jumlah satelit.
+        """
+        missing = self.pending(satellites)
+        if missing:
+            raise ValueError(f'{len(missing)} satellites have no result yet')
+
+        counts = np.zeros(len(satellites), dtype=np.int64)
+        dtypes = {}
+        for k, sat in enumerate(satellites):
+            with np.load(self.part_path(sat)) as part:
+                counts[k] = len(part['offset_seconds'])
+                if not dtypes:
+                    dtypes = {name: part[name].dtype for name in COLUMNS[1:]}
+        row_offsets = np.concatenate([[0], np.cumsum(counts)])
+        dtypes['time_utc'] = np.dtype('datetime64[ms]')
+        start = np.datetime64(self.start_time.replace(tzinfo=None), 'ms')
+
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        work_dir = tempfile.mkdtemp(dir=directory, suffix='.tmp')
+        try:
+            def npy_path(name):
+                return os.path.join(work_dir, name + '.npy')
+
+            columns = {name: np.lib.format.open_memmap(npy_path(name), mode='w+', dtype=dtypes[name],
+                                                       shape=(int(row_offsets[-1]),))
+                       for name in COLUMNS}
+            revisit = np.zeros(len(satellites))
+            for k, sat in enumerate(satellites):
+                lo, hi = row_offsets[k], row_offsets[k + 1]
+                with np.load(self.part_path(sat)) as part:
+                    offsets_ms = part['offset_seconds'] * 1000.0
+                    columns['time_utc'][lo:hi] = start + np.round(offsets_ms).astype('timedelta64[ms]')
+                    for name in COLUMNS[1:]:
+                        columns[name][lo:hi] = part[name]
+                    revisit[k] = float(part['revisit_seconds'])
+            for column in columns.values():
+                column.flush()
+            del columns
+
+            small = {
+                'name': np.array([sat.get('name') or '' for sat in satellites]),
+                'satnum': np.array([sat['satnum'] for sat in satellites], dtype=np.int64),
+                'revisit_seconds': revisit,
+                'row_offsets': row_offsets,
+                'config': np.array(json.dumps(self.config))
+            }
+            for name, array in small.items():
+                np.save(npy_path(name), array)
+
+            # Urutan member sama seperti np.savez sebelumnya
+            names = ('name', 'satnum', 'revisit_seconds', 'row_offsets') + COLUMNS + ('config',)
+            tmp_path = os.path.join(work_dir, 'run.npz')
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for name in names:
+                    archive.write(npy_path(name), name + '.npy')
+            os.replace(tmp_path, self.output_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if not keep_parts:
+            shutil.rmtree(self.parts_dir)
+        return self.output_path
+
+
+def load_run(path):
+    """
+    Baca file hasil run
+
+    Returns:
+    --------
+    dict array; baris satelit k = row_offsets[k]:row_offsets[k + 1] pada
+    kolom COLUMNS, dan 'config' sebagai dict
+    """
+    with np.load(path) as data:
+        result = {name: data[name] for name in data.files}
+    result['config'] = json.loads(str(result['config']))
+    return result
+
+
+def satellite_rows(run, k):
+    """Kolom COLUMNS untuk satelit ke-k dari hasil load_run"""
+    lo, hi = run['row_offsets'][k], run['row_offsets'][k + 1]
+    return {name: run[name][lo:hi] for name in COLUMNS}
+
+
+def catalog_satellites(tle_file, names=None, norad_ids=None, limit=None):
+    """Satelit dari katalog: berdasarkan nama/NORAD, atau seluruh katalog (opsional limit)"""
+    if names or norad_ids:
+        satellites = select_satellites(tle_file, names, norad_ids)
+        return satellites[:limit] if limit is not None else satellites
+
+    catalog = load_catalog(tle_file)
+    count = len(catalog) if limit is None else min(limit, len(catalog))
+    names_all = catalog.names
+    return [{'name': _catalog_name(names_all[k]),
+             'satnum': int(catalog.elements['satnum'][k]),
+             'catalog_index': k} for k in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulasi spotbeam batch untuk banyak satelit')
+    parser.add_argument('--tle-file', default='TLE.txt')
+    parser.add_argument('--names', nargs='*', default=[], help='Nama satelit di file TLE')
+    parser.add_argument('--norad', nargs='*', type=int, default=[], help='Nomor katalog NORAD')
+    parser.add_argument('--limit', type=int, default=None, help='Jumlah satelit maksimum')
+    parser.add_argument('--start', help='Waktu awal UTC (YYYY-MM-DDTHH:MM:SS), default sekarang')
+    parser.add_argument('--hours', type=float, default=DEFAULT_RUN_HOURS, help='Panjang simulasi (jam)')
+    parser.add_argument('--step', type=float, default=DEFAULT_OUTPUT_STEP_SECONDS, help='Step baris output (detik)')
+    parser.add_argument('--width', type=float, default=DEFAULT_SPOTBEAM_WIDTH_KM, help='Lebar spotbeam (km)')
+    parser.add_argument('--cell', type=float, default=DEFAULT_CELL_KM, help='Ukuran sel grid (km)')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah proses (default: semua core)')
+    parser.add_argument('--restart', action='store_true', help='Abaikan part run sebelumnya')
+    parser.add_argument('-o', '--output', default='spotbeam_run.npz', help='File hasil (.npz)')
+    args = parser.parse_args()
+
+    parts_config = os.path.join(args.output + '.parts', 'run.json')
+    if args.start:
+        start_time = datetime.fromisoformat(args.start)
+    elif os.path.exists(parts_config) and not args.restart:
+        # Lanjutkan run yang terhenti dengan waktu awal yang sama
+        with open(parts_config) as f:
+            start_time = datetime.fromisoformat(json.load(f)['start_time'])
+    else:
+        start_time = datetime.utcnow().replace(microsecond=0)
+
+    satellites = catalog_satellites(args.tle_file, args.names, args.norad, args.limit)
+    run = SpotbeamRun(args.output, start_time, args.hours, args.step, args.width, args.cell,
+                      args.tle_file)
+
+    print(f"[INFO] {len(satellites)} satelit, {args.hours} jam mulai {start_time} UTC, "
+          f"step {args.step} detik")
+    try:
+        stats = run.run(satellites, args.workers, resume=not args.restart)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"[OK] {stats['simulated']} disimulasikan, {stats['skipped']} dilanjutkan dari part, "
+          f"{stats['workers']} worker")
+    print(f"[OK] Selesai dalam {stats['elapsed_seconds']:.1f} detik -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
  */
 
 let leafletMapInstance = null;
+let debrisMapObjectUrl = null;
 
 const categoryNames = {
     '0': '160-528 km',
@@ -19,18 +20,24 @@ async function loadDebrisMap() {
     showLoading();
     
     try {
-        // Load map image
+        // Load map image (raw PNG, debris count in response header)
         const mapResponse = await fetch(`/api/debris-map?category=${category}`);
-        const mapData = await mapResponse.json();
         
-        if (mapData.success) {
+        if (mapResponse.ok) {
+            const debrisCount = parseInt(mapResponse.headers.get('X-Debris-Count'), 10);
+            const mapBlob = await mapResponse.blob();
+            
             // Display map image
+            if (debrisMapObjectUrl) {
+                URL.revokeObjectURL(debrisMapObjectUrl);
+            }
+            debrisMapObjectUrl = URL.createObjectURL(mapBlob);
             document.getElementById('mapContainer').style.display = 'block';
-            document.getElementById('debrisMapImage').src = mapData.image;
+            document.getElementById('debrisMapImage').src = debrisMapObjectUrl;
             
             // Update statistics
             document.getElementById('debrisStats').style.display = 'flex';
-            document.getElementById('debrisCount').textContent = mapData.count.toLocaleString();
+            document.getElementById('debrisCount').textContent = debrisCount.toLocaleString();
             document.getElementById('categoryName').textContent = categoryNames[category];
             
             // Determine density based on category
@@ -52,8 +59,9 @@ async function loadDebrisMap() {
             // Load interactive map data
             await loadInteractiveMap(category);
             
-            showAlert(`Loaded ${mapData.count} debris objects`, 'success');
+            showAlert(`Loaded ${debrisCount} debris objects`, 'success');
         } else {
+            const mapData = await mapResponse.json();
             showAlert('Error: ' + mapData.error, 'danger');
         }
     } catch (error) {
@@ -63,12 +71,40 @@ async function loadDebrisMap() {
     }
 }
 
+/**
+ * Decode the binary /api/debris-data format (little-endian):
+ * 24-byte header (magic "DEBR", version, count, snapshot time),
+ * then float32 lat, lon, alt arrays and a uint8 category array.
+ */
+function decodeDebrisColumns(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3));
+    if (magic !== 'DEBR') {
+        throw new Error('Invalid debris data format');
+    }
+    const count = view.getUint32(8, true);
+    const offset = 24;
+    return {
+        count: count,
+        snapshotTime: new Date(view.getFloat64(16, true) * 1000),
+        lat: new Float32Array(buffer, offset, count),
+        lon: new Float32Array(buffer, offset + 4 * count, count),
+        alt: new Float32Array(buffer, offset + 8 * count, count),
+        category: new Uint8Array(buffer, offset + 12 * count, count)
+    };
+}
+
 async function loadInteractiveMap(category) {
     try {
-        const response = await fetch(`/api/debris-data?category=${category}`);
-        const data = await response.json();
+        const response = await fetch(`/api/debris-data?category=${category}`, {
+            headers: { 'Accept': 'application/octet-stream' }
+        });
+        if (!response.ok) {
+            return;
+        }
+        const data = decodeDebrisColumns(await response.arrayBuffer());
         
-        if (data.success && data.debris.length > 0) {
+        if (data.count > 0) {
             document.getElementById('interactiveMap').style.display = 'block';
             
             // Initialize or clear map
@@ -84,13 +120,20 @@ async function loadInteractiveMap(category) {
                 maxZoom: 18
             }).addTo(leafletMapInstance);
             
+            // Debris overlay for the whole catalog (server-rendered tiles)
+            L.tileLayer(`/api/debris-tiles/{z}/{x}/{y}.png?category=${category}`, {
+                maxZoom: 12,
+                opacity: 0.9
+            }).addTo(leafletMapInstance);
+            
             // Add debris markers (limit to 500 for performance)
-            const debrisToShow = data.debris.slice(0, 500);
+            const markerCount = Math.min(500, data.count);
             
-            debrisToShow.forEach(debris => {
-                const marker = L.circleMarker([debris.lat, debris.lon], {
+            for (let i = 0; i < markerCount; i++) {
+                const alt = data.alt[i];
+                const marker = L.circleMarker([data.lat[i], data.lon[i]], {
                     radius: 3,
-                    fillColor: getColorForAltitude(debris.alt),
+                    fillColor: getColorForAltitude(alt),
                     color: '#000',
                     weight: 0.5,
                     opacity: 0.8,
@@ -99,17 +142,17 @@ async function loadInteractiveMap(category) {
                 
                 marker.bindPopup(`
                     <strong>Debris Object</strong><br>
-                    Altitude: ${debris.alt.toFixed(2)} km<br>
-                    Category: ${debris.category}<br>
-                    Lat: ${debris.lat.toFixed(2)}°<br>
-                    Lon: ${debris.lon.toFixed(2)}°
+                    Altitude: ${alt.toFixed(2)} km<br>
+                    Category: ${categoryNames[data.category[i]] || 'Out of range'}<br>
+                    Lat: ${data.lat[i].toFixed(2)}°<br>
+                    Lon: ${data.lon[i].toFixed(2)}°
                 `);
                 
                 marker.addTo(leafletMapInstance);
-            });
+            }
             
-            if (debrisToShow.length < data.count) {
-                showAlert(`Showing ${debrisToShow.length} of ${data.count} debris objects on interactive map`, 'info');
+            if (markerCount < data.count) {
+                showAlert(`Showing ${markerCount} of ${data.count} debris objects as markers (all objects are drawn in the overlay)`, 'info');
             }
         }
     } catch (error) {
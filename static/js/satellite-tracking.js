@@ -4,7 +4,7 @@
 
 let trackingMapInstance = null;
 let satelliteMarker = null;
-let autoUpdateInterval = null;
+let positionStream = null;
 let currentTLE = { line1: '', line2: '' };
 
 function loadExampleTLE() {
@@ -37,6 +37,12 @@ async function startTracking() {
     
     await updateSatellitePosition();
     
+    // Restart the live stream with the new TLE
+    if (positionStream) {
+        stopPositionStream();
+        openPositionStream();
+    }
+    
     // Enable auto-update button
     const autoBtn = document.getElementById('autoUpdateBtn');
     if (autoBtn) {
@@ -147,20 +153,44 @@ function displayPosition(data) {
     }
 }
 
+function stopPositionStream() {
+    if (positionStream) {
+        positionStream.close();
+        positionStream = null;
+    }
+}
+
+function openPositionStream() {
+    const params = new URLSearchParams({
+        tle_line1: currentTLE.line1,
+        tle_line2: currentTLE.line2,
+        interval: 5
+    });
+    positionStream = new EventSource(`/api/satellite-position/stream?${params}`);
+    
+    positionStream.onmessage = function(event) {
+        displayPosition(JSON.parse(event.data));
+    };
+    
+    positionStream.addEventListener('propagation_error', function(event) {
+        stopPositionStream();
+        showAlert('Error: ' + JSON.parse(event.data).error, 'danger');
+    });
+}
+
 function toggleAutoUpdate() {
     const btn = document.getElementById('autoUpdateBtn');
     
-    if (autoUpdateInterval) {
+    if (positionStream) {
         // Stop auto-update
-        clearInterval(autoUpdateInterval);
-        autoUpdateInterval = null;
+        stopPositionStream();
         btn.innerHTML = '<i class="fas fa-sync-alt"></i> Auto Update: OFF';
         btn.classList.remove('btn-danger');
         btn.classList.add('btn-success');
         showAlert('Auto-update stopped', 'info');
     } else {
-        // Start auto-update (every 5 seconds)
-        autoUpdateInterval = setInterval(updateSatellitePosition, 5000);
+        // Start auto-update: server pushes a position every 5 seconds over one connection
+        openPositionStream();
         btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Auto Update: ON';
         btn.classList.remove('btn-success');
         btn.classList.add('btn-danger');
@@ -170,7 +200,5 @@ function toggleAutoUpdate() {
 
 // Cleanup on page unload
 window.addEventListener('beforeunload', function() {
-    if (autoUpdateInterval) {
-        clearInterval(autoUpdateInterval);
-    }
+    stopPositionStream();
 });
@@ -0,0 +1,73 @@
+"""
+Test screening konjungsi all-vs-all (catalog_screening) terhadap jarak
+pasangan brute-force (pdist pada sampling 2 detik) untuk subset tetap
+FENGYUN debris.txt
+"""
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+from scipy.spatial.distance import pdist
+from sgp4.api import SatrecArray
+
+from catalog_screening import screen_catalog
+from conjunction_screening import build_time_grid
+from tle_catalog import load_catalog
+
+START_TIME = datetime(2025, 10, 5)
+DEBRIS_FILE = 'FENGYUN debris.txt'
+SUBSET_SIZE = 300
+DURATION_MINUTES = 120.0
+THRESHOLD_KM = 50.0
+REFERENCE_STEP_SECONDS = 2.0
+
+
+def _write_subset(directory):
+    with open(DEBRIS_FILE) as f:
+        lines = [line.rstrip('\r\n') for line in f if line.strip()]
+    path = os.path.join(directory, 'subset.txt')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines[:3 * SUBSET_SIZE]) + '\n')
+    return path
+
+
+def _brute_force_pairs(path):
+    """Jarak minimum tersampel per pasangan (i < j), urutan seperti pdist"""
+    satrecs = load_catalog(path).satrecs()
+    count = len(satrecs)
+    num_steps = int(DURATION_MINUTES * 60 / REFERENCE_STEP_SECONDS) + 1
+    jd, fr, _ = build_time_grid(START_TIME, num_steps, REFERENCE_STEP_SECONDS / 60.0)
+    errors, positions, _ = SatrecArray(satrecs).sgp4(jd, fr)
+
+    upper = np.triu_indices(count, 1)
+    best = np.full(len(upper[0]), np.inf)
+    for k in range(num_steps):
+        distance = pdist(positions[:, k])
+        failed = errors[:, k] != 0
+        distance[failed[upper[0]] | failed[upper[1]]] = np.inf
+        np.minimum(best, distance, out=best)
+    return {(int(i), int(j)): d for i, j, d in zip(upper[0], upper[1], best)}
+
+
+def test_catalog_screening_matches_brute_force():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write_subset(directory)
+        table, _ = screen_catalog(path, START_TIME, DURATION_MINUTES, threshold=THRESHOLD_KM,
+                                  workers=1)
+        reference = _brute_force_pairs(path)
+
+    reported = {}
+    for row in table:
+        key = tuple(sorted((int(row['primary_index']), int(row['secondary_index']))))
+        reported[key] = min(reported.get(key, np.inf), float(row['miss_distance_km']))
+        # Konjungsi nyata: sampel 2 detik paling jauh v_rel * 1 detik dari TCA
+        slack = float(row['relative_speed_km_s']) * REFERENCE_STEP_SECONDS / 2.0
+        assert reference[key] <= THRESHOLD_KM + slack + 1e-6, (key, reference[key])
+
+    close = {key: d for key, d in reference.items() if d < THRESHOLD_KM}
+    assert close
+    missed = sorted(set(close) - set(reported))
+    assert not missed, f'missed pairs {missed}'
+    for key, distance in close.items():
+        assert reported[key] <= distance + 1e-6, (key, reported[key], distance)
@@ -0,0 +1,100 @@
+"""
+Test regresi check_collision (KD-tree) terhadap loop brute-force lama
+(setiap titik lintasan x setiap debris dengan calculate_distance), termasuk
+jarak yang sama persis (debris duplikat, titik grid integer, jarak tepat
+sama dengan threshold)
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from collision_prediction import (calculate_distance, check_collision, parse_debris_tle,
+                                  propagate_satellite_trajectory)
+
+START_TIME = datetime(2025, 10, 5)
+DEBRIS_FILE = 'FENGYUN debris.txt'
+SEED = 11
+
+ISS = ('1 25544U 98067A   25277.01482352  .00012477  00000-0  22893-3 0  9996',
+       '2 25544  51.6322 127.6882 0000966 195.4447 164.6512 15.49660865532049')
+
+
+def _baseline_check_collision(satellite_trajectory, debris_positions, threshold):
+    """check_collision sebelum KD-tree (loop per pasangan)"""
+    min_distance = float('inf')
+    closest_sat_point = None
+    closest_debris = None
+    collision_points = []
+    for sat_pos in satellite_trajectory:
+        for debris in debris_positions:
+            distance = calculate_distance(sat_pos, debris)
+            if distance < min_distance:
+                min_distance = distance
+                closest_sat_point = sat_pos
+                closest_debris = debris
+            if distance < threshold:
+                collision_points.append({
+                    'time': sat_pos['time'],
+                    'distance': distance,
+                    'sat_pos': sat_pos,
+                    'debris_pos': debris
+                })
+    return {
+        'collision': len(collision_points) > 0,
+        'collision_count': len(collision_points),
+        'min_distance': min_distance,
+        'closest_sat_point': closest_sat_point,
+        'closest_debris': closest_debris,
+        'collision_points': collision_points
+    }
+
+
+def _assert_same(result, expected):
+    # Titik lintasan unik per waktu (Trajectory membuat dict baru per akses);
+    # debris duplikat hanya bisa dibedakan dari identitas objeknya
+    assert result['collision'] == expected['collision']
+    assert result['collision_count'] == expected['collision_count']
+    assert result['min_distance'] == expected['min_distance']
+    assert result['closest_sat_point'] == expected['closest_sat_point']
+    assert result['closest_debris'] is expected['closest_debris']
+    for got, want in zip(result['collision_points'], expected['collision_points']):
+        assert got['time'] == want['time']
+        assert got['distance'] == want['distance']
+        assert got['sat_pos'] == want['sat_pos']
+        assert got['debris_pos'] is want['debris_pos']
+
+
+def _lattice_points(rng, count, extent, with_time):
+    points = []
+    for k, (x, y, z) in enumerate(rng.integers(-extent, extent + 1, (count, 3)).tolist()):
+        point = {'x': float(x), 'y': float(y), 'z': float(z)}
+        if with_time:
+            point['time'] = START_TIME + timedelta(minutes=k)
+        points.append(point)
+    return points
+
+
+def test_matches_baseline_with_ties():
+    rng = np.random.default_rng(SEED)
+    trajectory = _lattice_points(rng, 300, 6, True)
+    debris = _lattice_points(rng, 200, 6, False)
+    # Debris duplikat (posisi sama, objek berbeda) dan titik berjarak tepat 5 km (3-4-5)
+    debris += [dict(debris[k]) for k in range(0, 200, 7)]
+    debris.append({'x': trajectory[0]['x'] + 3.0, 'y': trajectory[0]['y'] + 4.0,
+                   'z': trajectory[0]['z']})
+
+    for threshold in (0.5, 2.0, 5.0):
+        expected = _baseline_check_collision(trajectory, debris, threshold)
+        assert expected['collision_count'] > 0
+        _assert_same(check_collision(trajectory, debris, threshold), expected)
+        _assert_same(check_collision(trajectory, debris, threshold, progress=lambda f: None),
+                     expected)
+
+
+def test_matches_baseline_on_catalog():
+    trajectory = propagate_satellite_trajectory(*ISS, num_periods=2, time_step_minutes=1,
+                                                start_time=START_TIME)
+    debris = parse_debris_tle(DEBRIS_FILE, current_time=START_TIME)[:600]
+    expected = _baseline_check_collision(trajectory, debris, 800.0)
+    assert expected['collision_count'] > 0
+    _assert_same(check_collision(trajectory, debris, 800.0), expected)
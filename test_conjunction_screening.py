@@ -0,0 +1,167 @@
+"""
+Test screening konjungsi time-resolved terhadap referensi brute-force
+(sampling rapat dengan sgp4 per objek) pada subset TLE tetap
+"""
+from datetime import datetime
+
+import numpy as np
+from sgp4.api import WGS72, Satrec, SatrecArray, jday
+from sgp4.exporter import export_tle
+
+from collision_prediction import calculate_orbital_period
+from conjunction_screening import (_relative_state, build_time_grid, refine_tca,
+                                   screen_time_grid, time_resolved_collision)
+from tle_catalog import load_catalog
+
+START_TIME = datetime(2025, 10, 5)
+DEBRIS_FILE = 'FENGYUN debris.txt'
+
+# Subset katalog untuk perbandingan per objek (loop sgp4 Python)
+SUBSET_SIZE = 150
+
+ISS = ('1 25544U 98067A   25277.01482352  .00012477  00000-0  22893-3 0  9996',
+       '2 25544  51.6322 127.6882 0000966 195.4447 164.6512 15.49660865532049')
+FENGYUN_1C = ('1 25730U 99025A   25277.61918087  .00005128  00000+0  21880-2 0  9991',
+              '2 25730  98.8930 342.7055 0009040 259.3435 100.6726 14.25480121361523')
+
+
+def _start_jd():
+    return jday(START_TIME.year, START_TIME.month, START_TIME.day,
+                START_TIME.hour, START_TIME.minute, START_TIME.second)
+
+
+def _brute_force_distance(sat, debris, jd0, fr0, minutes):
+    distances = []
+    for t in minutes:
+        sat_r, _, debris_r, _ = _relative_state(sat, debris, jd0, fr0 + t / 1440.0)
+        distances.append(np.linalg.norm(debris_r - sat_r))
+    return np.array(distances)
+
+
+def _brute_force_grid(sat, debris, jd, fr):
+    """Jarak (M, T) dengan satu panggilan sgp4 per objek per waktu"""
+    distances = np.full((len(debris), len(jd)), np.inf)
+    for t in range(len(jd)):
+        sat_error, sat_r, _ = sat.sgp4(jd[t], fr[t])
+        if sat_error != 0:
+            continue
+        for k, obj in enumerate(debris):
+            error, r, _ = obj.sgp4(jd[t], fr[t])
+            if error == 0:
+                distances[k, t] = np.linalg.norm(np.subtract(r, sat_r))
+    return distances
+
+
+def test_screen_time_grid_matches_per_object_loop():
+    sat = Satrec.twoline2rv(*ISS)
+    debris = load_catalog(DEBRIS_FILE).satrecs()[:SUBSET_SIZE]
+    jd, fr, _ = build_time_grid(START_TIME, 95, 1.0)
+    reference = _brute_force_grid(sat, debris, jd, fr)
+    threshold = 1500.0
+
+    expected_hits = np.argwhere(reference.T < threshold)
+    # chunk_size kecil: minimum dan hit yang jatuh di batas chunk ikut diuji
+    for chunk_size in (None, 7):
+        screening = screen_time_grid(sat, debris, jd, fr, threshold, chunk_size=chunk_size)
+        assert np.allclose(screening['min_distance'], reference.min(axis=1), rtol=0, atol=1e-6)
+        assert np.array_equal(screening['min_index'], reference.argmin(axis=1))
+        assert np.array_equal(screening['hits'], expected_hits), chunk_size
+        assert np.allclose(screening['hit_distance'], reference.T[reference.T < threshold],
+                           rtol=0, atol=1e-6)
+
+
+def test_time_resolved_refine_finds_every_close_approach():
+    """Setiap debris yang tersampel < threshold (step 10 detik) harus dilaporkan"""
+    threshold = 300.0
+    debris = load_catalog(DEBRIS_FILE).satrecs()
+    result = time_resolved_collision(*ISS, debris, num_periods=1, time_step_minutes=1,
+                                     threshold=threshold, start_time=START_TIME)
+
+    # Rentang grid screening: int(periode) step 1 menit
+    span_minutes = int(calculate_orbital_period(*ISS)) - 1
+    jd, fr, _ = build_time_grid(START_TIME, span_minutes * 6 + 1, 10.0 / 60.0)
+    _, sat_r, _ = Satrec.twoline2rv(*ISS).sgp4_array(jd, fr)
+    errors, debris_r, _ = SatrecArray(debris).sgp4(jd, fr)
+    distances = np.linalg.norm(debris_r - sat_r[None], axis=2)
+    distances[errors != 0] = np.inf
+    reference = distances.min(axis=1)
+
+    close = np.flatnonzero(reference < threshold)
+    assert len(close) > 0
+    reported = {}
+    for point in result['collision_points']:
+        j = point['debris_index']
+        reported[j] = min(reported.get(j, np.inf), point['distance'])
+    missed = sorted(set(close.tolist()) - set(reported))
+    assert not missed, f'missed debris {missed}'
+    # TCA hasil refine tidak boleh lebih jauh dari sampel brute-force
+    for j in close:
+        assert reported[j] <= reference[j] + 1e-6, (j, reported[j], reference[j])
+    assert result['min_distance'] <= reference.min() + 1e-6
+
+
+def test_refine_tca_two_root_bracket():
+    """Step kasar 30 menit: jendela berisi minimum dan maksimum jarak"""
+    sat = Satrec.twoline2rv(*ISS)
+    debris = Satrec.twoline2rv(*FENGYUN_1C)
+    jd0, fr0 = _start_jd()
+    t_lo, t_guess, t_hi = 0.0, 30.0, 60.0
+
+    minutes = np.arange(t_lo, t_hi, 1.0 / 60.0)
+    rates = []
+    for t in minutes[::6]:
+        sat_r, sat_v, debris_r, debris_v = _relative_state(sat, debris, jd0, fr0 + t / 1440.0)
+        rates.append(np.dot(debris_r - sat_r, debris_v - sat_v))
+    roots = int(np.sum(np.diff(np.sign(rates)) != 0))
+    assert roots >= 2, f'bracket has {roots} range-rate roots'
+
+    reference = _brute_force_distance(sat, debris, jd0, fr0, minutes)
+    tca = refine_tca(sat, debris, jd0, fr0, t_lo, t_hi, t_guess=t_guess)
+    assert tca is not None
+    # Sampling 1 detik hanya bisa lebih besar dari minimum sebenarnya
+    assert tca['distance'] <= reference.min() + 1e-3, (tca['distance'], reference.min())
+    assert abs(tca['t'] - minutes[np.argmin(reference)]) < 2.0 / 60.0
+
+
+
+def _decaying_pair():
+    """
+    Satelit (tanpa drag) dan debris berorbit sama dengan B* besar: debris
+    mendekati satelit dari belakang lalu decay (sgp4 error 6) sekitar menit 528
+    """
+    jd0, fr0 = _start_jd()
+    epoch = jd0 + fr0 - 2433281.5
+
+    def satrec(bstar, mean_anomaly):
+        obj = Satrec()
+        obj.sgp4init(WGS72, 'i', 99999, epoch, bstar, 0.0, 0.0, 0.0005, np.radians(30.0),
+                     np.radians(51.6), np.radians(mean_anomaly), 15.5 * 2 * np.pi / 1440.0,
+                     np.radians(100.0))
+        return obj
+
+    return export_tle(satrec(0.0, 74.0)), satrec(1.0, 0.0)
+
+
+def test_refine_keeps_hit_when_debris_decays():
+    (line1, line2), debris = _decaying_pair()
+    sat = Satrec.twoline2rv(line1, line2)
+    jd, fr, offsets = build_time_grid(START_TIME, 560, 1.0)
+    distance = _brute_force_grid(sat, [debris], jd, fr)[0]
+    valid = np.flatnonzero(np.isfinite(distance))
+    last = int(valid[-1])
+    assert last + 1 < len(jd) and distance[last] < distance[last - 1], 'decay must end an approach'
+
+    # Jendela refine [last - 1, last + 1] berisi sampel yang gagal dipropagasi
+    tca = refine_tca(sat, debris, jd[0], fr[0], offsets[last - 1], offsets[last + 1],
+                     t_guess=offsets[last])
+    assert tca is not None and tca['distance'] <= distance[last] + 1e-6
+
+    threshold = 2000.0
+    period = calculate_orbital_period(line1, line2)
+    result = time_resolved_collision(line1, line2, [debris], num_periods=560 / period,
+                                     time_step_minutes=1.0, threshold=threshold,
+                                     start_time=START_TIME)
+    assert result['num_steps'] == 560
+    assert result['min_distance'] <= distance[last] + 1e-6
+    times = [p['tca_offset_seconds'] / 60.0 for p in result['collision_points']]
+    assert any(offsets[last - 1] <= t <= offsets[last] + 1e-6 for t in times), times
@@ -0,0 +1,102 @@
+"""
+Test grid cakupan equal-area: rasterisasi dan statistik revisit terhadap
+referensi brute-force (jarak great-circle ke setiap pusat sel)
+"""
+import numpy as np
+
+from collision_prediction import EARTH_RADIUS
+from coverage_grid import CoverageGrid, EqualAreaGrid
+
+CELL_KM = 200.0
+SEED = 7
+
+# Sel yang pusatnya tepat di tepi lingkaran (pembulatan float) tidak dinilai
+EDGE_TOLERANCE_KM = 1e-6
+
+
+def _great_circle_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    cos_angle = (np.sin(lat1) * np.sin(lat2) +
+                 np.cos(lat1) * np.cos(lat2) * np.cos(lon1 - lon2))
+    return EARTH_RADIUS * np.arccos(np.clip(cos_angle, -1.0, 1.0))
+
+
+def _brute_force_cells(grid, lat, lon, radius_km):
+    """Set sel dalam radius dan set sel ambigu (tepat di tepi)"""
+    center_lat, center_lon = grid.cell_centers()
+    distance = _great_circle_km(center_lat[:, None], center_lon[:, None],
+                                np.asarray(lat)[None], np.asarray(lon)[None]).min(axis=1)
+    inside = set(np.flatnonzero(distance <= radius_km).tolist())
+    edge = set(np.flatnonzero(np.abs(distance - radius_km) < EDGE_TOLERANCE_KM).tolist())
+    return inside, edge
+
+
+def _sample_points(rng, count):
+    # Titik acak ditambah kutub dan antimeridian
+    lat = np.concatenate([rng.uniform(-90.0, 90.0, count), [89.5, -89.9, 0.0, 10.0, -45.0]])
+    lon = np.concatenate([rng.uniform(-180.0, 180.0, count), [0.0, 120.0, 179.9, -179.95, 180.0]])
+    return lat, lon
+
+
+def test_total_area_is_sphere():
+    grid = CoverageGrid(CELL_KM)
+    sphere = 4 * np.pi * EARTH_RADIUS**2
+    assert abs(grid.total_area_km2 - sphere) < 1e-9 * sphere
+
+
+def test_rasterize_matches_brute_force():
+    grid = CoverageGrid(CELL_KM)
+    lat, lon = _sample_points(np.random.default_rng(SEED), 40)
+    for radius_km in (150.0, 800.0, 3000.0):
+        inside, edge = _brute_force_cells(grid, lat, lon, radius_km)
+        cells = grid.rasterize(lat, lon, radius_km)
+        assert len(cells) == len(set(cells.tolist())), 'duplicate cells'
+        mismatch = (set(cells.tolist()) ^ inside) - edge
+        assert not mismatch, (radius_km, sorted(mismatch)[:10])
+
+
+def test_revisit_statistics_match_brute_force():
+    grid = CoverageGrid(CELL_KM)
+    rng = np.random.default_rng(SEED)
+    radius_km = 1200.0
+    window_seconds = 60.0
+    num_windows = 12
+
+    # Matriks cakupan brute-force (jendela x sel); beberapa jendela diulang agar ada kunjungan panjang
+    covered = np.zeros((num_windows, grid.size), dtype=bool)
+    for w in range(num_windows):
+        lat, lon = _sample_points(rng, 3) if w % 3 else (np.array([0.0]), np.array([100.0]))
+        inside, _ = _brute_force_cells(grid, lat, lon, radius_km)
+        covered[w, sorted(inside)] = True
+        grid.add_window(w * window_seconds, (w + 1) * window_seconds, lat, lon, radius_km)
+
+    starts = covered & ~np.vstack([np.zeros((1, grid.size), dtype=bool), covered[:-1]])
+    assert np.array_equal(grid.covered, covered.any(axis=0))
+    assert np.array_equal(grid.visits, starts.sum(axis=0))
+    assert np.allclose(grid.access_seconds, covered.sum(axis=0) * window_seconds)
+
+    # Gap maksimum antar kunjungan: awal kunjungan - akhir jendela tercakup sebelumnya
+    for cell in np.flatnonzero(starts.sum(axis=0) > 1)[:200]:
+        windows = np.flatnonzero(covered[:, cell])
+        gaps = np.diff(windows) - 1
+        expected = gaps.max() * window_seconds
+        assert np.isclose(grid.max_gap_seconds[cell], expected), (cell, grid.max_gap_seconds[cell])
+
+    expected_area = grid.cell_area_km2[covered.any(axis=0)].sum()
+    assert np.isclose(grid.covered_area_km2, expected_area)
+
+
+
+def test_geometry_matches_full_grid():
+    geometry = EqualAreaGrid(CELL_KM)
+    grid = CoverageGrid(CELL_KM)
+    index = np.random.default_rng(SEED).integers(0, grid.size, 500)
+    lat, lon = grid.cell_centers()
+    assert np.array_equal(geometry.cell_area(index), grid.cell_area_km2[index])
+    assert all(np.array_equal(a, b[index]) for a, b in zip(geometry.cell_centers(index), (lat, lon)))
+
+    for box in ((-11.0, 6.0, 95.0, 141.0), (60.0, 90.0, -180.0, 180.0), (-5.0, 5.0, -0.5, 0.5)):
+        min_lat, max_lat, min_lon, max_lon = box
+        inside = np.flatnonzero((lat >= min_lat) & (lat <= max_lat) &
+                                (lon >= min_lon) & (lon <= max_lon))
+        assert np.array_equal(geometry.cells_in_box(*box), inside), box
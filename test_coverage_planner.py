@@ -0,0 +1,149 @@
+"""
+Test union cakupan coverage_planner terhadap referensi brute-force: sel
+wilayah dalam radius swath dari setiap sampel ground track (jarak
+great-circle ke setiap pusat sel), digabung per jendela untuk semua satelit
+pada subset tetap TLE.txt
+"""
+from datetime import datetime
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from sgp4.api import jday
+
+from collision_prediction import EARTH_RADIUS
+from coverage_grid import CoverageGrid
+from coverage_planner import plan_coverage, resolve_region, select_satellites
+from spotbeam_revisit import RASTER_STEP_SECONDS, ground_track, ground_track_rate
+from tle_catalog import load_catalog, satrec_from_record
+
+START_TIME = datetime(2025, 10, 5)
+TLE_FILE = 'TLE.txt'
+# ISS, HST, AQUA, CSS (Tianhe) - melintasi Indonesia beberapa kali dalam 6 jam;
+# ISS (NAUKA) punya TLE sendiri tetapi berimpit dengan ISS, jadi selnya tumpang tindih
+NORAD_IDS = [25544, 49044, 20580, 27424, 48274]
+DURATION_HOURS = 6.0
+WIDTH_KM = 1000.0
+CELL_KM = 100.0
+WINDOW_SECONDS = 60.0
+
+# Sel yang pusatnya tepat di tepi swath (pembulatan float) tidak dinilai
+EDGE_TOLERANCE_KM = 1e-6
+
+
+def _great_circle_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    cos_angle = (np.sin(lat1) * np.sin(lat2) +
+                 np.cos(lat1) * np.cos(lat2) * np.cos(lon1 - lon2))
+    return EARTH_RADIUS * np.arccos(np.clip(cos_angle, -1.0, 1.0))
+
+
+def _region_cells(grid):
+    polygon = Polygon(resolve_region('indonesia'))
+    lat, lon = grid.cell_centers()
+    return np.flatnonzero(shapely.contains_xy(polygon, lon, lat))
+
+
+def _brute_force_access(satrec, grid, cells, num_windows):
+    """Matriks (jendela x sel wilayah) tercakup dan matriks sel ambigu di tepi swath"""
+    duration = DURATION_HOURS * 3600.0
+    radius_km = WIDTH_KM / 2.0
+    step = min(RASTER_STEP_SECONDS, WINDOW_SECONDS,
+               radius_km / EARTH_RADIUS / 4.0 / ground_track_rate(satrec))
+    offsets = np.append(np.arange(0.0, duration, step), duration)
+    lat, lon, _ = ground_track(satrec, *_start_jd(), offsets)
+    center_lat, center_lon = grid.cell_centers()
+
+    covered = np.zeros((num_windows, len(cells)), dtype=bool)
+    edge = np.zeros((num_windows, len(cells)), dtype=bool)
+    for w in range(num_windows):
+        # Sampel di batas jendela ikut kedua jendela
+        t_start, t_end = w * WINDOW_SECONDS, (w + 1) * WINDOW_SECONDS
+        rows = np.flatnonzero((offsets >= t_start) & (offsets <= t_end))
+        distance = _great_circle_km(center_lat[cells, None], center_lon[cells, None],
+                                    lat[None, rows], lon[None, rows]).min(axis=1)
+        covered[w] = distance <= radius_km
+        edge[w] = np.abs(distance - radius_km) < EDGE_TOLERANCE_KM
+    return covered, edge
+
+
+def _start_jd():
+    return jday(START_TIME.year, START_TIME.month, START_TIME.day, 0, 0, 0.0)
+
+
+def _plan(satellites, workers=1):
+    return plan_coverage(satellites, START_TIME, duration_hours=DURATION_HOURS,
+                         spotbeam_width_km=WIDTH_KM, cell_km=CELL_KM,
+                         window_seconds=WINDOW_SECONDS, tle_file=TLE_FILE, workers=workers)
+
+
+def _reference(satellites):
+    grid = CoverageGrid(CELL_KM)
+    cells = _region_cells(grid)
+    area = grid.cell_area_km2[cells]
+    num_windows = int(np.ceil(DURATION_HOURS * 3600.0 / WINDOW_SECONDS))
+    elements = load_catalog(TLE_FILE).elements
+    accesses = [_brute_force_access(satrec_from_record(elements[sat['catalog_index']]),
+                                    grid, cells, num_windows) for sat in satellites]
+    covered = np.any([c for c, _ in accesses], axis=0)
+    edge = np.any([e for _, e in accesses], axis=0)
+    return covered, edge, area, accesses
+
+
+def test_union_matches_brute_force():
+    satellites = select_satellites(TLE_FILE, norad_ids=NORAD_IDS)
+    result = _plan(satellites)
+    covered, edge, area, accesses = _reference(satellites)
+    assert covered.any() and not edge.any(), 'subset must cover the region without edge cells'
+    overlap = np.sum([own for own, _ in accesses], axis=0) > 1
+    assert overlap.any(), 'subset must cover some cells twice in one window'
+    assert result['region_cells'] == covered.shape[1]
+
+    num_windows, _ = covered.shape
+    total = area.sum()
+    instant = covered @ area / total * 100.0
+    cumulative = np.logical_or.accumulate(covered, axis=0) @ area / total * 100.0
+    assert np.allclose(result['timeseries']['coverage_percent'], instant)
+    assert np.allclose(result['timeseries']['cumulative_percent'], cumulative)
+    assert np.isclose(result['coverage_percent'], cumulative[-1])
+    assert np.isclose(result['mean_coverage_percent'], instant.mean())
+
+    # Kunjungan = rangkaian jendela berurutan yang tercakup oleh satelit mana pun
+    previous = np.vstack([np.zeros((1, covered.shape[1]), dtype=bool), covered[:-1]])
+    visits = (covered & ~previous).sum(axis=0)
+    assert np.isclose(result['mean_visits'], np.average(visits, weights=area))
+
+    # Gap maksimum termasuk awal simulasi -> kunjungan pertama dan terakhir -> akhir
+    max_gap = 0
+    for column in covered.T:
+        windows = np.flatnonzero(column)
+        if not len(windows):
+            max_gap = max(max_gap, num_windows)
+            continue
+        bounded = np.concatenate([[-1], windows, [num_windows]])
+        max_gap = max(max_gap, int((np.diff(bounded) - 1).max()))
+    assert np.isclose(result['max_revisit_gap_seconds'], max_gap * WINDOW_SECONDS)
+
+    for sat, summary, (own, _) in zip(satellites, result['satellites'], accesses):
+        assert summary['access_windows'] == int(own.any(axis=1).sum()), sat['name']
+        expected = area[own.any(axis=0)].sum() / total * 100.0
+        assert np.isclose(summary['coverage_percent'], expected), sat['name']
+
+
+def test_duplicate_satellite_counted_once():
+    satellites = select_satellites(TLE_FILE, norad_ids=NORAD_IDS[:2])
+    single = _plan(satellites)
+    doubled = _plan(satellites + satellites[:1])
+    for key in ('coverage_percent', 'mean_coverage_percent', 'max_revisit_gap_seconds',
+                'mean_access_seconds', 'mean_visits'):
+        assert np.isclose(single[key], doubled[key]), key
+    assert single['timeseries'] == doubled['timeseries']
+
+
+def test_workers_match_single_process():
+    satellites = select_satellites(TLE_FILE, norad_ids=NORAD_IDS)
+    serial = _plan(satellites, workers=1)
+    pooled = _plan(satellites, workers=2)
+    assert pooled['stats']['workers'] == 2
+    assert serial['timeseries'] == pooled['timeseries']
+    assert serial['satellites'] == pooled['satellites']
@@ -0,0 +1,73 @@
+"""
+Test round-trip format binary DEBR (DebrisSnapshot.to_binary): header
+24 byte, kolom float32 lat/lon/alt dan kategori uint8 dengan kategori -1
+ditulis sebagai 255, dibaca ulang seperti decoder di
+static/js/debris-visualization.js
+"""
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from debris_snapshot import (DEBRIS_BINARY_MAGIC, DEBRIS_BINARY_VERSION, DebrisSnapshot,
+                             DebrisSnapshotService)
+
+START_TIME = datetime(2025, 10, 5, 12, 30, 10)
+DEBRIS_FILE = 'FENGYUN debris.txt'
+HEADER_BYTES = 24
+
+
+def _decode(payload):
+    magic, version, _, count, _, seconds = struct.unpack_from('<4sHHIId', payload)
+    assert len(payload) == HEADER_BYTES + count * (3 * 4 + 1)
+    columns = []
+    offset = HEADER_BYTES
+    for _ in range(3):
+        columns.append(np.frombuffer(payload, dtype='<f4', count=count, offset=offset))
+        offset += 4 * count
+    category = np.frombuffer(payload, dtype=np.uint8, count=count, offset=offset)
+    return magic, version, seconds, columns, category
+
+
+def _state():
+    lat = np.array([10.5, -45.25, 0.0, 89.9, -12.0])
+    lon = np.array([100.0, -179.5, 180.0, 0.0, 45.0])
+    alt = np.array([400.0, 2500.0, 150.0, 1000.0, 700.0])
+    return {
+        'valid': np.array([True, True, True, True, False]),
+        'lat': lat,
+        'lon': lon,
+        'alt': alt,
+        'cat_idx': np.array([0, -1, -1, 2, 1]),
+        'position': np.zeros((5, 3))
+    }
+
+
+def test_binary_round_trip():
+    snapshot = DebrisSnapshot(START_TIME, 0, _state(), 'v1')
+    magic, version, seconds, (lat, lon, alt), category = _decode(snapshot.to_binary())
+    assert magic == DEBRIS_BINARY_MAGIC and version == DEBRIS_BINARY_VERSION
+    assert seconds == (START_TIME - datetime(1970, 1, 1)).total_seconds()
+
+    # Hanya debris valid, urutan katalog; kategori -1 -> 255
+    assert np.array_equal(lat, np.float32([10.5, -45.25, 0.0, 89.9]))
+    assert np.array_equal(lon, np.float32([100.0, -179.5, 180.0, 0.0]))
+    assert np.array_equal(alt, np.float32([400.0, 2500.0, 150.0, 1000.0]))
+    assert category.tolist() == [0, 255, 255, 2]
+
+    _, _, _, (lat, _, _), category = _decode(snapshot.to_binary(category=-1))
+    assert lat.tolist() == [-45.25, 0.0] and category.tolist() == [255, 255]
+    _, _, _, (lat, _, _), category = _decode(snapshot.to_binary(category=1))
+    assert len(lat) == 0 and len(category) == 0
+
+
+def test_binary_matches_catalog_snapshot():
+    snapshot = DebrisSnapshotService(DEBRIS_FILE).get(START_TIME)
+    _, _, seconds, decoded, category = _decode(snapshot.to_binary())
+    assert seconds == (snapshot.time - datetime(1970, 1, 1)).total_seconds()
+
+    lats, lons, alts, cat_idx = snapshot.columns()
+    assert len(lats) == snapshot.count() > 0
+    for column, expected in zip(decoded, (lats, lons, alts)):
+        assert np.array_equal(column, expected.astype(np.float32))
+    assert np.array_equal(category.astype(int), np.where(cat_idx < 0, 255, cat_idx))
@@ -0,0 +1,61 @@
+"""
+Test sieve apogee/perigee + orbit path: tidak ada false negative terhadap
+jarak minimum brute-force (sampling sgp4 rapat) pada katalog debris tetap
+"""
+from datetime import datetime
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
+
+from orbit_sieve import sieve_candidates
+from tle_catalog import load_catalog
+
+START_TIME = datetime(2025, 10, 5)
+DURATION_MINUTES = 300.0
+STEP_SECONDS = 5.0
+DEBRIS_FILE = 'FENGYUN debris.txt'
+
+ISS = ('1 25544U 98067A   25277.01482352  .00012477  00000-0  22893-3 0  9996',
+       '2 25544  51.6322 127.6882 0000966 195.4447 164.6512 15.49660865532049')
+
+
+def _brute_force_min_distance(sat, debris_satrecs):
+    jd0, fr0 = jday(START_TIME.year, START_TIME.month, START_TIME.day,
+                    START_TIME.hour, START_TIME.minute, START_TIME.second)
+    minutes = np.arange(0.0, DURATION_MINUTES, STEP_SECONDS / 60.0)
+    jd = np.full(minutes.shape, jd0)
+    fr = fr0 + minutes / 1440.0
+
+    _, sat_r, _ = sat.sgp4_array(jd, fr)
+    errors, debris_r, _ = SatrecArray(debris_satrecs).sgp4(jd, fr)
+    distances = np.linalg.norm(debris_r - sat_r[None], axis=2)
+    distances[errors != 0] = np.inf
+    return distances.min(axis=1)
+
+
+def test_sieve_has_no_false_negatives():
+    sat = Satrec.twoline2rv(*ISS)
+    debris = load_catalog(DEBRIS_FILE).satrecs()
+    min_distance = _brute_force_min_distance(sat, debris)
+
+    for threshold in (100.0, 200.0):
+        candidates, stats = sieve_candidates(sat, debris, START_TIME, DURATION_MINUTES, threshold)
+        close = np.flatnonzero(min_distance <= threshold)
+        missed = sorted(set(close.tolist()) - set(candidates.tolist()))
+        assert not missed, f'threshold {threshold} km: sieve dropped {missed}'
+        assert stats['candidates'] < stats['total'], stats
+
+    # Referensi brute-force harus benar-benar menemukan objek dekat
+    assert np.any(min_distance <= 200.0)
+
+
+def test_sieve_leaves_shared_satrecs_untouched():
+    """sgp4() menulis atribut Satrec; sieve harus memakai salinan privat"""
+    sat = Satrec.twoline2rv(*ISS)
+    debris = load_catalog(DEBRIS_FILE).satrecs()[:50]
+    before = [(s.t, s.am) for s in [sat] + debris]
+
+    sieve_candidates(sat, debris, START_TIME, DURATION_MINUTES, 5.0)
+
+    after = [(s.t, s.am) for s in [sat] + debris]
+    assert before == after
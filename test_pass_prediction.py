@@ -0,0 +1,76 @@
+"""
+Test prefilter visibilitas find_passes: setiap pass dari pencarian
+find_discrete penuh (prefilter=False) harus ditemukan juga dengan
+prefilter=True pada campuran orbit LEO/MEO/GEO/HEO, termasuk pass grazing
+yang lebih pendek dari step sampel
+"""
+from datetime import datetime, timedelta
+
+from skyfield.api import EarthSatellite, wgs84
+
+from astro_context import get_context
+from pass_prediction import find_passes, skyfield_time
+
+START_TIME = datetime(2026, 10, 17)
+SEARCH_DAYS = 3
+
+# Toleransi AOS/LOS (detik) antara kedua metode pencarian
+TIME_TOLERANCE_SECONDS = 2.0
+
+SATELLITES = {
+    'ISS': ('1 25544U 98067A   25277.01482352  .00012477  00000-0  22893-3 0  9996',
+            '2 25544  51.6322 127.6882 0000966 195.4447 164.6512 15.49660865532049'),
+    'PRAETORIAN SDA_606': ('1 65569U 25203E   25276.61332257  .00000119  00000-0  94837-4 0  9990',
+                           '2 65569  81.3026 248.4706 0007138 160.6551 199.4878 13.84689506  3196'),
+    # Elemen sintetis: MEO ala GPS, GEO di atas Amerika Utara, Molniya
+    'MEO': ('1 90001U 25001A   25277.50000000  .00000000  00000-0  00000-0 0  9996',
+            '2 90001  55.0000 120.0000 0050000  40.0000 200.0000  2.00563000    13'),
+    'GEO': ('1 90002U 25001A   25277.50000000  .00000000  00000-0  00000-0 0  9997',
+            '2 90002   0.0500  80.0000 0002000 270.0000  90.0000  1.00272000    19'),
+    'MOLNIYA': ('1 90003U 25001A   25277.50000000  .00000000  00000-0  00000-0 0  9998',
+                '2 90003  63.4000 300.0000 7200000 270.0000  10.0000  2.00600000    18'),
+}
+
+STATIONS = [(-6.2, 106.8), (-80.0, 0.0), (40.0, -100.0)]
+
+
+def _search(name, latitude, longitude, min_elevation, prefilter, start=START_TIME,
+            days=SEARCH_DAYS):
+    ts = get_context().timescale
+    satellite = EarthSatellite(*SATELLITES[name], name, ts)
+    observer = wgs84.latlon(latitude, longitude)
+    return find_passes(satellite, observer, ts, skyfield_time(ts, start),
+                       skyfield_time(ts, start + timedelta(days=days)), min_elevation, prefilter)
+
+
+def _seconds(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S UTC')
+
+
+def _matches(reference, passes):
+    for candidate in passes:
+        if (abs((_seconds(candidate['aos_time']) - _seconds(reference['aos_time'])).total_seconds())
+                <= TIME_TOLERANCE_SECONDS and
+                abs((_seconds(candidate['los_time']) -
+                     _seconds(reference['los_time'])).total_seconds()) <= TIME_TOLERANCE_SECONDS):
+            return True
+    return False
+
+
+def test_prefilter_keeps_every_pass():
+    for name in SATELLITES:
+        for latitude, longitude in STATIONS:
+            for min_elevation in (10, 30):
+                fast = _search(name, latitude, longitude, min_elevation, True)
+                full = _search(name, latitude, longitude, min_elevation, False)
+                lost = [p['aos_time'] for p in full if not _matches(p, fast)]
+                assert not lost, f'{name} @ ({latitude}, {longitude}) {min_elevation} deg: {lost}'
+
+
+def test_prefilter_finds_grazing_pass():
+    """Pass 44 detik (puncak 30.2 deg) harus ditemukan dari awal pencarian mana pun"""
+    for offset_hours in (0, 26, 28):
+        start = START_TIME + timedelta(hours=offset_hours)
+        passes = _search('PRAETORIAN SDA_606', -80.0, 0.0, 30, True, start=start)
+        aos = [p['aos_time'] for p in passes]
+        assert any(t.startswith('2026-10-19 02:11') for t in aos), (start, aos)
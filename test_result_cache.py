@@ -0,0 +1,105 @@
+"""
+Test cache hasil prediksi: eviction LRU dan TTL MemoryCache, statistik
+hit/miss/eviction, dan eviction FileSystemCache berdasarkan akses terakhir
+"""
+import os
+import tempfile
+import time
+
+import pytest
+
+from result_cache import FileSystemCache, MemoryCache, NullCache, create_cache
+
+# TTL pendek untuk test kedaluwarsa (detik)
+SHORT_TIMEOUT = 0.05
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(default_timeout=0, threshold=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' jadi yang terbaru, 'b' paling lama tidak dipakai
+    cache.set('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+    # set ulang key yang sudah ada tidak menambah entri dan memperbarui urutan LRU
+    cache.set('a', 10)
+    cache.set('d', 4)
+    assert cache.get('a') == 10 and cache.get('c') is None
+    assert cache.stats()['evictions'] == 2
+
+
+def test_memory_cache_ttl():
+    cache = MemoryCache(default_timeout=SHORT_TIMEOUT, threshold=10)
+    cache.set('short', 1)
+    cache.set('forever', 2, timeout=0)
+    cache.set('long', 3, timeout=60)
+    assert cache.get('short') == 1
+    time.sleep(2 * SHORT_TIMEOUT)
+    assert cache.get('short') is None
+    assert cache.get('forever') == 2 and cache.get('long') == 3
+    # Entri kedaluwarsa dibuang saat dibaca, bukan dihitung sebagai eviction
+    assert len(cache) == 2 and cache.stats()['evictions'] == 0
+
+
+def test_stats():
+    cache = MemoryCache(default_timeout=300, threshold=1)
+    assert cache.stats()['hit_rate'] == 0.0
+    cache.get('missing')
+    cache.set('a', {'x': 1})
+    cache.get('a')
+    cache.get('a')
+    cache.set('b', 2)
+    stats = cache.stats()
+    assert stats['backend'] == 'simple'
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 1, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+    assert (stats['size'], stats['threshold'], stats['default_timeout']) == (1, 1, 300)
+
+    null = NullCache()
+    null.set('a', 1)
+    assert null.get('a') is None
+    assert null.stats()['misses'] == 1 and null.stats()['size'] == 0
+
+
+def test_filesystem_cache_eviction_and_ttl():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = FileSystemCache(directory, default_timeout=0, threshold=2)
+        # mtime eksplisit supaya urutan akses tidak bergantung resolusi timestamp filesystem
+        now = time.time()
+        cache.set('a', [1])
+        os.utime(cache._path('a'), (now - 30, now - 30))
+        cache.set('b', [2])
+        os.utime(cache._path('b'), (now - 20, now - 20))
+        assert cache.get('a') == [1]  # akses memperbarui mtime 'a'
+
+        cache.set('c', [3])
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') == [1] and cache.get('c') == [3]
+        assert cache.stats()['evictions'] == 1
+        assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+        # Cache lain pada direktori yang sama (worker lain) melihat entri yang sama
+        shared = FileSystemCache(directory, default_timeout=SHORT_TIMEOUT, threshold=2)
+        assert shared.get('c') == [3]
+        shared.set('d', {'v': 4})
+        time.sleep(2 * SHORT_TIMEOUT)
+        assert shared.get('d') is None
+        assert not os.path.exists(shared._path('d'))
+
+        cache.clear()
+        assert len(cache) == 0
+
+
+def test_create_cache():
+    assert isinstance(create_cache({'CACHE_TYPE': 'simple'}), MemoryCache)
+    assert isinstance(create_cache({'CACHE_TYPE': 'null'}), NullCache)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = create_cache({'CACHE_TYPE': 'filesystem', 'CACHE_DIR': directory,
+                              'CACHE_THRESHOLD': 3})
+        assert isinstance(cache, FileSystemCache) and cache.threshold == 3
+    with pytest.raises(ValueError):
+        create_cache({'CACHE_TYPE': 'redis'})
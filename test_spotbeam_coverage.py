@@ -0,0 +1,68 @@
+"""
+Test luas cakupan spotbeam inkremental (SpotbeamCoverage) terhadap luas
+geodesik union langsung, termasuk strip yang melewati antimeridian
+"""
+import shapely
+from pyproj import Geod
+from shapely.geometry import Point
+from shapely.geometry import box as _box
+from shapely.ops import unary_union
+
+from spotbeam_coverage import SpotbeamCoverage, geodesic_area_m2
+
+GEOD = Geod(ellps="WGS84")
+
+# Tepi polygon dianggap geodesic oleh pyproj; strip uji dipadatkan agar luas
+# tidak bergantung pada titik potong tile (seperti strip spotbeam asli)
+SEGMENT_DEG = 0.1
+TOLERANCE = 1e-4
+
+
+def box(min_lon, min_lat, max_lon, max_lat):
+    return shapely.segmentize(_box(min_lon, min_lat, max_lon, max_lat), SEGMENT_DEG)
+
+
+def _reference_km2(strips):
+    """Union semua strip setelah dinormalisasi ke -180..180, lalu luas geodesik"""
+    pieces = []
+    for strip in strips:
+        for shift in (-360.0, 0.0, 360.0):
+            moved = box(strip.bounds[0] + shift, strip.bounds[1],
+                        strip.bounds[2] + shift, strip.bounds[3])
+            piece = moved.intersection(_box(-180.0, -90.0, 180.0, 90.0))
+            if not piece.is_empty and piece.area > 0:
+                pieces.append(piece)
+    return geodesic_area_m2(unary_union(pieces), GEOD) / 1e6
+
+
+def _coverage_km2(strips, batch_size=1):
+    coverage = SpotbeamCoverage(GEOD, batch_size=batch_size)
+    for strip in strips:
+        coverage.add(strip)
+    coverage.flush()
+    return coverage
+
+
+def test_strip_across_antimeridian_keeps_full_area():
+    strip = box(170.0, -10.0, 190.0, 10.0)
+    coverage = _coverage_km2([strip])
+    expected = geodesic_area_m2(strip, GEOD) / 1e6
+    assert abs(coverage.area_km2 - expected) < TOLERANCE * expected, (coverage.area_km2, expected)
+    assert coverage.contains(Point(-175.0, 1.0))
+    assert coverage.contains(Point(185.0, 1.0))
+
+
+def test_overlap_across_antimeridian_counted_once():
+    strips = [box(170.0, -10.0, 190.0, 10.0), box(-175.0, -5.0, -160.0, 5.0),
+              box(-190.0, 20.0, -170.0, 30.0), box(160.0, 25.0, 175.0, 35.0)]
+    expected = _reference_km2(strips)
+    for batch_size in (1, 16):
+        area = _coverage_km2(strips, batch_size).area_km2
+        assert abs(area - expected) < TOLERANCE * expected, (batch_size, area, expected)
+
+
+def test_strip_beyond_pole_clipped():
+    strip = box(10.0, 80.0, 20.0, 95.0)
+    expected = geodesic_area_m2(box(10.0, 80.0, 20.0, 90.0), GEOD) / 1e6
+    area = _coverage_km2([strip]).area_km2
+    assert abs(area - expected) < TOLERANCE * expected, (area, expected)
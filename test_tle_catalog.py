@@ -0,0 +1,100 @@
+"""
+Test katalog TLE binary: invalidasi cache (ukuran + mtime, lalu sha1 isi),
+penulisan ulang atomik, dan fallback katalog di memori jika file katalog
+tidak bisa ditulis
+"""
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from tle_catalog import (catalog_path_for, compile_catalog, load_catalog, parse_tle_elements,
+                         read_catalog_header)
+
+DEBRIS_FILE = 'FENGYUN debris.txt'
+SUBSET_SIZE = 30
+
+
+def _tle_lines(count=SUBSET_SIZE):
+    with open(DEBRIS_FILE) as f:
+        lines = [line.rstrip('\r\n') for line in f if line.strip()]
+    return lines[:3 * count]
+
+
+def _write(path, lines, mtime_ns):
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    # mtime eksplisit supaya perubahan terdeteksi walau penulisan sangat cepat
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_invalidation():
+    lines = _tle_lines()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'subset.txt')
+        _write(path, lines, 1_000_000_000_000_000_000)
+        first = load_catalog(path)
+        catalog_file = catalog_path_for(path)
+        header, _ = read_catalog_header(catalog_file)
+        assert len(first) == SUBSET_SIZE and first.version == header['source_sha1']
+        assert load_catalog(path) is first
+
+        # mtime berubah, isi sama: sha1 sama -> katalog tidak dikompilasi ulang
+        compiled_at = os.stat(catalog_file).st_mtime_ns
+        os.utime(path, ns=(1_000_000_000_000_000_001,) * 2)
+        touched = load_catalog(path)
+        assert touched is not first and touched.version == first.version
+        assert os.stat(catalog_file).st_mtime_ns == compiled_at
+
+        # Ukuran sama, isi berbeda -> kompilasi ulang dengan sha1 baru
+        renamed = [lines[0][:-1] + ('X' if lines[0][-1] != 'X' else 'Y')] + lines[1:]
+        _write(path, renamed, 1_000_000_000_000_000_002)
+        changed = load_catalog(path)
+        assert changed.version != first.version
+        assert changed.names[0] == renamed[0].strip()
+        assert read_catalog_header(catalog_file)[0]['source_sha1'] == changed.version
+
+        # Ukuran berubah -> jumlah record mengikuti file baru
+        _write(path, lines[:3 * (SUBSET_SIZE - 5)], 1_000_000_000_000_000_003)
+        assert len(load_catalog(path)) == SUBSET_SIZE - 5
+
+
+def test_atomic_rewrite():
+    lines = _tle_lines()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'subset.txt')
+        _write(path, lines, 1_000_000_000_000_000_000)
+        old = load_catalog(path)
+        old_satnums = np.array(old.elements['satnum'])
+
+        # Memmap lama tetap membaca file lama (inode lama) setelah os.replace
+        _write(path, lines[3:], 1_000_000_000_000_000_001)
+        new = load_catalog(path)
+        assert len(new) == SUBSET_SIZE - 1
+        assert np.array_equal(old.elements['satnum'], old_satnums)
+        assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+        # Penulisan gagal: katalog lama utuh, file sementara dihapus
+        blocked = os.path.join(directory, 'blocked.catalog')
+        os.mkdir(blocked)
+        with pytest.raises(OSError):
+            compile_catalog(path, blocked)
+        assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+        assert read_catalog_header(catalog_path_for(path))[0]['count'] == SUBSET_SIZE - 1
+
+
+def test_in_memory_fallback_when_catalog_not_writable():
+    lines = _tle_lines()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'subset.txt')
+        _write(path, lines, 1_000_000_000_000_000_000)
+        # Direktori di lokasi file katalog: os.replace gagal seperti pada filesystem read-only
+        # (chmod tidak berpengaruh jika test berjalan sebagai root)
+        os.mkdir(catalog_path_for(path))
+
+        catalog = load_catalog(path)
+        assert not isinstance(catalog.elements, np.memmap)
+        assert np.array_equal(catalog.elements, parse_tle_elements(path))
+        assert len(catalog.satrecs()) == SUBSET_SIZE
+        assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
@@ -0,0 +1,306 @@
+"""
+Katalog TLE terkompilasi (binary) untuk menghindari parsing teks di request path
+================================================================================
+File TLE (3 baris: nama, line1, line2) diparse sekali menjadi elemen orbit
+dalam array NumPy terstruktur, lalu disimpan sebagai file binary di sebelah
+file sumber ("<file TLE>.catalog"). File ini di-memory-map saat startup
+sehingga banyak worker gunicorn berbagi page yang sama.
+
+Format file:
+    8 byte   magic b'TLECAT01'
+    4 byte   panjang header JSON (uint32 little-endian)
+    N byte   header JSON (ukuran, mtime, sha1 file sumber, jumlah record)
+    padding  sampai kelipatan 64 byte
+    record   CATALOG_DTYPE * count
+
+Cache dianggap basi jika ukuran/mtime file sumber berubah dan hash isinya
+juga berbeda; dalam kasus itu katalog dikompilasi ulang.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, WGS72
+
+CATALOG_MAGIC = b'TLECAT01'
+CATALOG_SUFFIX = '.catalog'
+HEADER_ALIGN = 64
+
+# Hari dari 1949 Desember 31 00:00 UT (epoch untuk sgp4init)
+SGP4_EPOCH_JD = 2433281.5
+
+CATALOG_DTYPE = np.dtype([
+    ('name', 'S24'),
+    ('satnum', '<i4'),
+    ('jdsatepoch', '<f8'),
+    ('jdsatepochF', '<f8'),
+    ('bstar', '<f8'),
+    ('ndot', '<f8'),
+    ('nddot', '<f8'),
+    ('ecco', '<f8'),
+    ('argpo', '<f8'),
+    ('inclo', '<f8'),
+    ('mo', '<f8'),
+    ('no_kozai', '<f8'),
+    ('nodeo', '<f8'),
+    ('perigee_radius_km', '<f8'),
+    ('apogee_radius_km', '<f8'),
+])
+
+
+def catalog_path_for(tle_file_path):
+    return tle_file_path + CATALOG_SUFFIX
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_tle_elements(tle_file_path):
+    """
+    Parse file TLE 3 baris menjadi array elemen orbit (CATALOG_DTYPE)
+    """
+    with open(tle_file_path, 'r') as file:
+        lines = file.readlines()
+
+    records = []
+
+    for i in range(0, len(lines), 3):
+        if i + 2 < len(lines):
+            name = lines[i].strip()
+            line1 = lines[i + 1].strip()
+            line2 = lines[i + 2].strip()
+
+            try:
+                sat = Satrec.twoline2rv(line1, line2)
+            except Exception:
+                continue
+
+            records.append((
+                name.encode('ascii', 'replace')[:24],
+                sat.satnum,
+                sat.jdsatepoch,
+                sat.jdsatepochF,
+                sat.bstar,
+                sat.ndot,
+                sat.nddot,
+                sat.ecco,
+                sat.argpo,
+                sat.inclo,
+                sat.mo,
+                sat.no_kozai,
+                sat.nodeo,
+                (1.0 + sat.altp) * sat.radiusearthkm,
+                (1.0 + sat.alta) * sat.radiusearthkm,
+            ))
+
+    return np.array(records, dtype=CATALOG_DTYPE)
+
+
+def compile_catalog(tle_file_path, catalog_path=None):
+    """
+    Kompilasi file TLE ke file katalog binary (ditulis atomik)
+
+    Returns:
+    --------
+    catalog_path : str
+    """
+    if catalog_path is None:
+        catalog_path = catalog_path_for(tle_file_path)
+
+    stat = os.stat(tle_file_path)
+    elements = parse_tle_elements(tle_file_path)
+
+    header = json.dumps({
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_sha1': _file_sha1(tle_file_path),
+        'count': int(len(elements)),
+        'dtype': CATALOG_DTYPE.descr,
+    }).encode('utf-8')
+
+    prefix_len = len(CATALOG_MAGIC) + 4 + len(header)
+    padding = (-prefix_len) % HEADER_ALIGN
+
+    # Tulis ke file sementara lalu rename supaya worker lain tidak membaca file setengah jadi
+    directory = os.path.dirname(os.path.abspath(catalog_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(CATALOG_MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            f.write(b'\0' * padding)
+            f.write(elements.tobytes())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, catalog_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return catalog_path
+
+
+def read_catalog_header(catalog_path):
+    """
+    Baca header katalog. Returns (header dict, offset data) atau (None, None)
+    jika file tidak valid.
+    """
+    try:
+        with open(catalog_path, 'rb') as f:
+            if f.read(len(CATALOG_MAGIC)) != CATALOG_MAGIC:
+                return None, None
+            header_len, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_len).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None, None
+
+    prefix_len = len(CATALOG_MAGIC) + 4 + header_len
+    offset = prefix_len + (-prefix_len) % HEADER_ALIGN
+
+    return header, offset
+
+
+def _is_fresh(header, tle_file_path):
+    stat = os.stat(tle_file_path)
+    if (header['source_size'] == stat.st_size and
+            header['source_mtime_ns'] == stat.st_mtime_ns):
+        return True
+    # mtime berubah (mis. git checkout) tapi isi bisa saja sama
+    return (header['source_size'] == stat.st_size and
+            header['source_sha1'] == _file_sha1(tle_file_path))
+
+
+class TLECatalog:
+    """
+    Katalog TLE yang sudah diparse. `elements` adalah array terstruktur
+    (memory-mapped jika file katalog bisa ditulis/dibaca dari disk).
+    """
+
+    def __init__(self, source_path, elements, version, source_mtime_ns):
+        self.source_path = source_path
+        self.elements = elements
+        self.version = version
+        self.source_mtime_ns = source_mtime_ns
+        self._satrecs = None
+        self._satrec_array = None
+        self._satnum_index = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.elements)
+
+    @property
+    def names(self):
+        return [name.decode('ascii', 'replace') for name in self.elements['name']]
+
+    @property
+    def satnums(self):
+        return np.asarray(self.elements['satnum'])
+
+    def indices_for_satnums(self, satnums):
+        """Index katalog untuk setiap nomor katalog NORAD (-1 jika tidak ada)"""
+        with self._lock:
+            if self._satnum_index is None:
+                # Jika satnum muncul lebih dari sekali, entri pertama yang dipakai
+                self._satnum_index = {}
+                for k, satnum in enumerate(self.satnums.tolist()):
+                    self._satnum_index.setdefault(satnum, k)
+            return np.array([self._satnum_index.get(int(n), -1) for n in satnums], dtype=int)
+
+    def satrecs(self):
+        """List Satrec hasil sgp4init dari elemen (dibuat sekali per proses)"""
+        with self._lock:
+            if self._satrecs is None:
+                self._satrecs = [satrec_from_record(rec) for rec in self.elements]
+            return self._satrecs
+
+    def satrec_array(self):
+        """SatrecArray untuk propagasi batch seluruh katalog"""
+        satrecs = self.satrecs()
+        with self._lock:
+            if self._satrec_array is None and satrecs:
+                self._satrec_array = SatrecArray(satrecs)
+            return self._satrec_array
+
+
+def satrec_from_record(rec):
+    """Bangun Satrec dari satu record CATALOG_DTYPE (identik dengan twoline2rv)"""
+    sat = Satrec()
+    epoch = (float(rec['jdsatepoch']) - SGP4_EPOCH_JD) + float(rec['jdsatepochF'])
+    sat.sgp4init(WGS72, 'i', int(rec['satnum']), epoch,
+                 float(rec['bstar']), float(rec['ndot']), float(rec['nddot']),
+                 float(rec['ecco']), float(rec['argpo']), float(rec['inclo']),
+                 float(rec['mo']), float(rec['no_kozai']), float(rec['nodeo']))
+    sat.jdsatepoch = float(rec['jdsatepoch'])
+    sat.jdsatepochF = float(rec['jdsatepochF'])
+    return sat
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def load_catalog(tle_file_path):
+    """
+    Muat katalog untuk file TLE, kompilasi ulang jika basi.
+
+    Hasil di-cache per proses; pemanggilan berikutnya hanya melakukan os.stat
+    pada file sumber. Jika direktori tidak bisa ditulis (mis. filesystem
+    read-only), katalog dibangun di memori saja.
+
+    Raises FileNotFoundError jika file TLE tidak ada.
+    """
+    tle_file_path = os.path.abspath(tle_file_path)
+    mtime_ns = os.stat(tle_file_path).st_mtime_ns
+
+    with _catalogs_lock:
+        catalog = _catalogs.get(tle_file_path)
+        if catalog is not None and catalog.source_mtime_ns == mtime_ns:
+            return catalog
+
+        catalog_path = catalog_path_for(tle_file_path)
+        header, offset = read_catalog_header(catalog_path)
+
+        if header is None or not _is_fresh(header, tle_file_path):
+            try:
+                compile_catalog(tle_file_path, catalog_path)
+                header, offset = read_catalog_header(catalog_path)
+            except OSError as e:
+                print(f"[INFO] Katalog binary tidak bisa ditulis ({e}), memakai katalog di memori")
+                header = None
+
+        if header is not None and header['count'] > 0:
+            elements = np.memmap(catalog_path, dtype=CATALOG_DTYPE, mode='r',
+                                 offset=offset, shape=(header['count'],))
+            version = header['source_sha1']
+        elif header is not None:
+            elements = np.empty(0, dtype=CATALOG_DTYPE)
+            version = header['source_sha1']
+        else:
+            elements = parse_tle_elements(tle_file_path)
+            version = _file_sha1(tle_file_path)
+
+        catalog = TLECatalog(tle_file_path, elements, version, mtime_ns)
+        _catalogs[tle_file_path] = catalog
+        return catalog
+
+
+if __name__ == "__main__":
+    # Kompilasi katalog terlebih dahulu, mis. saat build/deploy:
+    #   python tle_catalog.py "FENGYUN debris.txt" TLE.txt
+    for path in sys.argv[1:] or ['FENGYUN debris.txt', 'TLE.txt']:
+        output = compile_catalog(path)
+        header, _ = read_catalog_header(output)
+        print(f"[OK] {path} -> {output} ({header['count']} objek)")
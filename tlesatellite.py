@@ -8,11 +8,12 @@ from matplotlib.animation import FuncAnimation
 from skyfield.api import EarthSatellite, load, wgs84
 from datetime import datetime, timedelta, timezone
 from shapely.geometry import Polygon, Point # Tambah Point
-from shapely.ops import unary_union
 from pyproj import Geod
 import csv, os
 from sgp4.api import Satrec, jday
 
+from spotbeam_coverage import SpotbeamCoverage
+
 # Fungsi dari debris.py (copy untuk menghindari eksekusi kode debris.py)
 def eci_to_latlon_local(x, y, z):
     r = np.sqrt(x**2 + y**2 + z**2)
@@ -183,13 +184,13 @@ start_point = None # Titik awal sebagai objek Shapely
 last_cross_state = False
 cross_tolerance = 5.0
 
-# Variabel untuk luas area cakupan
-spotbeam_union = None
+# Variabel untuk luas area cakupan (union strip + luas berjalan, inkremental)
+spotbeam_coverage = SpotbeamCoverage(geod)
 last_area_km2 = 0.0
 
 def update(frame):
     global track_lats, track_lons, first_lat, first_lon, start_point, last_cross_state
-    global spotbeam_union, last_area_km2, save_counter, stop_simulation
+    global last_area_km2, save_counter, stop_simulation
 
     # 🛑 MEKANISME PENGHENTIAN
     if stop_simulation:
@@ -249,27 +250,19 @@ def update(frame):
                 (lon      + nx*half_w, lat      + ny*half_w)
             ])
             
-            if spotbeam_union is None:
-                spotbeam_union = current_strip
-            else:
-                # Akumulasi area cakupan
-                spotbeam_union = unary_union([spotbeam_union, current_strip])
+            # Akumulasi area cakupan (luas hanya dari area baru). Digabung setiap
+            # frame agar luas yang ditampilkan tidak tertinggal strip yang tertunda.
+            spotbeam_coverage.add(current_strip)
+            spotbeam_coverage.flush()
             
             x, y = current_strip.exterior.xy
             spotbeam_artist.set_data(x, y)
 
-            if spotbeam_union.is_valid and not spotbeam_union.is_empty:
-                polys = [spotbeam_union] if spotbeam_union.geom_type == "Polygon" else list(spotbeam_union.geoms)
-                total_area_m2 = 0
-                for poly in polys:
-                    if len(poly.exterior.coords) >= 4:
-                        poly_x, poly_y = poly.exterior.xy
-                        area_m2, _ = geod.polygon_area_perimeter(poly_x, poly_y)
-                        total_area_m2 += abs(area_m2)
-                last_area_km2 = total_area_m2 / 1e6
+            if not spotbeam_coverage.is_empty:
+                last_area_km2 = spotbeam_coverage.area_km2
                 
                 # 🎯 PENGHENTIAN BARU: Cek apakah titik awal sudah tercakup
-                if start_point is not None and spotbeam_union.contains(start_point):
+                if start_point is not None and spotbeam_coverage.contains(start_point):
                     if save_counter < max_saves:
                         # Simpan baris terakhir sebelum berhenti
                         with open(csv_filename, "a", newline="") as f: